@@ -0,0 +1,40 @@
+"""
+파일 내용 추출 패키지
+
+이 패키지는 파일 핸들러의 추출 결과를 재사용하여 같은 파일을 반복해서 파싱하지 않도록 하는 기능을 제공합니다.
+"""
+
+from extraction.cache import ExtractionCache
+from extraction.failures import FailureCache
+from extraction.dedup import content_digest, group_duplicates
+from extraction.memory_cache import SectionCache
+from extraction.warmup import CacheWarmer
+from extraction.cancellation import CancellationToken, ExtractionCancelledError
+from extraction.timeouts import ExtractionTimeoutError
+from extraction.concurrency import AdaptiveLimiter, ParserThreads, prefetch_file
+from extraction.sandbox import ExtractionResourceError
+from extraction.scheduler import PriorityScheduler, INTERACTIVE, BACKGROUND
+from extraction.process_pool import ProcessExtractionPool, WorkerDiedError, init_extraction_worker, extract_with_handler
+
+__all__ = [
+    'ExtractionCache',
+    'FailureCache',
+    'SectionCache',
+    'CacheWarmer',
+    'ProcessExtractionPool',
+    'WorkerDiedError',
+    'ExtractionResourceError',
+    'ExtractionTimeoutError',
+    'CancellationToken',
+    'ExtractionCancelledError',
+    'AdaptiveLimiter',
+    'ParserThreads',
+    'prefetch_file',
+    'PriorityScheduler',
+    'INTERACTIVE',
+    'BACKGROUND',
+    'init_extraction_worker',
+    'extract_with_handler',
+    'content_digest',
+    'group_duplicates'
+]
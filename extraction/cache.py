@@ -0,0 +1,300 @@
+"""
+디스크 기반 추출 결과 캐시
+
+이 모듈은 FileHandler.extract_text 결과를 (경로, 크기, st_mtime_ns, 핸들러 클래스와 버전, 최대 섹션 수)를
+키로 SQLite 데이터베이스에 저장하는 캐시를 제공합니다. 변경되지 않은 파일을 다시 검색할 때는
+python-pptx/PyPDF2/python-docx로 파일을 다시 파싱하지 않고 캐시된 섹션을 사용합니다.
+
+섹션은 zlib으로 압축한 JSON으로 저장하며, 전체 크기가 설정된 상한을 넘으면
+가장 오랫동안 사용되지 않은 항목부터 삭제(LRU)합니다.
+
+다른 경로에 복사된 같은 파일은 크기가 같은 캐시 항목이 있을 때만 내용 해시를 비교하여,
+내용이 같으면 이미 추출한 섹션을 재사용합니다. 해시는 추출 시간 제한 밖에서 계산되므로
+dedup_max_bytes 이하의 파일만 비교하며, 해시가 없는 다른 항목은 조회 한 번에 최대 DEDUP_MAX_CANDIDATES개까지만 해시를 계산합니다.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+from file_handlers.base import FileHandler
+from extraction.dedup import content_digest, DEFAULT_DEDUP_MAX_BYTES
+
+logger = logging.getLogger("file_search.extraction_cache")
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT NOT NULL,
+    handler TEXT NOT NULL,
+    max_sections INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT,
+    sections BLOB NOT NULL,
+    bytes INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (path, handler, max_sections)
+);
+
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access);
+CREATE INDEX IF NOT EXISTS entries_size ON entries(size, handler, max_sections);
+"""
+
+# 상한을 넘으면 상한의 이 비율까지 줄여서 삭제가 매번 일어나지 않도록 함
+EVICT_TARGET_RATIO = 0.9
+EVICT_BATCH_SIZE = 256
+
+# 조회 한 번에 해시를 새로 계산할 크기가 같은 캐시 항목 수
+DEDUP_MAX_CANDIDATES = 8
+# get()에서 계산한 해시를 put()까지 보관할 최대 파일 수
+RECENT_DIGESTS = 1024
+
+def handler_key(handler: FileHandler) -> str:
+    """핸들러 클래스와 버전을 캐시 키 문자열로 만듭니다."""
+    return f"{type(handler).__module__}.{type(handler).__name__}:{handler.get_version()}"
+
+class ExtractionCache:
+    """크기 상한과 LRU 삭제를 지원하는 디스크 기반 추출 결과 캐시"""
+
+    def __init__(self, cache_dir: Path, max_bytes: int, dedup_max_bytes: int = DEFAULT_DEDUP_MAX_BYTES):
+        """
+        Args:
+            cache_dir: 캐시 데이터베이스를 저장할 디렉토리
+            max_bytes: 캐시에 저장할 압축된 섹션의 최대 전체 크기
+            dedup_max_bytes: 내용 해시로 같은 파일을 찾을 최대 파일 크기, 0이면 찾지 않음
+        """
+        self.cache_dir = Path(cache_dir)
+        self.db_file = self.cache_dir / "extract_cache.sqlite3"
+        self.max_bytes = max_bytes
+        self.dedup_max_bytes = dedup_max_bytes
+        # 캐시에 없던 파일의 해시 ((경로, 크기, st_mtime_ns) → 해시), 추출 뒤 put()에서 함께 저장하여 다시 계산하지 않음
+        self.recent_digests: "OrderedDict[tuple, str]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.dedup_hits = 0
+        self.conn: Optional[sqlite3.Connection] = None
+        # 검색 서버와 파일 감시 스레드가 동시에 접근하므로 잠금으로 보호
+        self.lock = threading.Lock()
+
+    def load(self) -> None:
+        """캐시 데이터베이스를 열고 필요한 테이블을 만듭니다."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_file), check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+        user_version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if user_version not in (0, SCHEMA_VERSION):
+            logger.warning(f"Extraction cache schema version mismatch in {self.db_file}, clearing the cache")
+            self.conn.execute("DROP TABLE IF EXISTS entries")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self.conn.commit()
+
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries").fetchone()[0]
+        logger.info(f"Opened extraction cache with {len(self)} entries ({self.total_bytes} bytes) from {self.db_file}")
+
+    def close(self) -> None:
+        """캐시 데이터베이스를 닫습니다."""
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def get(self, file_path: Path, stat: os.stat_result, handler: FileHandler,
+            max_content_sections: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        캐시된 추출 결과를 조회합니다. 이 경로의 항목이 없으면 크기가 같은 다른 경로의 항목과
+        내용 해시를 비교하여 내용이 같은 파일의 추출 결과를 재사용합니다.
+
+        Args:
+            file_path: 파일 경로
+            stat: 파일의 stat 결과
+            handler: 파일을 처리할 핸들러
+            max_content_sections: 추출할 최대 섹션 수
+
+        Returns:
+            캐시된 섹션 목록 (없거나 파일이 변경되었으면 None)
+        """
+        key = (str(file_path), handler_key(handler), max_content_sections)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT size, mtime_ns, sections FROM entries WHERE path = ? AND handler = ? AND max_sections = ?",
+                key
+            ).fetchone()
+            if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+                self.conn.execute(
+                    "UPDATE entries SET last_access = ? WHERE path = ? AND handler = ? AND max_sections = ?",
+                    (time.time(),) + key
+                )
+                self.conn.commit()
+                self.hits += 1
+                return json.loads(zlib.decompress(row[2]).decode('utf-8'))
+
+            same_size = []
+            if 0 < stat.st_size <= self.dedup_max_bytes:
+                # 해시가 기록된 항목은 해시로 바로 찾으므로, 해시를 계산할 후보는 해시가 없는 항목부터 가져옴
+                same_size = self.conn.execute(
+                    "SELECT path, mtime_ns, content_hash FROM entries WHERE size = ? AND handler = ? AND max_sections = ? AND path != ? "
+                    "ORDER BY content_hash IS NOT NULL LIMIT ?",
+                    (stat.st_size, key[1], key[2], key[0], DEDUP_MAX_CANDIDATES)
+                ).fetchall()
+
+        blob = self._find_same_content(file_path, stat, key, same_size) if same_size else None
+        if blob is None:
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self.hits += 1
+            self.dedup_hits += 1
+        logger.debug(f"Reusing extraction of identical content for {file_path}")
+        return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+    def _find_same_content(self, file_path: Path, stat: os.stat_result, key: tuple,
+                           same_size: List[tuple]) -> Optional[bytes]:
+        """
+        크기가 같은 캐시 항목 중 내용이 같은 항목을 찾아 이 경로의 항목으로 복사합니다.
+        해시가 기록된 항목은 해시로 바로 찾고, 해시가 아직 없는 항목은 원본 파일이 캐시된 상태 그대로일 때만
+        해시를 계산하여 기록합니다.
+
+        Returns:
+            내용이 같은 항목의 압축된 섹션 (없으면 None)
+        """
+        try:
+            digest = content_digest(file_path)
+        except OSError:
+            return None
+        with self.lock:
+            self.recent_digests[(str(file_path), stat.st_size, stat.st_mtime_ns)] = digest
+            while len(self.recent_digests) > RECENT_DIGESTS:
+                self.recent_digests.popitem(last=False)
+            row = self.conn.execute(
+                "SELECT sections FROM entries WHERE size = ? AND handler = ? AND max_sections = ? AND content_hash = ? AND path != ? LIMIT 1",
+                (stat.st_size, key[1], key[2], digest, key[0])
+            ).fetchone()
+            if row is not None:
+                self._reuse(key, stat, digest, row[0])
+                return row[0]
+
+        for other_path, other_mtime_ns, other_digest in same_size:
+            if other_digest is not None:
+                continue
+            try:
+                other_stat = os.stat(other_path)
+                if other_stat.st_size != stat.st_size or other_stat.st_mtime_ns != other_mtime_ns:
+                    continue
+                other_digest = content_digest(Path(other_path))
+            except OSError:
+                continue
+            with self.lock:
+                self.conn.execute(
+                    "UPDATE entries SET content_hash = ? WHERE path = ? AND handler = ? AND max_sections = ? AND mtime_ns = ?",
+                    (other_digest, other_path, key[1], key[2], other_mtime_ns)
+                )
+                self.conn.commit()
+            if other_digest != digest:
+                continue
+
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT sections FROM entries WHERE path = ? AND handler = ? AND max_sections = ? AND content_hash = ?",
+                    (other_path, key[1], key[2], digest)
+                ).fetchone()
+                if row is None:
+                    continue
+                self._reuse(key, stat, digest, row[0])
+            return row[0]
+        return None
+
+    def _reuse(self, key: tuple, stat: os.stat_result, digest: str, blob: bytes) -> None:
+        """같은 내용의 항목을 이 경로의 항목으로 저장합니다. 잠금을 잡은 상태에서 호출해야 합니다."""
+        self.recent_digests.pop((key[0], stat.st_size, stat.st_mtime_ns), None)
+        self._store(key, stat, digest, blob)
+
+    def put(self, file_path: Path, stat: os.stat_result, handler: FileHandler,
+            max_content_sections: int, sections: List[Dict[str, Any]]) -> None:
+        """
+        추출 결과를 캐시에 저장합니다. 같은 파일의 이전 결과는 교체됩니다.
+
+        Args:
+            file_path: 파일 경로
+            stat: 추출 전에 조회한 파일의 stat 결과
+            handler: 파일을 처리한 핸들러
+            max_content_sections: 추출한 최대 섹션 수
+            sections: 추출 결과 섹션 목록
+        """
+        blob = zlib.compress(json.dumps(sections, ensure_ascii=False).encode('utf-8'))
+        if len(blob) > self.max_bytes:
+            return
+
+        key = (str(file_path), handler_key(handler), max_content_sections)
+        with self.lock:
+            # get()에서 같은 내용의 파일을 찾느라 계산한 해시가 있으면 함께 저장
+            digest = self.recent_digests.pop((key[0], stat.st_size, stat.st_mtime_ns), None)
+            self._store(key, stat, digest, blob)
+
+    def _store(self, key: tuple, stat: os.stat_result, digest: Optional[str], blob: bytes) -> None:
+        """항목을 저장하고 필요하면 오래된 항목을 삭제합니다. 잠금을 잡은 상태에서 호출해야 합니다."""
+        previous = self.conn.execute(
+            "SELECT bytes FROM entries WHERE path = ? AND handler = ? AND max_sections = ?", key
+        ).fetchone()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO entries(path, handler, max_sections, size, mtime_ns, content_hash, sections, bytes, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            key + (stat.st_size, stat.st_mtime_ns, digest, blob, len(blob), time.time())
+        )
+        self.total_bytes += len(blob) - (previous[0] if previous else 0)
+        if self.total_bytes > self.max_bytes:
+            self._evict()
+        self.conn.commit()
+
+    def _evict(self) -> None:
+        """가장 오랫동안 사용되지 않은 항목부터 삭제하여 전체 크기를 상한 아래로 줄입니다."""
+        target = self.max_bytes * EVICT_TARGET_RATIO
+        evicted = 0
+        while self.total_bytes > target:
+            rows = self.conn.execute(
+                "SELECT rowid, bytes FROM entries ORDER BY last_access LIMIT ?", (EVICT_BATCH_SIZE,)
+            ).fetchall()
+            if not rows:
+                self.total_bytes = 0
+                break
+            for rowid, size in rows:
+                if self.total_bytes <= target:
+                    break
+                self.conn.execute("DELETE FROM entries WHERE rowid = ?", (rowid,))
+                self.total_bytes -= size
+                evicted += 1
+        logger.info(f"Evicted {evicted} entries from the extraction cache ({self.total_bytes} bytes remaining)")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계를 반환합니다.
+
+        Returns:
+            항목 수, 전체 크기, 상한, 조회 적중/실패 수, 같은 내용의 다른 파일로 적중한 수
+        """
+        return {
+            "entries": len(self),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "dedup_hits": self.dedup_hits
+        }
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
@@ -0,0 +1,66 @@
+"""
+추출 취소
+
+Claude Desktop에서 사용자가 검색을 취소하거나 질문을 바꾸면 남은 파일을 계속 추출할 필요가 없습니다.
+검색마다 취소 토큰을 만들어 추출 함수에 전달하고, 검색이 취소되면 토큰을 취소하여
+작업자 프로세스에서 실행 중인 추출은 중단하고 스레드에서 실행 중인 추출은 결과를 기다리지 않도록 합니다.
+"""
+
+import logging
+import threading
+from typing import List, Callable
+
+logger = logging.getLogger("file_search.cancellation")
+
+class ExtractionCancelledError(Exception):
+    """검색이 취소되어 추출을 중단함"""
+    pass
+
+class CancellationToken:
+    """검색 하나의 취소 여부를 추출 작업 스레드에 전달하는 토큰"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.callbacks: List[Callable[[], None]] = []
+        self.lock = threading.Lock()
+
+    def cancel(self) -> None:
+        """토큰을 취소하고 등록된 콜백을 호출합니다. 여러 번 호출해도 콜백은 한 번만 호출됩니다."""
+        with self.lock:
+            if self.event.is_set():
+                return
+            self.event.set()
+            callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in cancellation callback: {e}")
+
+    def is_cancelled(self) -> bool:
+        """토큰이 취소되었는지 확인합니다."""
+        return self.event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """토큰이 취소되었으면 ExtractionCancelledError를 발생시킵니다."""
+        if self.event.is_set():
+            raise ExtractionCancelledError("검색이 취소되어 추출을 중단했습니다.")
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """
+        토큰이 취소될 때 호출할 함수를 등록합니다. 이미 취소되었으면 바로 호출합니다.
+
+        Args:
+            callback: 인자 없이 호출되는 함수 (취소한 스레드에서 호출됨)
+        """
+        with self.lock:
+            if not self.event.is_set():
+                self.callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        """등록한 콜백을 제거합니다. (작업이 끝났을 때 호출)"""
+        with self.lock:
+            if callback in self.callbacks:
+                self.callbacks.remove(callback)
@@ -0,0 +1,350 @@
+"""
+적응형 동시 처리 한도
+
+검색 디렉토리마다 저장 장치의 특성이 다릅니다. 로컬 NVMe에서는 동시에 많은 파일을 추출해야 빠르지만,
+SMB 공유 폴더에서는 동시 요청이 많으면 지연 시간만 늘어나고 처리량은 늘지 않습니다.
+이 모듈은 검색 디렉토리별로 파일 추출 지연 시간과 처리량을 관찰하여 동시 처리 한도를 조절하는 AIMD 제한기와,
+파일 읽기(I/O 작업)와 따로 파싱(CPU 작업)을 동시에 실행할 스레드 수를 제한하는 파서 스레드 풀을 제공합니다.
+"""
+
+import time
+import asyncio
+import logging
+import statistics
+import threading
+import contextlib
+from pathlib import Path
+from collections import deque
+from typing import List, Dict, Any, Optional, Callable
+
+from extraction.cancellation import CancellationToken, ExtractionCancelledError
+from extraction.timeouts import ExtractionTimeoutError
+from extraction.scheduler import INTERACTIVE, enqueue_by_priority
+
+logger = logging.getLogger("file_search.concurrency")
+
+MIN_WINDOW_SAMPLES = 8           # 한도를 조절하기 전에 모을 최소 지연 시간 표본 수
+DEFAULT_LATENCY_TOLERANCE = 2.0  # 기준 지연 시간의 몇 배를 넘으면 혼잡으로 판단할지
+DEFAULT_BACKOFF = 0.75           # 혼잡할 때 한도에 곱할 값
+PREFETCH_CHUNK_SIZE = 1024 * 1024  # 파일을 미리 읽을 때 한 번에 읽을 크기
+DEFAULT_PREFETCH_MAX_BYTES = 64 * 1024 * 1024  # 파일을 미리 읽을 최대 크기
+
+class AdaptiveLimiter:
+    """
+    지연 시간과 처리량에 따라 동시 처리 한도를 조절하는 AIMD 제한기 (asyncio 전용)
+
+    처음에는 혼잡을 발견할 때까지 창마다 한도를 두 배로 늘리고(slow start), 이후에는 창마다 1씩 늘립니다.
+    창의 지연 시간 중앙값이 기준 지연 시간의 tolerance배를 넘는데 처리량이 늘지 않았으면
+    동시 요청이 대기열에서 기다리기만 한다고 보고 한도를 backoff배로 줄입니다.
+    """
+
+    def __init__(self, initial_limit: int, min_limit: int, max_limit: int,
+                 tolerance: float = DEFAULT_LATENCY_TOLERANCE, backoff: float = DEFAULT_BACKOFF):
+        """
+        Args:
+            initial_limit: 처음 동시 처리 한도
+            min_limit: 최소 동시 처리 한도
+            max_limit: 최대 동시 처리 한도
+            tolerance: 혼잡으로 판단할 지연 시간 배수
+            backoff: 혼잡할 때 한도에 곱할 값 (0~1)
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.slow_start = True
+        self.in_flight = 0
+        self.waiters: "deque[asyncio.Future]" = deque()
+        # 관찰한 지연 시간 (초)
+        self.samples: List[float] = []
+        self.window_started = time.monotonic()
+        self.baseline: Optional[float] = None
+        self.latency: Optional[float] = None
+        self.throughput = 0.0
+        self.increases = 0
+        self.decreases = 0
+
+    async def acquire(self) -> None:
+        """동시 처리 한도 안에서 슬롯을 하나 얻을 때까지 기다립니다."""
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # 깨어난 직후에 취소되었으면 다음 대기자에게 슬롯을 넘김
+                    self._wake_waiters()
+                else:
+                    with contextlib.suppress(ValueError):
+                        self.waiters.remove(waiter)
+                raise
+        self.in_flight += 1
+
+    def release(self, latency: Optional[float] = None) -> None:
+        """
+        슬롯을 반환합니다.
+
+        Args:
+            latency: 슬롯을 잡고 처리한 작업의 지연 시간(초), 작업이 실패하거나 취소되었으면 None
+        """
+        self.in_flight -= 1
+        if latency is not None:
+            self.samples.append(latency)
+            if len(self.samples) >= max(MIN_WINDOW_SAMPLES, int(self.limit)):
+                self._adjust()
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        available = int(self.limit) - self.in_flight
+        while available > 0 and self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                available -= 1
+
+    def _adjust(self) -> None:
+        """한 창의 지연 시간과 처리량으로 한도를 조절합니다."""
+        now = time.monotonic()
+        latency = statistics.median(self.samples)
+        throughput = len(self.samples) / max(now - self.window_started, 1e-6)
+        self.samples = []
+        self.window_started = now
+
+        # 기준 지연 시간은 가장 낮은 값을 유지하되, 최소 한도에서 잰 지연 시간은 혼잡이 없는 상태이므로
+        # 기준으로 다시 사용하여 파일 구성이 바뀐 디렉토리가 계속 혼잡하다고 판단되지 않도록 함
+        if self.baseline is None or latency < self.baseline or self.limit <= self.min_limit:
+            self.baseline = latency
+
+        congested = latency > self.baseline * self.tolerance and throughput <= self.throughput * 1.1
+        previous = self.limit
+        if congested:
+            self.slow_start = False
+            self.limit = max(float(self.min_limit), self.limit * self.backoff)
+            self.decreases += 1
+        elif self.slow_start:
+            self.limit = min(float(self.max_limit), self.limit * 2)
+            self.increases += 1
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1)
+            self.increases += 1
+        self.latency = latency
+        self.throughput = throughput
+
+        if int(previous) != int(self.limit):
+            logger.debug(f"Concurrency limit {int(previous)} -> {int(self.limit)} "
+                         f"(latency {latency * 1000:.1f}ms, baseline {self.baseline * 1000:.1f}ms, {throughput:.1f} files/s)")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        제한기 상태를 반환합니다.
+
+        Returns:
+            한도, 처리 중인 작업 수, 지연 시간, 처리량 등
+        """
+        return {
+            "limit": int(self.limit),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self.waiters),
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "baseline_latency_ms": round(self.baseline * 1000, 1) if self.baseline is not None else None,
+            "throughput_files_per_second": round(self.throughput, 1),
+            "increases": self.increases,
+            "decreases": self.decreases
+        }
+
+def prefetch_file(file_path: Path, max_bytes: int = DEFAULT_PREFETCH_MAX_BYTES, deadline: Optional[float] = None,
+                  cancel_token: Optional[CancellationToken] = None) -> int:
+    """
+    파일의 앞부분을 최대 max_bytes까지 읽어 운영체제 페이지 캐시에 올립니다. 파싱 전에 호출하면 느린 저장 장치에서 읽는 시간은
+    디렉토리별 동시 처리 한도 안에서 쓰고, 파서 스레드는 메모리에서 읽어 파싱할 수 있습니다.
+    읽는 도중에도 조각마다 시간 제한과 취소를 확인합니다.
+
+    Args:
+        file_path: 파일 경로
+        max_bytes: 미리 읽을 최대 바이트 수 (파일의 일부만 읽는 핸들러를 위해 큰 파일은 앞부분만 읽음)
+        deadline: time.monotonic() 기준 추출 시간 제한 시각, None이면 제한 없음
+        cancel_token: 검색이 취소되면 읽기를 중단할 토큰
+
+    Returns:
+        읽은 바이트 수
+
+    Raises:
+        ExtractionTimeoutError: 읽는 도중 deadline을 넘은 경우
+        ExtractionCancelledError: cancel_token이 취소된 경우
+    """
+    size = 0
+    with open(file_path, "rb") as f:
+        while size < max_bytes:
+            if cancel_token is not None and cancel_token.is_cancelled():
+                raise ExtractionCancelledError("검색이 취소되어 추출을 중단했습니다.")
+            if deadline is not None and time.monotonic() >= deadline:
+                raise ExtractionTimeoutError("파일을 읽는 동안 추출 시간 제한을 넘었습니다.")
+            chunk = f.read(min(PREFETCH_CHUNK_SIZE, max_bytes - size))
+            if not chunk:
+                break
+            size += len(chunk)
+    return size
+
+class _ParseJob:
+    """파서 스레드에서 실행할 작업 하나"""
+
+    __slots__ = ("fn", "args", "kwargs", "priority", "state", "started_at", "result", "error", "changed")
+
+    def __init__(self, fn: Callable[..., Any], args: tuple, kwargs: dict, priority: int = INTERACTIVE):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        # queued → running → finished, 또는 cancelled(시작 전 취소) / abandoned(시간 제한 초과)
+        self.state = "queued"
+        self.started_at = 0.0
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        # 작업이 시작되거나 끝나거나 취소되면 기다리는 스레드를 깨움
+        self.changed = threading.Event()
+
+class ParserThreads:
+    """
+    파싱(CPU 작업)을 실행하는 스레드 풀 (작업 스레드에서 사용)
+
+    동시에 파싱하는 스레드 수를 limit개로 제한하고, 파일마다 시간 제한과 취소를 적용합니다.
+    스레드는 중단할 수 없으므로 시간 제한을 넘은 파싱은 결과를 기다리지 않고 포기하며,
+    포기한 스레드 대신 새 스레드를 시작하여 멈춘 파싱이 다른 파일의 파싱을 막지 않도록 합니다.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Args:
+            limit: 동시에 파싱할 수 있는 스레드 수
+        """
+        self.limit = max(1, limit)
+        self.jobs: "deque[_ParseJob]" = deque()
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        # 포기하지 않은 스레드 수와 그중 작업을 기다리는 스레드 수
+        self.threads = 0
+        self.idle = 0
+        self.abandoned = 0
+
+    def run(self, timeout: Optional[float], fn: Callable[..., Any], *args: Any,
+            cancel_token: Optional[CancellationToken] = None, priority: int = INTERACTIVE, **kwargs: Any) -> Any:
+        """
+        파서 스레드에서 함수를 실행하고 결과를 기다립니다. 시간 제한은 파싱을 시작한 시각부터 계산합니다.
+
+        Args:
+            timeout: 시간 제한(초), None이면 제한 없음
+            fn: 실행할 함수
+            cancel_token: 취소되면 결과를 기다리지 않을 토큰
+            priority: 작업 우선순위 (대기 중인 작업 중 우선순위가 높은 작업을 먼저 실행)
+
+        Returns:
+            함수의 반환값
+
+        Raises:
+            ExtractionTimeoutError: 시간 제한을 넘은 경우
+            ExtractionCancelledError: cancel_token이 취소된 경우
+        """
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        job = _ParseJob(fn, args, kwargs, priority)
+        with self.condition:
+            enqueue_by_priority(self.jobs, job)
+            if len(self.jobs) > self.idle and self.threads < self.limit:
+                self._spawn_thread()
+            self.condition.notify()
+
+        if cancel_token is not None:
+            cancel_token.add_callback(job.changed.set)
+        try:
+            while True:
+                job.changed.clear()
+                with self.lock:
+                    state, started_at = job.state, job.started_at
+                if state == "finished":
+                    break
+                if cancel_token is not None and cancel_token.is_cancelled():
+                    with self.lock:
+                        if job.state == "queued":
+                            job.state = "cancelled"
+                    cancel_token.raise_if_cancelled()
+                remaining = None
+                if state == "running" and timeout is not None:
+                    remaining = started_at + timeout - time.monotonic()
+                    if remaining <= 0:
+                        self._abandon(job)
+                        raise ExtractionTimeoutError(f"추출이 시간 제한({timeout:g}초)을 넘었습니다.")
+                job.changed.wait(remaining)
+        finally:
+            if cancel_token is not None:
+                cancel_token.remove_callback(job.changed.set)
+
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def _spawn_thread(self) -> None:
+        """파서 스레드를 하나 시작합니다. 잠금을 잡은 상태에서 호출해야 합니다."""
+        self.threads += 1
+        threading.Thread(target=self._thread_main, name="extract-parser", daemon=True).start()
+
+    def _abandon(self, job: _ParseJob) -> None:
+        """시간 제한을 넘은 작업의 스레드를 포기하고, 기다리는 작업이 있으면 대신할 스레드를 시작합니다."""
+        with self.condition:
+            if job.state != "running":
+                return
+            job.state = "abandoned"
+            self.threads -= 1
+            self.abandoned += 1
+            if len(self.jobs) > self.idle and self.threads < self.limit:
+                self._spawn_thread()
+
+    def _thread_main(self) -> None:
+        while True:
+            with self.condition:
+                self.idle += 1
+                while not self.jobs:
+                    self.condition.wait()
+                self.idle -= 1
+                job = self.jobs.popleft()
+                if job.state == "cancelled":
+                    continue
+                job.state = "running"
+                job.started_at = time.monotonic()
+            job.changed.set()
+
+            try:
+                job.result = job.fn(*job.args, **job.kwargs)
+            except BaseException as e:
+                job.error = e
+
+            with self.lock:
+                abandoned = job.state == "abandoned"
+                if not abandoned:
+                    job.state = "finished"
+            job.changed.set()
+            if abandoned:
+                # 이미 다른 스레드로 대체되었으므로 종료
+                with self.lock:
+                    self.abandoned -= 1
+                logger.info(f"Abandoned parser thread finished after {time.monotonic() - job.started_at:.1f} seconds")
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        파서 스레드 상태를 반환합니다.
+
+        Returns:
+            한도, 스레드 수, 대기 중인 작업 수, 포기한 스레드 수
+        """
+        with self.lock:
+            return {
+                "limit": self.limit,
+                "threads": self.threads,
+                "idle": self.idle,
+                "queued": len(self.jobs),
+                "abandoned_running": self.abandoned
+            }
@@ -0,0 +1,81 @@
+"""
+내용 해시 기반 중복 파일 확인
+
+여러 프로젝트 폴더에 복사된 같은 문서를 한 번만 추출하도록 파일 내용의 해시를 계산합니다.
+해시는 파일 전체를 읽어야 하므로, 크기가 같은 다른 파일이 있고 파일이 최대 크기 이하일 때만 계산합니다.
+"""
+
+import os
+import hashlib
+from pathlib import Path
+from collections import defaultdict
+from typing import List, Dict, Tuple, TypeVar, Callable
+
+# 해시를 계산할 때 한 번에 읽는 크기
+READ_CHUNK_SIZE = 1024 * 1024
+
+# 내용 해시를 비교할 최대 파일 크기
+DEFAULT_DEDUP_MAX_BYTES = 64 * 1024 * 1024
+
+T = TypeVar("T")
+
+def content_digest(file_path: Path) -> str:
+    """
+    파일 내용의 BLAKE2b 해시를 계산합니다.
+
+    Args:
+        file_path: 파일 경로
+
+    Returns:
+        16진수 해시 문자열
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def group_duplicates(items: List[T], key: Callable[[T], Tuple[Path, os.stat_result]],
+                     max_bytes: int = DEFAULT_DEDUP_MAX_BYTES) -> Tuple[List[T], Dict[int, List[T]]]:
+    """
+    내용이 같은 파일끼리 묶습니다. 크기가 같은 파일이 둘 이상일 때만 해시를 계산합니다.
+
+    Args:
+        items: 파일 항목 목록
+        key: 항목에서 (파일 경로, stat 결과)를 얻는 함수
+        max_bytes: 해시를 계산할 최대 파일 크기, 이보다 큰 파일은 비교하지 않고 각각 추출 (0이면 비교하지 않음)
+
+    Returns:
+        (내용별 대표 항목 목록, 대표 항목 위치 → 같은 내용의 나머지 항목 목록)
+    """
+    by_size: Dict[int, List[T]] = defaultdict(list)
+    for item in items:
+        by_size[key(item)[1].st_size].append(item)
+
+    unique: List[T] = []
+    duplicates: Dict[int, List[T]] = {}
+    for size, same_size in by_size.items():
+        # 큰 파일은 해시를 계산하는 데 추출만큼 오래 걸릴 수 있으므로 비교하지 않음
+        if len(same_size) == 1 or max_bytes <= 0 or size > max_bytes:
+            unique.extend(same_size)
+            continue
+
+        representatives: Dict[str, int] = {}
+        for item in same_size:
+            try:
+                digest = content_digest(key(item)[0])
+            except OSError:
+                # 읽을 수 없는 파일은 따로 추출하여 오류를 기록
+                unique.append(item)
+                continue
+            if digest in representatives:
+                duplicates[representatives[digest]].append(item)
+            else:
+                representatives[digest] = len(unique)
+                duplicates[len(unique)] = []
+                unique.append(item)
+
+    return unique, {position: items for position, items in duplicates.items() if items}
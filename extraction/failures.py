@@ -0,0 +1,197 @@
+"""
+추출 실패 파일 캐시
+
+손상되었거나 암호화된 파일은 검색할 때마다 파싱에 실패하면서 시간을 쓰고 전체 traceback을 로그에 남깁니다.
+이 모듈은 추출에 실패한 파일을 (경로, 핸들러 클래스와 버전)을 키로 크기와 st_mtime_ns와 함께
+SQLite 데이터베이스에 기록하여, 파일이 변경되거나 재시도 간격이 지날 때까지 다시 파싱하지 않도록 합니다.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from file_handlers.base import FileHandler
+from extraction.cache import handler_key
+
+logger = logging.getLogger("file_search.failure_cache")
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS failures (
+    path TEXT NOT NULL,
+    handler TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    error TEXT NOT NULL,
+    first_failed REAL NOT NULL,
+    last_failed REAL NOT NULL,
+    attempts INTEGER NOT NULL,
+    PRIMARY KEY (path, handler)
+);
+"""
+
+class FailureCache:
+    """추출에 실패한 파일을 기록하는 디스크 기반 캐시"""
+
+    def __init__(self, cache_dir: Path, retry_seconds: float):
+        """
+        Args:
+            cache_dir: 캐시 데이터베이스를 저장할 디렉토리
+            retry_seconds: 파일이 변경되지 않아도 다시 추출을 시도하기까지의 시간 (0 이하이면 변경될 때까지 재시도하지 않음)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.db_file = self.cache_dir / "failures.sqlite3"
+        self.retry_seconds = retry_seconds
+        self.skipped = 0
+        # 실패 기록이 있는 경로 (성공한 파일마다 데이터베이스에 기록하지 않도록 메모리에 유지)
+        self.paths = set()
+        self.conn: Optional[sqlite3.Connection] = None
+        self.lock = threading.Lock()
+
+    def load(self) -> None:
+        """캐시 데이터베이스를 열고 필요한 테이블을 만듭니다."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_file), check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+
+        user_version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if user_version not in (0, SCHEMA_VERSION):
+            logger.warning(f"Failure cache schema version mismatch in {self.db_file}, clearing the cache")
+            self.conn.execute("DROP TABLE IF EXISTS failures")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self.conn.commit()
+        self.paths = {row[0] for row in self.conn.execute("SELECT path FROM failures")}
+        logger.info(f"Opened failure cache with {len(self)} known failures from {self.db_file}")
+
+    def close(self) -> None:
+        """캐시 데이터베이스를 닫습니다."""
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def get(self, file_path: Path, stat: os.stat_result, handler: FileHandler) -> Optional[str]:
+        """
+        파일이 이전에 같은 상태로 추출에 실패했는지 확인합니다.
+
+        Args:
+            file_path: 파일 경로
+            stat: 파일의 stat 결과
+            handler: 파일을 처리할 핸들러
+
+        Returns:
+            기록된 오류 메시지 (실패 기록이 없거나, 파일이 변경되었거나, 재시도 시간이 되었으면 None)
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT size, mtime_ns, error, last_failed FROM failures WHERE path = ? AND handler = ?",
+                (str(file_path), handler_key(handler))
+            ).fetchone()
+            if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+                return None
+            if self.retry_seconds > 0 and time.time() - row[3] >= self.retry_seconds:
+                return None
+            self.skipped += 1
+            return row[2]
+
+    def record(self, file_path: Path, stat: os.stat_result, handler: FileHandler, error: str) -> None:
+        """
+        추출 실패를 기록합니다. 같은 상태의 파일이 다시 실패하면 시도 횟수를 늘립니다.
+
+        Args:
+            file_path: 파일 경로
+            stat: 추출 전에 조회한 파일의 stat 결과
+            handler: 파일을 처리한 핸들러
+            error: 오류 메시지
+        """
+        key = (str(file_path), handler_key(handler))
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT size, mtime_ns, first_failed, attempts FROM failures WHERE path = ? AND handler = ?", key
+            ).fetchone()
+            if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+                first_failed, attempts = row[2], row[3] + 1
+            else:
+                first_failed, attempts = now, 1
+            self.conn.execute(
+                "INSERT OR REPLACE INTO failures(path, handler, size, mtime_ns, error, first_failed, last_failed, attempts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                key + (stat.st_size, stat.st_mtime_ns, error, first_failed, now, attempts)
+            )
+            self.conn.commit()
+            self.paths.add(key[0])
+
+    def forget(self, file_path: Path) -> None:
+        """
+        파일의 실패 기록을 삭제합니다. (추출에 성공했을 때 호출)
+
+        Args:
+            file_path: 파일 경로
+        """
+        with self.lock:
+            if str(file_path) not in self.paths:
+                return
+            self.conn.execute("DELETE FROM failures WHERE path = ?", (str(file_path),))
+            self.conn.commit()
+            self.paths.discard(str(file_path))
+
+    def list_failures(self, directory: Optional[Path] = None) -> List[Dict[str, Any]]:
+        """
+        기록된 추출 실패 목록을 최근 실패 순서로 반환합니다.
+
+        Args:
+            directory: 지정하면 이 디렉토리 아래의 파일만 반환
+
+        Returns:
+            파일별 실패 정보 (경로, 핸들러, 크기, 오류, 처음/마지막 실패 시각, 시도 횟수)
+        """
+        query = "SELECT path, handler, size, error, first_failed, last_failed, attempts FROM failures"
+        params: tuple = ()
+        if directory is not None:
+            prefix = os.path.join(str(directory), "")
+            query += " WHERE substr(path, 1, ?) = ?"
+            params = (len(prefix), prefix)
+        with self.lock:
+            rows = self.conn.execute(query + " ORDER BY last_failed DESC", params).fetchall()
+        return [{
+            "path": path,
+            "handler": handler,
+            "size": size,
+            "error": error,
+            "first_failed": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(first_failed)),
+            "last_failed": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(last_failed)),
+            "attempts": attempts
+        } for path, handler, size, error, first_failed, last_failed, attempts in rows]
+
+    def clear(self, directory: Optional[Path] = None) -> int:
+        """
+        실패 기록을 삭제하여 다음 검색 때 다시 추출하도록 합니다.
+
+        Args:
+            directory: 지정하면 이 디렉토리 아래의 파일 기록만 삭제
+
+        Returns:
+            삭제된 기록 수
+        """
+        query = "DELETE FROM failures"
+        params: tuple = ()
+        if directory is not None:
+            prefix = os.path.join(str(directory), "")
+            query += " WHERE substr(path, 1, ?) = ?"
+            params = (len(prefix), prefix)
+        with self.lock:
+            deleted = self.conn.execute(query, params).rowcount
+            self.conn.commit()
+            self.paths = {row[0] for row in self.conn.execute("SELECT path FROM failures")}
+        return deleted
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM failures").fetchone()[0]
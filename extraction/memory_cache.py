@@ -0,0 +1,134 @@
+"""
+메모리 기반 섹션 캐시
+
+이 모듈은 거의 모든 검색에 등장하는 문서(규정, 가격표 등)의 추출 결과를 프로세스 메모리에 보관하는
+캐시를 제공합니다. 캐시 크기는 항목 수가 아니라 섹션 텍스트의 전체 바이트 수로 제한하며,
+상한을 넘으면 가장 오랫동안 사용되지 않은 항목부터 삭제(LRU)합니다.
+"""
+
+import os
+import logging
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+
+from file_handlers.base import FileHandler
+from extraction.cache import handler_key
+
+logger = logging.getLogger("file_search.section_cache")
+
+# 섹션마다 텍스트 외에 사전과 필드가 차지하는 대략적인 메모리 크기
+SECTION_OVERHEAD_BYTES = 200
+
+def sections_size(sections: List[Dict[str, Any]]) -> int:
+    """
+    섹션 목록이 캐시에서 차지하는 크기를 계산합니다.
+
+    Args:
+        sections: 섹션 목록
+
+    Returns:
+        섹션 텍스트의 UTF-8 바이트 수와 섹션별 부가 크기의 합
+    """
+    return sum(len(section.get("text", "").encode("utf-8", "surrogatepass")) + SECTION_OVERHEAD_BYTES
+               for section in sections)
+
+class SectionCache:
+    """텍스트 바이트 수로 크기를 제한하는 LRU 섹션 캐시"""
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: 캐시에 보관할 섹션의 최대 전체 크기
+        """
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # (경로, 핸들러, 최대 섹션 수) → (크기, st_mtime_ns, 섹션 목록, 항목 크기)
+        self.entries: "OrderedDict[Tuple[str, str, int], Tuple[int, int, List[Dict[str, Any]], int]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, file_path: Path, stat: os.stat_result, handler: FileHandler,
+            max_content_sections: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        캐시된 섹션을 조회합니다. 반환된 섹션 목록은 캐시와 공유되므로 수정하지 않아야 합니다.
+
+        Args:
+            file_path: 파일 경로
+            stat: 파일의 stat 결과
+            handler: 파일을 처리할 핸들러
+            max_content_sections: 추출할 최대 섹션 수
+
+        Returns:
+            캐시된 섹션 목록 (없거나 파일이 변경되었으면 None)
+        """
+        key = (str(file_path), handler_key(handler), max_content_sections)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != stat.st_size or entry[1] != stat.st_mtime_ns:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, file_path: Path, stat: os.stat_result, handler: FileHandler,
+            max_content_sections: int, sections: List[Dict[str, Any]]) -> None:
+        """
+        섹션을 캐시에 저장합니다. 같은 파일의 이전 항목은 교체되며,
+        상한보다 큰 항목은 다른 항목을 모두 밀어내지 않도록 저장하지 않습니다.
+
+        Args:
+            file_path: 파일 경로
+            stat: 추출 전에 조회한 파일의 stat 결과
+            handler: 파일을 처리한 핸들러
+            max_content_sections: 추출한 최대 섹션 수
+            sections: 섹션 목록
+        """
+        size = sections_size(sections)
+        key = (str(file_path), handler_key(handler), max_content_sections)
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[3]
+            if size > self.max_bytes:
+                return
+
+            self.entries[key] = (stat.st_size, stat.st_mtime_ns, sections, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.total_bytes -= evicted[3]
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """캐시를 비웁니다."""
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계를 반환합니다.
+
+        Returns:
+            항목 수, 전체 크기, 상한, 조회 적중/실패 수, 적중률, 삭제된 항목 수
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions
+            }
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.entries)
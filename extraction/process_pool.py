@@ -0,0 +1,467 @@
+"""
+프로세스 풀 추출 실행기
+
+PyPDF2, python-pptx의 파싱은 순수 파이썬 CPU 작업이므로 스레드로는 GIL 때문에 코어 하나 이상을 쓰지 못합니다.
+이 모듈은 미리 시작한 작업자 프로세스에서 추출을 실행하는 concurrent.futures 호환 실행기를 제공합니다.
+
+- 작업자는 풀을 시작할 때 함께 시작되며, 초기화 함수에서 핸들러 라이브러리를 한 번만 임포트합니다.
+- 대기 중인 작업은 작업자마다 최대 batch_size개씩 묶어서 한 번에 전달하여 프로세스 간 통신 비용을 줄입니다.
+- 작업자마다 전용 파이프를 사용하므로, 작업자가 비정상 종료되면 실행 중이던 작업만 실패 처리하고
+  아직 시작하지 않은 작업은 다시 대기열에 넣은 뒤 새 작업자를 시작합니다.
+- 시간 제한을 넘은 작업은 작업자 프로세스를 종료하여 강제로 중단하고 ExtractionTimeoutError로 실패 처리합니다.
+  cancel()로 취소한 실행 중인 작업도 같은 방식으로 중단합니다.
+- memory_limit_mb, cpu_limit_seconds를 지정하면 작업자를 메모리와 파일별 CPU 시간이 제한된 샌드박스로 실행하여,
+  파서가 폭주해도 그 파일 하나만 ExtractionResourceError로 실패하고 작업자는 새로 시작됩니다.
+"""
+
+import os
+import sys
+import math
+import atexit
+import types
+import signal
+import logging
+import time
+import itertools
+import threading
+import contextlib
+import multiprocessing
+from collections import deque
+from pathlib import Path
+from multiprocessing.connection import Connection, wait
+from concurrent.futures import Executor, Future, InvalidStateError
+from typing import List, Dict, Any, Callable, Optional
+
+from file_handlers import FileHandlerRegistry, create_default_registry
+from extraction.timeouts import ExtractionTimeoutError
+from extraction.cancellation import ExtractionCancelledError
+from extraction.scheduler import INTERACTIVE, enqueue_by_priority
+from extraction.sandbox import (ExtractionResourceError, apply_memory_limit, cpu_time_limit, memory_exhausted,
+                                describe_exit)
+
+logger = logging.getLogger("file_search.process_pool")
+
+DEFAULT_BATCH_SIZE = 4
+
+# 종료 요청 후 작업자가 스스로 끝나기를 기다리는 시간(초)
+WORKER_EXIT_TIMEOUT = 5.0
+
+class WorkerDiedError(RuntimeError):
+    """작업을 처리하던 작업자 프로세스가 비정상 종료됨"""
+    pass
+
+# 작업자 프로세스마다 한 번만 만드는 핸들러 레지스트리
+_worker_registry: Optional[FileHandlerRegistry] = None
+
+def init_extraction_worker() -> None:
+    """작업자 프로세스에서 핸들러 라이브러리를 임포트하고 핸들러 레지스트리를 만듭니다."""
+    global _worker_registry
+    _worker_registry = create_default_registry()
+
+def extract_with_handler(file_path: str, max_content_sections: int) -> List[Dict[str, Any]]:
+    """
+    작업자 프로세스에서 파일을 처리할 핸들러로 섹션을 추출합니다. 핸들러의 예외는 호출한 쪽으로 전달됩니다.
+
+    Args:
+        file_path: 파일 경로
+        max_content_sections: 추출할 최대 섹션 수
+
+    Returns:
+        섹션별 텍스트 정보 리스트
+    """
+    if _worker_registry is None:
+        init_extraction_worker()
+    handler = _worker_registry.get_handler_for_file(Path(file_path))
+    if handler is None:
+        raise ValueError(f"지원되지 않는 파일 형식입니다: {file_path}")
+    return handler.extract_text(Path(file_path), max_content_sections)
+
+def _worker_main(conn: Connection, initializer: Optional[Callable[..., None]], initargs: tuple,
+                 memory_limit_mb: float = 0, cpu_limit_seconds: float = 0) -> None:
+    """
+    작업자 프로세스의 진입점. 작업 묶음을 받아 차례로 실행하고 결과를 하나씩 돌려보냅니다.
+    메모리 제한에 걸린 작업자는 결과를 보낸 뒤 종료하여 부모가 새 작업자로 바꾸도록 합니다.
+    """
+    # 터미널의 Ctrl+C는 부모 프로세스가 처리
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if initializer is not None:
+        initializer(*initargs)
+    # 핸들러 라이브러리를 임포트한 뒤에 제한하여 초기화가 제한에 걸리지 않도록 함
+    apply_memory_limit(memory_limit_mb)
+
+    while True:
+        try:
+            batch = conn.recv()
+        except (EOFError, OSError):
+            break
+        if batch is None:
+            break
+
+        for job_id, fn, args, kwargs in batch:
+            # 시간 제한은 작업을 시작한 시각부터 계산
+            conn.send(("start", job_id))
+            try:
+                with cpu_time_limit(cpu_limit_seconds):
+                    message = ("done", job_id, True, fn(*args, **kwargs))
+            except MemoryError:
+                message = ("done", job_id, False,
+                           ExtractionResourceError(f"메모리 제한({memory_limit_mb:g}MB)을 넘어 파일을 처리하지 못했습니다."))
+            except BaseException as e:
+                message = ("done", job_id, False, e)
+            try:
+                conn.send(message)
+            except Exception as e:
+                # 결과나 예외를 pickle할 수 없으면 오류 메시지만 전달
+                conn.send(("done", job_id, False, RuntimeError(f"작업 결과를 전달할 수 없습니다: {e!r}")))
+            if memory_exhausted(memory_limit_mb):
+                # 늘어난 힙을 가진 작업자는 종료 (남은 작업은 부모가 다시 대기열에 넣음)
+                return
+
+@contextlib.contextmanager
+def _hidden_main_module():
+    """
+    spawn으로 시작한 작업자가 __main__ 모듈(python file_search_server.py로 실행한 검색 서버 등)을
+    다시 실행하지 않도록, 작업자를 시작하는 동안 __main__을 빈 모듈로 바꿉니다.
+    """
+    main_module = sys.modules.get("__main__")
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main_module
+
+class _Job:
+    """대기열 또는 작업자에 있는 작업 하나"""
+
+    __slots__ = ("job_id", "future", "fn", "args", "kwargs", "timeout", "priority")
+
+    def __init__(self, job_id: int, future: Future, fn: Callable[..., Any], args: tuple, kwargs: dict,
+                 timeout: Optional[float], priority: int = INTERACTIVE):
+        self.job_id = job_id
+        self.future = future
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.timeout = timeout
+        self.priority = priority
+
+class _Worker:
+    """작업자 프로세스와 전달한 작업 목록"""
+
+    def __init__(self, process: multiprocessing.Process, conn: Connection):
+        self.process = process
+        self.conn = conn
+        # 전달한 순서대로 실행되는 작업 (작업 번호 → 작업)
+        self.inflight: Dict[int, _Job] = {}
+        # 지금 실행 중인 작업과 시간 제한 시각 (time.monotonic 기준)
+        self.current: Optional[_Job] = None
+        self.deadline: Optional[float] = None
+        # 실행 중인 작업이 취소되었을 때 작업에 전달할 오류 (분배 스레드가 작업자를 종료함)
+        self.abort_error: Optional[BaseException] = None
+
+def _set_outcome(future: Future, ok: bool, value: Any) -> None:
+    """작업 결과를 Future에 전달합니다. 이미 취소된 작업의 결과는 버립니다."""
+    try:
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+    except InvalidStateError:
+        pass
+
+class ProcessExtractionPool(Executor):
+    """미리 시작한 작업자 프로세스에 작업을 묶어서 전달하는 실행기"""
+
+    def __init__(self, max_workers: Optional[int] = None, initializer: Optional[Callable[..., None]] = None,
+                 initargs: tuple = (), batch_size: int = DEFAULT_BATCH_SIZE,
+                 memory_limit_mb: float = 0, cpu_limit_seconds: float = 0):
+        """
+        Args:
+            max_workers: 작업자 프로세스 수 (기본값: CPU 수)
+            initializer: 작업자 프로세스가 시작될 때 한 번 호출되는 함수 (pickle 가능해야 함)
+            initargs: initializer에 전달할 인자
+            batch_size: 작업자에게 한 번에 전달할 최대 작업 수
+            memory_limit_mb: 작업자 프로세스의 최대 주소 공간 크기(MB), 0이면 제한 없음
+            cpu_limit_seconds: 작업 하나가 사용할 수 있는 CPU 시간(초), 0이면 제한 없음
+        """
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.initializer = initializer
+        self.initargs = initargs
+        self.batch_size = max(1, batch_size)
+        self.memory_limit_mb = memory_limit_mb
+        self.cpu_limit_seconds = cpu_limit_seconds
+        self.context = multiprocessing.get_context("spawn")
+        self.lock = threading.Lock()
+        self.jobs: "deque[_Job]" = deque()
+        self.workers: List[_Worker] = []
+        self.job_ids = itertools.count()
+        self.wake_reader, self.wake_writer = self.context.Pipe(duplex=False)
+        self.wake_pending = False
+        self.shutting_down = False
+        self.dispatcher: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """작업자 프로세스를 미리 시작합니다. 첫 submit에서도 자동으로 호출됩니다."""
+        with self.lock:
+            if self.dispatcher is not None or self.shutting_down:
+                return
+            for _ in range(self.max_workers):
+                self.workers.append(self._spawn_worker())
+            self.dispatcher = threading.Thread(target=self._dispatch_loop, name="extract-pool", daemon=True)
+            self.dispatcher.start()
+        # 인터프리터 종료 시 multiprocessing이 작업자를 종료하기 전에 새 작업자를 시작하지 않도록 표시
+        atexit.register(self._stop_respawning)
+        logger.info(f"Started {self.max_workers} extraction worker processes (batch size {self.batch_size}"
+                    + (f", memory limit {self.memory_limit_mb:g}MB" if self.memory_limit_mb > 0 else "")
+                    + (f", CPU limit {self.cpu_limit_seconds:g}s per job" if self.cpu_limit_seconds > 0 else "") + ")")
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        작업을 대기열에 추가합니다. fn과 인자는 pickle 가능해야 합니다.
+
+        Returns:
+            작업 결과를 받을 Future
+        """
+        return self.submit_with_timeout(None, fn, *args, **kwargs)
+
+    def submit_with_timeout(self, timeout: Optional[float], fn: Callable[..., Any], *args: Any,
+                            priority: int = INTERACTIVE, **kwargs: Any) -> Future:
+        """
+        시간 제한이 있는 작업을 대기열에 추가합니다. 작업이 시작된 뒤 시간 제한을 넘으면 작업자 프로세스를 종료하고
+        Future를 ExtractionTimeoutError로 실패 처리합니다.
+
+        Args:
+            timeout: 작업 시간 제한(초), None이면 제한 없음
+            fn: 작업자에서 실행할 함수 (pickle 가능해야 함)
+            priority: 작업 우선순위 (대기 중인 작업 중 우선순위가 높은 작업을 먼저 작업자에 전달)
+
+        Returns:
+            작업 결과를 받을 Future
+        """
+        future: Future = Future()
+        with self.lock:
+            if self.shutting_down:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            enqueue_by_priority(self.jobs, _Job(next(self.job_ids), future, fn, args, kwargs, timeout, priority))
+        self.start()
+        self._wake()
+        return future
+
+    def cancel(self, future: Future) -> bool:
+        """
+        submit()으로 추가한 작업을 취소합니다. 시작하지 않은 작업은 실행하지 않고,
+        실행 중인 작업은 작업자 프로세스를 종료하여 중단한 뒤 Future를 ExtractionCancelledError로 실패 처리합니다.
+
+        Args:
+            future: submit()이 반환한 Future
+
+        Returns:
+            작업을 취소했거나 중단을 요청했으면 True, 이미 끝난 작업이면 False
+        """
+        if future.cancel():
+            return True
+        with self.lock:
+            worker = next((worker for worker in self.workers
+                           if worker.current is not None and worker.current.future is future), None)
+            if worker is None:
+                return False
+            # 작업자 종료는 분배 스레드에서 시간 제한을 넘은 작업과 같은 방식으로 처리
+            worker.abort_error = ExtractionCancelledError("검색이 취소되어 추출을 중단했습니다.")
+            worker.deadline = 0.0
+        self._wake()
+        return True
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        새 작업을 받지 않고, 대기 중인 작업이 끝나면 작업자 프로세스를 종료합니다.
+
+        Args:
+            wait: 작업자가 모두 종료될 때까지 기다릴지 여부
+            cancel_futures: 아직 전달하지 않은 작업을 취소할지 여부
+        """
+        atexit.unregister(self._stop_respawning)
+        with self.lock:
+            self.shutting_down = True
+            if cancel_futures:
+                while self.jobs:
+                    self.jobs.popleft().future.cancel()
+            dispatcher = self.dispatcher
+        if dispatcher is None:
+            self.wake_reader.close()
+            self.wake_writer.close()
+            return
+        self._wake()
+        if wait:
+            dispatcher.join()
+
+    def _stop_respawning(self) -> None:
+        with self.lock:
+            self.shutting_down = True
+
+    def _wake(self) -> None:
+        """대기 중인 분배 스레드를 깨웁니다."""
+        with self.lock:
+            if self.wake_pending or self.dispatcher is None or self.wake_writer.closed:
+                return
+            self.wake_pending = True
+            self.wake_writer.send_bytes(b"\0")
+
+    def _spawn_worker(self) -> _Worker:
+        parent_conn, child_conn = self.context.Pipe()
+        process = self.context.Process(target=_worker_main,
+                                       args=(child_conn, self.initializer, self.initargs,
+                                             self.memory_limit_mb, self.cpu_limit_seconds),
+                                       name="extract-worker", daemon=True)
+        with _hidden_main_module():
+            process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn)
+
+    def _dispatch_loop(self) -> None:
+        """대기 중인 작업을 쉬고 있는 작업자에게 나누어 주고 결과를 Future에 전달합니다."""
+        while True:
+            with self.lock:
+                if self.shutting_down and not self.jobs and not any(worker.inflight for worker in self.workers):
+                    break
+                self._assign_jobs()
+                connections = {worker.conn: worker for worker in self.workers}
+                deadlines = [worker.deadline for worker in self.workers if worker.deadline is not None]
+
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            for conn in wait(list(connections) + [self.wake_reader], timeout):
+                if conn is self.wake_reader:
+                    with self.lock:
+                        while self.wake_reader.poll():
+                            self.wake_reader.recv_bytes()
+                        self.wake_pending = False
+                    continue
+
+                worker = connections[conn]
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    worker.process.join(WORKER_EXIT_TIMEOUT)
+                    exitcode = worker.process.exitcode
+                    limit_error = describe_exit(exitcode, self.memory_limit_mb, self.cpu_limit_seconds)
+                    if limit_error is not None:
+                        error = ExtractionResourceError(limit_error)
+                    else:
+                        error = WorkerDiedError(f"추출 작업자 프로세스가 비정상 종료되었습니다. (종료 코드: {exitcode})")
+                    self._replace_worker(worker, error)
+                    continue
+                self._handle_message(worker, message)
+
+            self._kill_overdue_workers()
+
+        self._stop_workers()
+
+    def _handle_message(self, worker: _Worker, message: tuple) -> None:
+        """작업자가 보낸 작업 시작/완료 메시지를 처리합니다."""
+        if message[0] == "start":
+            with self.lock:
+                job = worker.inflight.get(message[1])
+                worker.current = job
+                worker.deadline = None
+                worker.abort_error = None
+                if job is not None and job.timeout is not None:
+                    worker.deadline = time.monotonic() + job.timeout
+                if job is not None and not job.future.set_running_or_notify_cancel():
+                    # 작업자에게 전달한 뒤 취소된 작업은 실행할 필요가 없으므로 작업자를 종료하여 중단
+                    worker.abort_error = ExtractionCancelledError("검색이 취소되어 추출을 중단했습니다.")
+                    worker.deadline = 0.0
+        elif message[0] == "done":
+            _, job_id, ok, value = message
+            with self.lock:
+                job = worker.inflight.pop(job_id, None)
+                worker.current = None
+                worker.deadline = None
+                worker.abort_error = None
+            if job is not None:
+                _set_outcome(job.future, ok, value)
+
+    def _kill_overdue_workers(self) -> None:
+        """시간 제한을 넘었거나 취소된 작업을 실행 중인 작업자를 종료하고 새 작업자로 바꿉니다."""
+        now = time.monotonic()
+        with self.lock:
+            overdue = [worker for worker in self.workers if worker.deadline is not None and worker.deadline <= now]
+        for worker in overdue:
+            job = worker.current
+            if worker.abort_error is not None:
+                error = worker.abort_error
+                logger.info(f"Killing extraction worker {worker.process.pid}: job was cancelled")
+            else:
+                error = ExtractionTimeoutError(f"추출이 시간 제한({job.timeout:g}초)을 넘었습니다.")
+                logger.warning(f"Killing extraction worker {worker.process.pid}: job exceeded its {job.timeout:g}s time limit")
+            worker.process.kill()
+            worker.process.join()
+            self._replace_worker(worker, error)
+
+    def _assign_jobs(self) -> None:
+        """쉬고 있는 작업자에게 대기열의 작업을 고르게 묶어서 전달합니다. 잠금을 잡은 상태에서 호출해야 합니다."""
+        idle = [worker for worker in self.workers if not worker.inflight]
+        if not idle or not self.jobs:
+            return
+
+        per_worker = min(self.batch_size, max(1, math.ceil(len(self.jobs) / len(idle))))
+        for worker in idle:
+            batch = []
+            while self.jobs and len(batch) < per_worker:
+                job = self.jobs.popleft()
+                if job.future.cancelled():
+                    continue
+                batch.append(job)
+                worker.inflight[job.job_id] = job
+            if not batch:
+                break
+            try:
+                worker.conn.send([(job.job_id, job.fn, job.args, job.kwargs) for job in batch])
+            except Exception as e:
+                # pickle할 수 없는 작업이거나 작업자가 이미 종료된 경우 (종료는 EOF로 따로 처리됨)
+                logger.error(f"Failed to send {len(batch)} jobs to extraction worker {worker.process.pid}: {e}")
+                for job in batch:
+                    del worker.inflight[job.job_id]
+                    _set_outcome(job.future, False, e)
+
+    def _replace_worker(self, worker: _Worker, error: BaseException) -> None:
+        """
+        종료된 작업자를 새 작업자로 바꿉니다. 실행 중이던 작업은 error로 실패 처리하고,
+        아직 시작하지 않은 작업은 대기열 앞에 다시 넣습니다.
+        """
+        with self.lock:
+            current = worker.current
+            pending = [job for job in worker.inflight.values() if job is not current]
+            self.jobs.extendleft(reversed(pending))
+            worker.inflight.clear()
+            worker.current = None
+            worker.deadline = None
+            worker.conn.close()
+            self.workers.remove(worker)
+            if not self.shutting_down:
+                self.workers.append(self._spawn_worker())
+
+        # 종료 코드 0은 메모리를 많이 쓴 작업자가 스스로 종료한 경우
+        log = logger.info if worker.process.exitcode == 0 else logger.warning
+        log(f"Replaced extraction worker {worker.process.pid} (exit code {worker.process.exitcode}); "
+            f"requeued {len(pending)} jobs")
+        if current is not None:
+            _set_outcome(current.future, False, error)
+
+    def _stop_workers(self) -> None:
+        """작업자에게 종료를 요청하고, 제시간에 끝나지 않으면 강제로 종료합니다."""
+        with self.lock:
+            workers = list(self.workers)
+            self.workers.clear()
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in workers:
+            worker.process.join(WORKER_EXIT_TIMEOUT)
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+            worker.conn.close()
+        self.wake_reader.close()
+        self.wake_writer.close()
+        logger.info("Stopped extraction worker processes")
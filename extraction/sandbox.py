@@ -0,0 +1,111 @@
+"""
+파서 작업자 자원 제한
+
+손상된 PPTX 하나가 python-pptx의 메모리 사용량을 수 GB까지 늘려 검색 서버 전체를 종료시킨 적이 있습니다.
+이 모듈은 작업자 프로세스에 resource.setrlimit로 메모리(주소 공간)와 파일별 CPU 시간 제한을 적용하여,
+파서가 폭주해도 작업자 프로세스 하나와 파일 하나만 잃도록 합니다. (resource 모듈이 없는 Windows에서는 적용되지 않음)
+"""
+
+import sys
+import signal
+import logging
+import contextlib
+from typing import Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger("file_search.sandbox")
+
+class ExtractionResourceError(Exception):
+    """파일 추출이 작업자의 메모리 또는 CPU 시간 제한을 넘음"""
+    pass
+
+def limits_supported() -> bool:
+    """이 플랫폼에서 자원 제한을 적용할 수 있는지 확인합니다."""
+    return resource is not None
+
+def apply_memory_limit(memory_limit_mb: float) -> None:
+    """
+    현재 프로세스의 주소 공간 크기를 제한합니다. 제한을 넘는 할당은 MemoryError가 됩니다.
+
+    Args:
+        memory_limit_mb: 최대 주소 공간 크기(MB), 0 이하이면 제한하지 않음
+    """
+    if memory_limit_mb <= 0:
+        return
+    if resource is None:
+        logger.warning("resource module is not available, extraction memory limit is ignored")
+        return
+    limit = int(memory_limit_mb * 1024 * 1024)
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+def memory_exhausted(memory_limit_mb: float) -> bool:
+    """
+    프로세스의 최대 RSS가 메모리 제한의 절반을 넘었는지 확인합니다. 파이썬은 한 번 늘어난 힙을 운영체제에 잘 돌려주지 않고,
+    핸들러가 MemoryError를 오류 섹션으로 바꿔 반환하기도 하므로, 이런 작업자는 다음 파일을 처리하기 전에 새로 시작합니다.
+
+    Args:
+        memory_limit_mb: 작업자의 메모리 제한(MB), 0 이하이면 항상 False
+
+    Returns:
+        작업자를 새로 시작해야 하면 True
+    """
+    if memory_limit_mb <= 0 or resource is None:
+        return False
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss는 Linux에서 KB, macOS에서 바이트 단위
+    max_rss_mb = max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+    return max_rss_mb >= memory_limit_mb / 2
+
+@contextlib.contextmanager
+def cpu_time_limit(seconds: float) -> Iterator[None]:
+    """
+    with 블록에서 사용할 수 있는 CPU 시간을 제한합니다. 넘으면 커널이 SIGXCPU로 프로세스를 종료합니다.
+    RLIMIT_CPU는 프로세스 전체의 누적 시간에 적용되므로 블록을 시작할 때까지 사용한 시간에 제한을 더해 설정합니다.
+
+    Args:
+        seconds: 블록에서 사용할 수 있는 CPU 시간(초), 0 이하이면 제한하지 않음
+    """
+    if seconds <= 0 or resource is None:
+        yield
+        return
+    # SIGXCPU로 종료될 때 코어 파일을 남기지 않음
+    _, core_hard = resource.getrlimit(resource.RLIMIT_CORE)
+    resource.setrlimit(resource.RLIMIT_CORE, (0, core_hard))
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    limit = int(usage.ru_utime + usage.ru_stime + seconds) + 1
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+def describe_exit(exitcode: Optional[int], memory_limit_mb: float, cpu_limit_seconds: float) -> Optional[str]:
+    """
+    작업자 프로세스의 종료 코드가 자원 제한 때문인지 확인하고 오류 메시지를 만듭니다.
+
+    Args:
+        exitcode: multiprocessing.Process.exitcode
+        memory_limit_mb: 작업자의 메모리 제한(MB)
+        cpu_limit_seconds: 작업자의 파일별 CPU 시간 제한(초)
+
+    Returns:
+        자원 제한으로 종료되었으면 오류 메시지, 아니면 None
+    """
+    if exitcode is None or exitcode >= 0:
+        return None
+    if hasattr(signal, "SIGXCPU") and -exitcode == signal.SIGXCPU and cpu_limit_seconds > 0:
+        return f"CPU 시간 제한({cpu_limit_seconds:g}초)을 넘어 작업자 프로세스가 종료되었습니다."
+    if hasattr(signal, "SIGKILL") and -exitcode == signal.SIGKILL and memory_limit_mb > 0:
+        # 주소 공간 제한보다 먼저 커널의 OOM killer가 종료한 경우
+        return f"메모리가 부족하여 작업자 프로세스가 종료되었습니다. (메모리 제한: {memory_limit_mb:g}MB)"
+    return None
@@ -0,0 +1,173 @@
+"""
+추출 우선순위 스케줄러
+
+캐시 예열, 색인 갱신, 색인 감시기의 재색인은 검색과 같은 파서 스레드(또는 작업자 프로세스)와 디스크를 사용합니다.
+이 모듈은 작업을 대화형(검색, 디렉토리 목록)과 백그라운드 두 우선순위로 나누어, 대화형 작업이 진행 중이면
+백그라운드 추출을 새로 시작하지 않고, 대기열에서도 대화형 작업이 먼저 실행되도록 합니다.
+백그라운드 추출은 CPU 사용 비율과 초당 읽는 바이트 수로도 제한됩니다.
+"""
+
+import time
+import logging
+import threading
+import contextlib
+from collections import deque
+from typing import Any, ContextManager, Dict, Iterator
+
+logger = logging.getLogger("file_search.scheduler")
+
+# 작업 우선순위 (작을수록 먼저 실행)
+INTERACTIVE = 0
+BACKGROUND = 1
+
+DEFAULT_CPU_SHARE = 0.25
+# 토큰 버킷이 한 번에 허용하는 양 (초 단위 작업량)
+BURST_SECONDS = 1.0
+
+def enqueue_by_priority(queue: deque, item: Any) -> None:
+    """
+    우선순위가 높은 작업이 먼저 나오도록 대기열에 추가합니다. 같은 우선순위 안에서는 들어온 순서를 지킵니다.
+
+    Args:
+        queue: popleft()로 작업을 꺼내는 대기열
+        item: priority 속성이 있는 작업
+    """
+    index = len(queue)
+    while index > 0 and queue[index - 1].priority > item.priority:
+        index -= 1
+    queue.insert(index, item)
+
+class _TokenBucket:
+    """초당 rate만큼 채워지는 토큰 버킷 (rate가 0 이하이면 제한하지 않음)"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """토큰이 음수가 아니게 될 때까지 기다려야 하는 시간(초)을 반환합니다."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill(now)
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def charge(self, amount: float) -> None:
+        """사용한 양만큼 토큰을 뺍니다. 큰 파일 하나가 영원히 기다리지 않도록 음수가 될 수 있습니다."""
+        if self.rate > 0:
+            self._refill(time.monotonic())
+            self.tokens -= amount
+
+class PriorityScheduler:
+    """대화형 작업과 백그라운드 추출의 실행 순서와 자원 사용량을 조절하는 스케줄러"""
+
+    def __init__(self, cpu_share: float = DEFAULT_CPU_SHARE, io_bytes_per_second: float = 0,
+                 background_limit: int = 1):
+        """
+        Args:
+            cpu_share: 백그라운드 추출이 사용할 시간의 비율 (0~1), 파싱은 CPU 작업이므로 추출에 걸린 시간으로 계산
+            io_bytes_per_second: 백그라운드 추출이 초당 읽을 수 있는 바이트 수, 0 이하이면 제한하지 않음
+            background_limit: 동시에 실행할 수 있는 백그라운드 추출 수
+        """
+        self.cpu_share = min(max(cpu_share, 0.01), 1.0)
+        self.io_bytes_per_second = io_bytes_per_second
+        self.background_limit = max(1, background_limit)
+        self.cpu_bucket = _TokenBucket(self.cpu_share if self.cpu_share < 1.0 else 0, BURST_SECONDS)
+        self.io_bucket = _TokenBucket(io_bytes_per_second, io_bytes_per_second * BURST_SECONDS)
+        self.condition = threading.Condition()
+        self.interactive_count = 0
+        self.background_running = 0
+        self.background_waiting = 0
+        self.preempted = 0
+
+    @contextlib.contextmanager
+    def interactive(self) -> Iterator[None]:
+        """with 블록이 끝날 때까지 대화형 작업이 진행 중임을 표시하여 백그라운드 추출을 멈춥니다."""
+        with self.condition:
+            self.interactive_count += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.interactive_count -= 1
+                if self.interactive_count == 0:
+                    self.condition.notify_all()
+
+    @contextlib.contextmanager
+    def background(self, io_bytes: int = 0) -> Iterator[None]:
+        """
+        백그라운드 추출을 실행할 차례가 될 때까지 기다린 뒤 with 블록을 실행합니다.
+        대화형 작업이 진행 중이거나, 다른 백그라운드 추출이 한도만큼 실행 중이거나,
+        CPU 사용 비율이나 읽기 속도 한도를 넘었으면 기다립니다.
+
+        Args:
+            io_bytes: 추출하면서 읽을 바이트 수 (파일 크기)
+        """
+        with self.condition:
+            self.background_waiting += 1
+            waited_for_interactive = False
+            try:
+                while True:
+                    if self.interactive_count > 0:
+                        waited_for_interactive = True
+                        self.condition.wait()
+                        continue
+                    if self.background_running >= self.background_limit:
+                        self.condition.wait()
+                        continue
+                    now = time.monotonic()
+                    delay = max(self.cpu_bucket.delay(now), self.io_bucket.delay(now))
+                    if delay > 0:
+                        self.condition.wait(delay)
+                        continue
+                    break
+            finally:
+                self.background_waiting -= 1
+            if waited_for_interactive:
+                self.preempted += 1
+                logger.debug("Background extraction resumed after interactive work finished")
+            self.background_running += 1
+            self.io_bucket.charge(io_bytes)
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.background_running -= 1
+                self.cpu_bucket.charge(time.monotonic() - started)
+                self.condition.notify_all()
+
+    def slot(self, priority: int, io_bytes: int = 0) -> ContextManager[None]:
+        """
+        우선순위에 맞는 with 블록을 반환합니다. 대화형 작업은 기다리지 않고 바로 실행합니다.
+
+        Args:
+            priority: INTERACTIVE 또는 BACKGROUND
+            io_bytes: 백그라운드 추출이 읽을 바이트 수
+        """
+        if priority == BACKGROUND:
+            return self.background(io_bytes)
+        return contextlib.nullcontext()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        스케줄러 상태를 반환합니다.
+
+        Returns:
+            진행 중인 대화형 작업 수, 실행 중이거나 기다리는 백그라운드 추출 수, 대화형 작업 때문에 기다린 백그라운드 추출 수
+        """
+        with self.condition:
+            return {
+                "interactive": self.interactive_count,
+                "background_running": self.background_running,
+                "background_waiting": self.background_waiting,
+                "background_preempted": self.preempted,
+                "cpu_share": self.cpu_share,
+                "io_bytes_per_second": self.io_bytes_per_second
+            }
@@ -0,0 +1,11 @@
+"""
+추출 시간 제한
+
+손상된 PDF 하나가 파싱을 몇 분 동안 멈추게 해도 검색 전체가 멈추지 않도록 파일별 추출 시간을 제한합니다.
+작업자 프로세스에서 실행 중인 추출은 ProcessExtractionPool이 작업자를 종료하여 강제로 중단하며,
+파서 스레드에서 실행 중인 추출은 강제로 중단할 수 없으므로 ParserThreads가 결과를 기다리지 않고 포기합니다.
+"""
+
+class ExtractionTimeoutError(TimeoutError):
+    """파일 추출이 시간 제한을 넘음"""
+    pass
@@ -0,0 +1,184 @@
+"""
+추출 결과 캐시 예열
+
+서버를 다시 시작한 직후에는 캐시가 비어 있어 처음 몇 번의 검색이 느립니다. 이 모듈은 검색 디렉토리의
+파일을 미리 추출하여 캐시를 채우는 예열기를 제공합니다. 최근에 수정된 파일을 먼저 처리한 뒤
+설정된 디렉토리 순서대로 나머지 파일을 처리하며, 추출에 걸린 시간에 비례하여 쉬어서
+예열이 검색 요청의 자원을 모두 차지하지 않도록 합니다.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from pathlib import Path
+from concurrent.futures import Executor
+from typing import List, Dict, Any, Iterable, Callable, Optional, Awaitable
+
+logger = logging.getLogger("file_search.warmup")
+
+DEFAULT_RECENT_FILES = 200
+DEFAULT_DUTY_CYCLE = 0.5
+
+class CacheWarmer:
+    """최근 수정된 파일부터 추출 결과 캐시를 채우는 예열기"""
+
+    def __init__(self, extract_fn: Callable[[Path], List[Dict[str, Any]]],
+                 recent_files: int = DEFAULT_RECENT_FILES, duty_cycle: float = DEFAULT_DUTY_CYCLE):
+        """
+        Args:
+            extract_fn: 파일을 추출하여 캐시에 저장하는 함수
+            recent_files: 디렉토리 순서보다 먼저 처리할 최근 수정 파일 수
+            duty_cycle: 예열이 추출에 사용할 시간의 비율 (0~1, 나머지 시간은 쉼)
+        """
+        self.extract_fn = extract_fn
+        self.recent_files = recent_files
+        self.duty_cycle = min(max(duty_cycle, 0.01), 1.0)
+        # 예열은 한 번에 하나만 실행
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+
+    def plan(self, directories: List[Path], list_files: Callable[[Path], Iterable[Path]]) -> List[Path]:
+        """
+        예열할 파일 순서를 정합니다. 모든 디렉토리에서 가장 최근에 수정된 recent_files개를 먼저,
+        나머지는 설정된 디렉토리 순서대로 처리합니다.
+
+        Args:
+            directories: 검색 디렉토리 목록 (우선순위 순서)
+            list_files: 디렉토리 아래의 지원되는 파일을 찾는 함수
+
+        Returns:
+            예열할 파일 경로 목록
+        """
+        files = []
+        seen = set()
+        for directory in directories:
+            for file_path in list_files(directory):
+                if str(file_path) in seen:
+                    continue
+                seen.add(str(file_path))
+                try:
+                    files.append((file_path, file_path.stat().st_mtime_ns))
+                except OSError:
+                    continue
+
+        recent = sorted(files, key=lambda item: item[1], reverse=True)[:self.recent_files]
+        recent_paths = {str(file_path) for file_path, _ in recent}
+        return [file_path for file_path, _ in recent] + \
+               [file_path for file_path, _ in files if str(file_path) not in recent_paths]
+
+    def throttle_delay(self, elapsed: float) -> float:
+        """추출에 걸린 시간만큼 일한 뒤 쉴 시간을 계산합니다."""
+        return elapsed * (1.0 - self.duty_cycle) / self.duty_cycle
+
+    def run(self, files: List[Path], progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """
+        현재 스레드에서 파일을 차례로 추출합니다. stop()이 호출되면 중단합니다.
+
+        Args:
+            files: plan()이 정한 파일 목록
+            progress_callback: 파일을 하나 처리할 때마다 (처리한 수, 전체 수)로 호출되는 함수
+
+        Returns:
+            예열 통계 (files, warmed, failed, elapsed_seconds, stopped)
+        """
+        if not self.lock.acquire(blocking=False):
+            raise RuntimeError("캐시 예열이 이미 실행 중입니다.")
+        try:
+            self.stop_event.clear()
+            stats = self._new_stats(files)
+            for done, file_path in enumerate(files, start=1):
+                if self.stop_event.is_set():
+                    stats["stopped"] = True
+                    break
+                elapsed = self._warm_file(file_path, stats)
+                if progress_callback:
+                    progress_callback(done, len(files))
+                self.stop_event.wait(self.throttle_delay(elapsed))
+            return self._finish(stats)
+        finally:
+            self.lock.release()
+
+    async def run_async(self, files: List[Path],
+                        progress_callback: Optional[Callable[[int, int], Awaitable[None]]] = None,
+                        executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """
+        이벤트 루프를 막지 않도록 각 파일을 실행기에서 추출하면서 예열합니다.
+
+        Args:
+            files: plan()이 정한 파일 목록
+            progress_callback: 파일을 하나 처리할 때마다 (처리한 수, 전체 수)로 호출되는 코루틴 함수
+            executor: 추출을 실행할 실행기 (지정하지 않으면 이벤트 루프의 기본 실행기)
+
+        Returns:
+            예열 통계 (files, warmed, failed, elapsed_seconds, stopped)
+        """
+        if not self.lock.acquire(blocking=False):
+            raise RuntimeError("캐시 예열이 이미 실행 중입니다.")
+        try:
+            loop = asyncio.get_running_loop()
+            self.stop_event.clear()
+            stats = self._new_stats(files)
+            for done, file_path in enumerate(files, start=1):
+                if self.stop_event.is_set():
+                    stats["stopped"] = True
+                    break
+                elapsed = await loop.run_in_executor(executor, self._warm_file, file_path, stats)
+                if progress_callback:
+                    await progress_callback(done, len(files))
+                await asyncio.sleep(self.throttle_delay(elapsed))
+            return self._finish(stats)
+        finally:
+            self.lock.release()
+
+    def start_background(self, directories: List[Path], list_files: Callable[[Path], Iterable[Path]]) -> threading.Thread:
+        """
+        데몬 스레드에서 예열을 시작합니다. (서버 시작 시 사용)
+
+        Args:
+            directories: 검색 디렉토리 목록
+            list_files: 디렉토리 아래의 지원되는 파일을 찾는 함수
+
+        Returns:
+            시작된 스레드
+        """
+        def worker():
+            try:
+                self.run(self.plan(directories, list_files))
+            except Exception as e:
+                logger.error(f"Cache warm-up failed: {e}")
+
+        thread = threading.Thread(target=worker, name="cache-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        """실행 중인 예열을 중단합니다."""
+        self.stop_event.set()
+
+    def is_running(self) -> bool:
+        """예열이 실행 중인지 확인합니다."""
+        return self.lock.locked()
+
+    def _new_stats(self, files: List[Path]) -> Dict[str, Any]:
+        logger.info(f"Starting cache warm-up of {len(files)} files")
+        return {"files": len(files), "warmed": 0, "failed": 0, "started": time.time(), "stopped": False}
+
+    def _finish(self, stats: Dict[str, Any]) -> Dict[str, Any]:
+        stats["elapsed_seconds"] = round(time.time() - stats.pop("started"), 2)
+        logger.info(f"Cache warm-up finished: {stats}")
+        return stats
+
+    def _warm_file(self, file_path: Path, stats: Dict[str, Any]) -> float:
+        """파일 하나를 추출하고 걸린 시간을 반환합니다."""
+        start_time = time.time()
+        try:
+            sections = self.extract_fn(file_path)
+            if any(section.get("section_type") == "error" for section in sections):
+                stats["failed"] += 1
+            else:
+                stats["warmed"] += 1
+        except Exception as e:
+            logger.error(f"Error warming cache for {file_path}: {e}")
+            stats["failed"] += 1
+        return time.time() - start_time
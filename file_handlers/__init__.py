@@ -10,9 +10,25 @@ from file_handlers.pdf_handler import PDFHandler
 from file_handlers.docx_handler import DOCXHandler
 from file_handlers.text_handler import TextHandler
 
+def create_default_registry() -> FileHandlerRegistry:
+    """
+    기본 파일 핸들러를 모두 등록한 레지스트리를 생성합니다.
+    검색 서버와 일괄 색인기가 같은 핸들러 구성을 사용하도록 새 핸들러는 여기에 등록합니다.
+    
+    Returns:
+        파일 핸들러 레지스트리
+    """
+    registry = FileHandlerRegistry()
+    registry.register_handler(PPTXHandler())
+    registry.register_handler(PDFHandler())
+    registry.register_handler(DOCXHandler())
+    registry.register_handler(TextHandler())
+    return registry
+
 __all__ = [
     'FileHandler',
     'FileHandlerRegistry',
+    'create_default_registry',
     'PPTXHandler',
     'PDFHandler',
     'DOCXHandler',
@@ -46,6 +46,16 @@ class FileHandler(abc.ABC):
         """
         pass
     
+    def get_version(self) -> int:
+        """
+        이 핸들러의 텍스트 추출 방식 버전을 반환합니다.
+        추출 결과가 달라지도록 핸들러를 수정하면 버전을 올려 기존 색인이 다시 만들어지도록 합니다.
+        
+        Returns:
+            핸들러 버전
+        """
+        return 1
+    
     def can_handle(self, file_path: Path) -> bool:
         """
         이 핸들러가 지정된 파일을 처리할 수 있는지 확인합니다.
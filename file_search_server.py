@@ -15,19 +15,27 @@ import logging
 import traceback
 import asyncio
 import time
+import itertools
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, CancelledError
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple, Generator
+from typing import List, Dict, Any, Optional, Tuple, Generator, Callable
 
 from fastmcp import FastMCP, Context
 from pydantic import BaseModel, Field, validator
 
 # 파일 핸들러 모듈 임포트
-from file_handlers import FileHandlerRegistry, FileHandler
-from file_handlers.pptx_handler import PPTXHandler
-from file_handlers.pdf_handler import PDFHandler
-from file_handlers.docx_handler import DOCXHandler
-from file_handlers.text_handler import TextHandler
+from file_handlers import FileHandlerRegistry, FileHandler, create_default_registry
+
+# 검색 색인 모듈 임포트
+from search_index import IncrementalIndexer, IndexWatcher, create_index
+
+# 추출 결과 캐시 모듈 임포트
+from extraction import ExtractionCache, FailureCache, SectionCache, CacheWarmer
+from extraction import ProcessExtractionPool, init_extraction_worker, extract_with_handler
+from extraction import ExtractionTimeoutError, ExtractionResourceError, CancellationToken, ExtractionCancelledError
+from extraction import AdaptiveLimiter, ParserThreads, prefetch_file
+from extraction import PriorityScheduler, INTERACTIVE, BACKGROUND
 
 # 현재 디렉토리를 Python 경로에 추가
 current_dir = Path(__file__).parent.absolute()
@@ -45,6 +53,45 @@ LOG_LEVEL = os.environ.get("FILE_LOG_LEVEL", "INFO")
 DEFAULT_LIMIT = 20  # 한 번에 반환할 기본 파일 개수
 MAX_LIMIT = 50      # 한 번에 반환할 최대 파일 개수
 MAX_CONTENT_PER_FILE = 10  # 파일당 처리할 최대 섹션 수 (슬라이드, 페이지 등)
+PIPELINE_QUEUE_SIZE = 256  # 검색의 탐색/추출/매칭 단계 사이 대기열의 최대 길이
+WALK_BATCH_SIZE = 64  # 디렉토리 탐색 단계가 작업 스레드에서 한 번에 찾는 파일 수
+INDEX_ENABLED = os.environ.get("FILE_INDEX_ENABLED", "true").lower() in ("1", "true", "yes")
+INDEX_DIR = os.environ.get("FILE_INDEX_DIR", str(Path.home() / ".file_search" / "index"))
+INDEX_BACKEND = os.environ.get("FILE_INDEX_BACKEND", "native")  # native 또는 fts5
+INDEX_WATCH = os.environ.get("FILE_INDEX_WATCH", "true").lower() in ("1", "true", "yes")
+INDEX_WATCH_DEBOUNCE = float(os.environ.get("FILE_INDEX_WATCH_DEBOUNCE", "2"))  # 마지막 변경 후 재색인까지 대기 시간(초)
+INDEX_POLL_INTERVAL = float(os.environ.get("FILE_INDEX_POLL_INTERVAL", "30"))  # inotify를 쓸 수 없을 때 폴링 주기(초)
+INDEX_MERGE_FACTOR = int(os.environ.get("FILE_INDEX_MERGE_FACTOR", "10"))  # 한 번에 병합할 비슷한 크기의 색인 세그먼트 수
+EXTRACT_CACHE_ENABLED = os.environ.get("FILE_EXTRACT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+EXTRACT_CACHE_DIR = os.environ.get("FILE_EXTRACT_CACHE_DIR", str(Path.home() / ".file_search" / "extract_cache"))
+EXTRACT_CACHE_MAX_MB = float(os.environ.get("FILE_EXTRACT_CACHE_MAX_MB", "512"))  # 추출 결과 캐시의 최대 크기(MB)
+DEDUP_MAX_MB = float(os.environ.get("FILE_DEDUP_MAX_MB", "64"))  # 내용 해시로 같은 파일을 찾을 최대 파일 크기(MB), 0이면 찾지 않음
+EXTRACT_WORKERS = int(os.environ.get("FILE_EXTRACT_WORKERS", str(min(32, (os.cpu_count() or 1) + 4))))  # 검색 중 동시에 추출할 파일 수
+EXTRACT_MODE = os.environ.get("FILE_EXTRACT_MODE", "thread")  # thread: 작업 스레드에서 파싱, process: 작업자 프로세스에서 파싱, sandbox: 자원이 제한된 작업자 프로세스에서 파싱
+EXTRACT_PROCESSES = int(os.environ.get("FILE_EXTRACT_PROCESSES", str(os.cpu_count() or 1)))  # process 모드의 작업자 프로세스 수
+EXTRACT_BATCH_SIZE = int(os.environ.get("FILE_EXTRACT_BATCH_SIZE", "4"))  # process 모드에서 작업자에게 한 번에 전달할 파일 수
+EXTRACT_MEMORY_LIMIT_MB = float(os.environ.get("FILE_EXTRACT_MEMORY_LIMIT_MB", "2048" if EXTRACT_MODE == "sandbox" else "0"))  # 작업자 프로세스의 메모리 제한(MB), 0이면 제한 없음
+EXTRACT_CPU_LIMIT_SECONDS = float(os.environ.get("FILE_EXTRACT_CPU_LIMIT_SECONDS", "120" if EXTRACT_MODE == "sandbox" else "0"))  # 작업자 프로세스에서 파일 하나의 CPU 시간 제한(초), 0이면 제한 없음
+PREFETCH_MAX_MB = float(os.environ.get("FILE_PREFETCH_MAX_MB", "64"))  # thread 모드에서 파싱 전에 미리 읽을 파일의 최대 크기(MB), 0이면 미리 읽지 않음
+EXTRACT_CPU_WORKERS = int(os.environ.get("FILE_EXTRACT_CPU_WORKERS", str(os.cpu_count() or 1)))  # thread 모드에서 동시에 파싱할 스레드 수
+ADAPTIVE_CONCURRENCY = os.environ.get("FILE_ADAPTIVE_CONCURRENCY", "true").lower() in ("1", "true", "yes")
+CONCURRENCY_INITIAL = int(os.environ.get("FILE_CONCURRENCY_INITIAL", "4"))  # 디렉토리별 처음 추출 동시 처리 한도
+CONCURRENCY_MIN = int(os.environ.get("FILE_CONCURRENCY_MIN", "1"))  # 디렉토리별 최소 추출 동시 처리 한도
+EXTRACT_TIMEOUT = float(os.environ.get("FILE_EXTRACT_TIMEOUT", "60"))  # 파일 하나의 추출 시간 제한(초), 0이면 제한 없음
+# 확장자별 추출 시간 제한(초), 예: "pdf=120;pptx=90"
+EXTRACT_HANDLER_TIMEOUTS = {
+    "." + ext.strip().lower().lstrip("."): float(seconds)
+    for ext, seconds in (item.split("=", 1) for item in os.environ.get("FILE_EXTRACT_HANDLER_TIMEOUTS", "").split(";") if "=" in item)
+}
+FAILURE_CACHE_ENABLED = os.environ.get("FILE_FAILURE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+FAILURE_RETRY_HOURS = float(os.environ.get("FILE_FAILURE_RETRY_HOURS", "24"))  # 변경되지 않은 실패 파일을 다시 시도하기까지의 시간, 0이면 변경될 때까지 재시도하지 않음
+SECTION_CACHE_MB = float(os.environ.get("FILE_SECTION_CACHE_MB", "64"))  # 메모리 섹션 캐시의 최대 크기(MB), 0이면 사용하지 않음
+WARMUP_ON_START = os.environ.get("FILE_WARMUP_ON_START", "false").lower() in ("1", "true", "yes")
+WARMUP_RECENT_FILES = int(os.environ.get("FILE_WARMUP_RECENT_FILES", "200"))  # 디렉토리 순서보다 먼저 예열할 최근 수정 파일 수
+WARMUP_DUTY_CYCLE = float(os.environ.get("FILE_WARMUP_DUTY_CYCLE", "1"))  # 예열이 추출에 사용할 시간의 비율 (나머지는 쉼, 백그라운드 추출 한도와 별도로 적용)
+BACKGROUND_CPU_SHARE = float(os.environ.get("FILE_BACKGROUND_CPU_SHARE", "0.25"))  # 백그라운드 추출(예열, 색인 갱신, 재색인)이 사용할 시간의 비율
+BACKGROUND_IO_MBPS = float(os.environ.get("FILE_BACKGROUND_IO_MBPS", "20"))  # 백그라운드 추출이 초당 읽을 수 있는 양(MB), 0이면 제한 없음
+SEARCH_COALESCE = os.environ.get("FILE_SEARCH_COALESCE", "true").lower() in ("1", "true", "yes")  # 진행 중인 동일한 검색 요청을 하나로 합침
 
 # 로그 설정
 log_dir = Path(LOG_DIR)
@@ -65,11 +112,80 @@ logging.basicConfig(
 logger = logging.getLogger("file_search")
 
 # 파일 핸들러 레지스트리 설정
-handler_registry = FileHandlerRegistry()
-handler_registry.register_handler(PPTXHandler())
-handler_registry.register_handler(PDFHandler())
-handler_registry.register_handler(DOCXHandler())
-handler_registry.register_handler(TextHandler())
+handler_registry = create_default_registry()
+
+# 검색 색인 설정 (색인되지 않은 파일은 검색 시 직접 내용을 추출)
+file_index = None
+if INDEX_ENABLED:
+    file_index = create_index(INDEX_BACKEND, Path(INDEX_DIR), merge_factor=INDEX_MERGE_FACTOR, roots=SEARCH_DIRS)
+
+# 추출 결과 캐시 설정 (변경되지 않은 파일은 다시 파싱하지 않음)
+extraction_cache = None
+if EXTRACT_CACHE_ENABLED:
+    extraction_cache = ExtractionCache(Path(EXTRACT_CACHE_DIR), int(EXTRACT_CACHE_MAX_MB * 1024 * 1024),
+                                       dedup_max_bytes=int(DEDUP_MAX_MB * 1024 * 1024))
+    extraction_cache.load()
+
+# 추출에 실패한 파일 기록 (변경되지 않은 손상/암호화 파일은 다시 파싱하지 않음)
+failure_cache = None
+if FAILURE_CACHE_ENABLED:
+    failure_cache = FailureCache(Path(EXTRACT_CACHE_DIR), FAILURE_RETRY_HOURS * 3600)
+    failure_cache.load()
+
+# 자주 검색되는 문서의 섹션을 메모리에 보관 (파싱과 디스크 읽기를 모두 줄임)
+section_cache = SectionCache(int(SECTION_CACHE_MB * 1024 * 1024)) if SECTION_CACHE_MB > 0 else None
+
+# 파서 작업자 프로세스 (process 모드에서 CPU를 쓰는 파싱을 여러 코어에서 실행, 핸들러 라이브러리를 미리 임포트)
+extraction_process_pool = None
+# (sandbox 모드에서는 작업자의 메모리와 CPU 시간을 제한하여 파서가 폭주해도 파일 하나만 실패하고 서버는 계속 동작)
+if EXTRACT_MODE in ("process", "sandbox"):
+    extraction_process_pool = ProcessExtractionPool(EXTRACT_PROCESSES, initializer=init_extraction_worker,
+                                                    batch_size=EXTRACT_BATCH_SIZE,
+                                                    memory_limit_mb=EXTRACT_MEMORY_LIMIT_MB,
+                                                    cpu_limit_seconds=EXTRACT_CPU_LIMIT_SECONDS)
+    extraction_process_pool.start()
+elif EXTRACT_MEMORY_LIMIT_MB > 0 or EXTRACT_CPU_LIMIT_SECONDS > 0:
+    logger.warning("FILE_EXTRACT_MEMORY_LIMIT_MB and FILE_EXTRACT_CPU_LIMIT_SECONDS only apply to process and sandbox modes")
+
+# 검색 중 동시에 추출할 파일 수 (process 모드에서는 모든 작업자가 묶음을 채울 수 있을 만큼)
+extract_concurrency = EXTRACT_WORKERS
+if extraction_process_pool is not None:
+    extract_concurrency = max(EXTRACT_WORKERS, EXTRACT_PROCESSES * EXTRACT_BATCH_SIZE)
+
+# 파일 추출 실행기 (추출이 이벤트 루프를 막지 않도록 작업 스레드에서 실행)
+extraction_executor = ThreadPoolExecutor(max_workers=extract_concurrency, thread_name_prefix="extract")
+
+# 대화형 작업(검색, 디렉토리 목록)이 진행 중이면 백그라운드 추출을 멈추고, 백그라운드 추출의 CPU 사용 비율과 읽기 속도를 제한
+extraction_scheduler = PriorityScheduler(BACKGROUND_CPU_SHARE, BACKGROUND_IO_MBPS * 1024 * 1024)
+
+# 백그라운드 작업 실행기 (예열과 색인 갱신이 검색의 추출 실행기 스레드를 차지하지 않도록 따로 실행)
+background_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="background")
+
+# 파싱은 CPU 작업이므로 thread 모드에서는 파일을 읽는 작업 스레드 수와 따로 코어 수만큼의 파서 스레드에서 실행
+# (process 모드에서는 작업자 프로세스가 같은 역할을 함)
+parser_threads = ParserThreads(EXTRACT_CPU_WORKERS) if extraction_process_pool is None else None
+
+# 검색 디렉토리별 적응형 추출 동시 처리 한도 (디렉토리 경로 → 제한기)
+root_limiters: Dict[str, AdaptiveLimiter] = {}
+
+def root_limiter(directory: Path) -> AdaptiveLimiter:
+    """
+    디렉토리의 추출 동시 처리 한도를 조절하는 제한기를 반환합니다. 제한기는 검색 사이에 유지되어
+    로컬 디스크에서는 한도를 높이고 느린 네트워크 공유 폴더에서는 낮춥니다.
+    
+    Args:
+        directory: 검색 디렉토리
+        
+    Returns:
+        디렉토리의 제한기
+    """
+    key = str(directory)
+    if key not in root_limiters:
+        if ADAPTIVE_CONCURRENCY:
+            root_limiters[key] = AdaptiveLimiter(CONCURRENCY_INITIAL, CONCURRENCY_MIN, extract_concurrency)
+        else:
+            root_limiters[key] = AdaptiveLimiter(extract_concurrency, extract_concurrency, extract_concurrency)
+    return root_limiters[key]
 
 # FastMCP 서버 생성
 mcp = FastMCP(
@@ -90,6 +206,7 @@ class SearchQuery(BaseModel):
     keywords: str = Field(description="검색 키워드")
     directory: Optional[str] = Field(default=None, description="검색할 디렉토리 (지정하지 않으면 기본 디렉토리 사용)")
     file_type: Optional[str] = Field(default=None, description="검색할 파일 형식 (지정하지 않으면 모든 지원 형식 검색)")
+    match_mode: str = Field(default="word", description="매칭 방식 (word: 단어 단위, substring: 조사가 붙은 단어나 복합어 안의 부분 문자열까지 매칭)")
     
     @validator('directory')
     def validate_directory(cls, v):
@@ -104,6 +221,58 @@ class SearchQuery(BaseModel):
         if v == "null":
             return None
         return v
+    
+    @validator('match_mode', pre=True)
+    def validate_match_mode(cls, v):
+        # 지정하지 않았거나 "null"이면 단어 단위 매칭 사용
+        if v is None or v == "null":
+            return "word"
+        if v not in ("word", "substring"):
+            raise ValueError("match_mode는 'word' 또는 'substring'이어야 합니다.")
+        return v
+
+class IndexRefreshQuery(BaseModel):
+    """색인 갱신 쿼리 모델"""
+    directory: Optional[str] = Field(default=None, description="갱신할 디렉토리 (지정하지 않으면 모든 설정 디렉토리)")
+    rebuild: bool = Field(default=False, description="검색 디렉토리의 색인 샤드를 비우고 모든 파일을 다시 색인할지 여부")
+    
+    @validator('directory')
+    def validate_directory(cls, v):
+        # "null" 문자열을 None으로 변환
+        if v == "null":
+            return None
+        return v
+
+class CacheWarmupQuery(BaseModel):
+    """캐시 예열 쿼리 모델"""
+    directory: Optional[str] = Field(default=None, description="예열할 디렉토리 (지정하지 않으면 모든 설정 디렉토리)")
+    limit: Optional[int] = Field(default=None, description="예열할 최대 파일 수 (지정하지 않으면 모든 파일)", ge=1)
+    
+    @validator('directory')
+    def validate_directory(cls, v):
+        # "null" 문자열을 None으로 변환
+        if v == "null":
+            return None
+        return v
+    
+    @validator('limit', pre=True)
+    def validate_limit(cls, v):
+        # "null" 문자열을 None으로 변환
+        if v == "null":
+            return None
+        return v
+
+class FailedFilesQuery(BaseModel):
+    """추출 실패 파일 목록 쿼리 모델"""
+    directory: Optional[str] = Field(default=None, description="조회할 디렉토리 (지정하지 않으면 모든 파일)")
+    clear: bool = Field(default=False, description="목록을 반환한 뒤 실패 기록을 삭제하여 다음 검색 때 다시 추출할지 여부")
+    
+    @validator('directory')
+    def validate_directory(cls, v):
+        # "null" 문자열을 None으로 변환
+        if v == "null":
+            return None
+        return v
 
 class DirectoryListingQuery(BaseModel):
     """디렉토리 목록 쿼리 모델"""
@@ -126,7 +295,8 @@ class DirectoryListingQuery(BaseModel):
             return None
         return v
 
-def find_files(directory: Path, file_type: Optional[str] = None, recursive: bool = True) -> Generator[Path, None, None]:
+def find_files(directory: Path, file_type: Optional[str] = None, recursive: bool = True,
+               strict: bool = False) -> Generator[Path, None, None]:
     """
     지정된 디렉토리에서 지원되는 파일을 찾아 생성자로 반환합니다.
     
@@ -134,14 +304,24 @@ def find_files(directory: Path, file_type: Optional[str] = None, recursive: bool
         directory: 검색할 디렉토리
         file_type: 찾을 파일 형식 (지정하지 않으면 모든 지원 형식 검색)
         recursive: 하위 디렉토리도 검색할지 여부
+        strict: True이면 읽을 수 없는 디렉토리가 있을 때 건너뛰지 않고 OSError를 발생시킴
+            (목록에 없는 파일을 삭제된 것으로 보는 색인 갱신처럼 목록이 완전해야 하는 경우)
         
     Yields:
         찾은 파일 경로
+        
+    Raises:
+        OSError: strict이고 디렉토리를 읽을 수 없는 경우 (연결이 끊긴 공유 폴더, 권한 오류 등)
     """
+    def on_walk_error(error: OSError) -> None:
+        if strict:
+            raise error
+        logger.warning(f"디렉토리를 읽을 수 없어 건너뜁니다: {error}")
+    
     try:
         if recursive:
             # 메모리 효율적인 방식으로 파일 찾기
-            for root, _, files in os.walk(directory):
+            for root, _, files in os.walk(directory, onerror=on_walk_error):
                 root_path = Path(root)
                 for file in files:
                     file_path = root_path / file
@@ -152,19 +332,44 @@ def find_files(directory: Path, file_type: Optional[str] = None, recursive: bool
                 if file.is_file() and handler_registry.can_handle_file(file, file_type):
                     yield file
     except Exception as e:
+        if strict:
+            raise
         logger.error(f"디렉토리 검색 중 오류 발생: {e}")
         # 예외가 발생해도 생성자는 종료되므로 빈 리스트 반환 없음
 
-def extract_text_from_file(file_path: Path, max_content_sections: int = MAX_CONTENT_PER_FILE) -> List[Dict[str, Any]]:
+def extraction_timeout(file_path: Path) -> Optional[float]:
+    """
+    파일의 추출 시간 제한을 반환합니다. 확장자별 설정이 없으면 FILE_EXTRACT_TIMEOUT을 사용합니다.
+    
+    Args:
+        file_path: 파일 경로
+        
+    Returns:
+        시간 제한(초), 제한이 없으면 None
+    """
+    timeout = EXTRACT_HANDLER_TIMEOUTS.get(file_path.suffix.lower(), EXTRACT_TIMEOUT)
+    return timeout if timeout > 0 else None
+
+def extract_text_from_file(file_path: Path, max_content_sections: int = MAX_CONTENT_PER_FILE,
+                           cancel_token: Optional[CancellationToken] = None,
+                           priority: int = INTERACTIVE,
+                           on_read: Optional[Callable[[float], None]] = None) -> List[Dict[str, Any]]:
     """
     파일에서 텍스트를 추출합니다.
     
     Args:
         file_path: 파일 경로
         max_content_sections: 처리할 최대 섹션 수 (슬라이드, 페이지 등)
+        cancel_token: 검색이 취소되면 추출을 중단할 토큰
+        priority: 추출 우선순위 (BACKGROUND이면 캐시에 없는 파일은 스케줄러가 허용할 때 추출)
+        on_read: 파일을 실제로 읽었을 때 읽는 데 걸린 시간(초)으로 호출할 함수
+            (캐시나 실패 기록을 사용하여 파일을 읽지 않았으면 호출하지 않음)
         
     Returns:
         섹션별 텍스트 정보 리스트
+        
+    Raises:
+        ExtractionCancelledError: cancel_token이 취소된 경우
     """
     try:
         logger.info(f"Extracting text from {file_path}")
@@ -176,24 +381,196 @@ def extract_text_from_file(file_path: Path, max_content_sections: int = MAX_CONT
             logger.warning(f"No handler found for {file_path}")
             return [{"section_number": 0, "text": "지원되지 않는 파일 형식입니다."}]
         
-        content_sections = handler.extract_text(file_path, max_content_sections)
+        # 파일이 변경되지 않았으면 메모리 캐시, 디스크 캐시 순서로 캐시된 추출 결과 사용
+        stat = file_path.stat()
+        if section_cache is not None:
+            cached_sections = section_cache.get(file_path, stat, handler, max_content_sections)
+            if cached_sections is not None:
+                return cached_sections
+        if extraction_cache is not None:
+            cached_sections = extraction_cache.get(file_path, stat, handler, max_content_sections)
+            if cached_sections is not None:
+                logger.debug(f"Using cached extraction for {file_path}")
+                if section_cache is not None:
+                    section_cache.put(file_path, stat, handler, max_content_sections, cached_sections)
+                return cached_sections
+        
+        # 이전에 같은 상태로 추출에 실패한 파일은 다시 파싱하지 않음
+        if failure_cache is not None:
+            known_error = failure_cache.get(file_path, stat, handler)
+            if known_error is not None:
+                logger.debug(f"Skipping known bad file {file_path}: {known_error}")
+                return [{"section_number": 0, "section_type": "error", "skipped": True, "text": known_error}]
+        
+        timeout = extraction_timeout(file_path)
+        try:
+            # 백그라운드 추출은 검색이 진행 중이면 기다리고 CPU 사용 비율과 읽기 속도 한도 안에서 실행
+            with extraction_scheduler.slot(priority, stat.st_size):
+                if extraction_process_pool is not None:
+                    # 파싱만 작업자 프로세스에서 실행하고 캐시와 색인은 서버 프로세스에서 갱신
+                    # (파일 읽기도 작업자가 하므로 미리 읽지 않으며, 읽는 시간도 작업자의 시간 제한과 취소를 따름)
+                    # 시간 제한을 넘거나 검색이 취소되면 작업자 프로세스를 종료하여 파싱을 중단
+                    if cancel_token is not None:
+                        cancel_token.raise_if_cancelled()
+                    future = extraction_process_pool.submit_with_timeout(
+                        timeout, extract_with_handler, str(file_path), max_content_sections, priority=priority
+                    )
+                    abort = lambda: extraction_process_pool.cancel(future)
+                    if cancel_token is not None:
+                        cancel_token.add_callback(abort)
+                    started = time.monotonic()
+                    try:
+                        content_sections = future.result()
+                        # 읽기와 파싱이 모두 작업자에서 실행되므로 작업자 호출 전체를 읽기 시간으로 보고
+                        if on_read is not None:
+                            on_read(time.monotonic() - started)
+                    except CancelledError:
+                        raise ExtractionCancelledError("검색이 취소되어 추출을 중단했습니다.")
+                    finally:
+                        if cancel_token is not None:
+                            cancel_token.remove_callback(abort)
+                else:
+                    # 파일 읽기(I/O)는 디렉토리별 한도 안에서 먼저 끝내고, 파싱(CPU)은 캐시된 내용으로 따로 제한하여 실행
+                    # (미리 읽는 양은 PREFETCH_MAX_MB로 제한하고, 읽는 시간도 파일의 시간 제한에 포함)
+                    started = time.monotonic()
+                    if PREFETCH_MAX_MB > 0:
+                        try:
+                            prefetch_file(file_path, int(PREFETCH_MAX_MB * 1024 * 1024),
+                                          deadline=None if timeout is None else started + timeout, cancel_token=cancel_token)
+                        except ExtractionTimeoutError:
+                            # 시간 제한까지 다 읽지 못한 것도 느린 읽기이므로 보고
+                            if on_read is not None:
+                                on_read(time.monotonic() - started)
+                            raise
+                        if on_read is not None:
+                            on_read(time.monotonic() - started)
+                    parse_timeout = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+                    # 파서 스레드는 중단할 수 없으므로 시간 제한을 넘거나 검색이 취소되면 결과를 기다리지 않음
+                    content_sections = parser_threads.run(parse_timeout, handler.extract_text, file_path, max_content_sections,
+                                                          cancel_token=cancel_token, priority=priority)
+        except ExtractionCancelledError:
+            # 취소는 파일의 문제가 아니므로 실패로 기록하지 않음
+            logger.debug(f"Extraction of {file_path} was cancelled")
+            raise
+        except ExtractionTimeoutError:
+            error_msg = f"추출 시간 제한({timeout:g}초)을 넘어 건너뛰었습니다."
+            logger.warning(f"Extraction of {file_path} timed out after {timeout:g} seconds")
+            if failure_cache is not None:
+                failure_cache.record(file_path, stat, handler, error_msg)
+            return [{"section_number": 0, "section_type": "error", "skipped": True, "text": error_msg}]
+        except ExtractionResourceError as e:
+            # 작업자의 메모리 또는 CPU 시간 제한에 걸린 파일 (작업자는 새로 시작되었으므로 이 파일만 건너뜀)
+            error_msg = str(e)
+            logger.warning(f"Extraction of {file_path} exceeded a worker resource limit: {e}")
+            if failure_cache is not None:
+                failure_cache.record(file_path, stat, handler, error_msg)
+            return [{"section_number": 0, "section_type": "error", "skipped": True, "text": error_msg}]
+        except Exception as e:
+            if failure_cache is not None:
+                failure_cache.record(file_path, stat, handler, f"파일 처리 중 오류 발생: {str(e)}")
+            raise
+        
+        errors = [s.get("text", "") for s in content_sections if s.get("section_type") == "error"]
+        if errors:
+            # 추출에 실패한 결과는 캐시하지 않고 파일이 변경될 때까지 실패로 기록
+            if failure_cache is not None:
+                failure_cache.record(file_path, stat, handler, "\n".join(errors))
+        else:
+            if failure_cache is not None:
+                failure_cache.forget(file_path)
+            if section_cache is not None:
+                section_cache.put(file_path, stat, handler, max_content_sections, content_sections)
+            if extraction_cache is not None:
+                extraction_cache.put(file_path, stat, handler, max_content_sections, content_sections)
         
         logger.debug(f"Extracted {len(content_sections)} sections from {file_path} in {time.time() - start_time:.2f} seconds")
         return content_sections
+    except ExtractionCancelledError:
+        raise
     except Exception as e:
         logger.error(f"Error extracting text from {file_path}: {e}")
         logger.error(traceback.format_exc())
-        return [{"section_number": 0, "text": f"파일 처리 중 오류 발생: {str(e)}"}]
+        return [{"section_number": 0, "section_type": "error", "text": f"파일 처리 중 오류 발생: {str(e)}"}]
+
+def extract_and_index(file_path: Path, file_type_desc: str, handler_version: int,
+                      cancel_token: Optional[CancellationToken] = None) -> Tuple[List[Dict[str, Any]], Optional[float]]:
+    """
+    파일을 추출하고 다음 검색을 위해 색인에 추가합니다. 추출 실행기의 작업 스레드에서 실행됩니다.
+    
+    Args:
+        file_path: 파일 경로
+        file_type_desc: 파일 형식 설명
+        handler_version: 파일 핸들러의 버전
+        cancel_token: 검색이 취소되면 추출을 중단할 토큰
+        
+    Returns:
+        (섹션별 텍스트 정보 리스트, 파일을 읽는 데 걸린 시간(초)이며 캐시를 사용하여 읽지 않았으면 None)
+    """
+    read_latencies: List[float] = []
+    content_sections = extract_text_from_file(file_path, cancel_token=cancel_token, on_read=read_latencies.append)
+    if file_index is not None and not any(s.get("section_type") == "error" for s in content_sections):
+        file_index.add_document(file_path, file_type_desc, content_sections, handler_version=handler_version)
+    return content_sections, (read_latencies[0] if read_latencies else None)
+
+def extract_in_background(file_path: Path) -> List[Dict[str, Any]]:
+    """
+    백그라운드 작업(캐시 예열, 색인 갱신, 색인 감시기의 재색인)에서 파일을 추출합니다.
+    캐시에 없는 파일은 검색이 진행 중이 아닐 때 스케줄러의 CPU 사용 비율과 읽기 속도 한도 안에서 추출합니다.
+    
+    Args:
+        file_path: 파일 경로
+        
+    Returns:
+        섹션별 텍스트 정보 리스트
+    """
+    return extract_text_from_file(file_path, priority=BACKGROUND)
+
+class SearchProgress:
+    """여러 디렉토리를 동시에 검색할 때 전체 진행 상황을 하나로 모아 보고하는 객체"""
+    
+    def __init__(self):
+        self.total_files = 0
+        self.processed_files = 0
+        self.walking = 0
+    
+    def start_walk(self) -> None:
+        """디렉토리 탐색을 시작합니다. 모든 탐색이 끝나기 전에는 전체 파일 수를 보고하지 않습니다."""
+        self.walking += 1
+    
+    def finish_walk(self) -> None:
+        """디렉토리 탐색이 끝났음을 기록합니다."""
+        self.walking -= 1
+    
+    def add_files(self, count: int) -> None:
+        """탐색에서 찾은 파일 수를 늘립니다."""
+        self.total_files += count
+    
+    async def advance(self, ctx: Optional[Context]) -> None:
+        """파일 하나를 처리했음을 기록하고 MCP 클라이언트에 진행 상황을 보고합니다."""
+        self.processed_files += 1
+        if ctx:
+            await ctx.report_progress(self.processed_files, self.total_files if self.walking == 0 else None)
 
-async def search_files(directory: Path, keywords: str, file_type: Optional[str] = None, ctx: Optional[Context] = None) -> List[SearchResult]:
+async def search_files(directory: Path, keywords: str, file_type: Optional[str] = None, ctx: Optional[Context] = None,
+                       match_mode: str = "word", semaphore: Optional[asyncio.Semaphore] = None,
+                       progress: Optional[SearchProgress] = None,
+                       skipped_files: Optional[List[Dict[str, str]]] = None) -> List[SearchResult]:
     """
     디렉토리에서 파일을 검색하고 키워드와 일치하는 파일을 찾습니다.
+    디렉토리 탐색, 내용 추출, 키워드 매칭은 크기가 제한된 대기열로 연결된 단계로 동시에 진행되므로,
+    탐색이 끝나기 전에 첫 결과가 나오고 디렉토리 크기와 관계없이 메모리 사용량이 일정합니다.
+    검색이 취소되면 남은 파일은 처리하지 않고 실행 중인 추출을 중단하거나 결과를 기다리지 않습니다.
     
     Args:
         directory: 검색할 디렉토리
         keywords: 검색 키워드
         file_type: 검색할 파일 형식 (None이면 모든 지원 형식)
         ctx: MCP 컨텍스트
+        match_mode: 매칭 방식 ("word": 단어 단위, "substring": 부분 문자열)
+        semaphore: 여러 디렉토리의 검색이 함께 사용할 동시 처리 한도 (None이면 이 검색만의 한도 사용),
+            디렉토리별 한도는 root_limiter()가 따로 조절
+        progress: 여러 디렉토리의 검색이 함께 사용할 진행 상황 (None이면 이 디렉토리의 진행 상황만 보고)
+        skipped_files: 시간 제한을 넘었거나 이전에 추출에 실패하여 건너뛴 파일을 {"path", "reason"}으로 추가할 목록
         
     Returns:
         검색 결과 목록
@@ -203,113 +580,444 @@ async def search_files(directory: Path, keywords: str, file_type: Optional[str]
         ctx.info(f"'{keywords}' 검색 시작... 디렉토리: {directory}" + (f", 파일 형식: {file_type}" if file_type else ""))
     
     results = []
-    keyword_pattern = re.compile(r'\b' + re.escape(keywords) + r'\b', re.IGNORECASE)
+    if match_mode == "substring":
+        keyword_pattern = re.compile(re.escape(keywords), re.IGNORECASE)
+    else:
+        keyword_pattern = re.compile(r'\b' + re.escape(keywords) + r'\b', re.IGNORECASE)
     
-    # 검색 가능한 총 파일 수 계산
-    files = list(find_files(directory, file_type))
-    total_files = len(files)
+    loop = asyncio.get_running_loop()
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(extract_concurrency)  # 동시에 최대 extract_concurrency개 파일 처리
+    if progress is None:
+        progress = SearchProgress()
+    # 디렉토리의 저장 장치에 맞춰 조절되는 추출 동시 처리 한도 (검색 사이에 유지)
+    limiter = root_limiter(directory)
     
-    if total_files == 0:
-        if ctx:
-            ctx.info(f"디렉토리에서 검색할 파일을 찾을 수 없습니다: {directory}")
-        return []
+    # 색인에서 키워드 후보 섹션 조회 (None이면 색인으로 답할 수 없는 키워드)
+    # (디렉토리를 담당하는 색인 샤드만 확인, 색인 저장이나 병합이 잠금을 잡고 있을 수 있으므로 작업 스레드에서 조회)
+    index_candidates = None
+    if file_index is not None:
+        index_candidates = await loop.run_in_executor(
+            extraction_executor, lambda: file_index.search(keywords, match_mode, directory=directory)
+        )
+    
+    # 단계 사이의 대기열 (가득 차면 앞 단계가 기다림)
+    path_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    section_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    extract_workers = extract_concurrency
+    # 검색이 취소되면 실행 중인 추출을 중단하기 위한 토큰
+    cancel_token = CancellationToken()
     
     # 진행 상황 추적용 변수
+    total_files = 0
     processed_files = 0
-    semaphore = asyncio.Semaphore(10)  # 동시에 최대 10개 파일 처리
+    indexed_files = 0
+    walk_done = False
     
-    async def process_file(file_path):
-        nonlocal processed_files  # 이 선언이 함수 시작 부분에 있어야 합니다
-        
-        async with semaphore:
+    async def walk_stage():
+        """검색할 파일을 찾아 추출 단계로 보냅니다."""
+        nonlocal total_files, walk_done
+        progress.start_walk()
+        try:
+            if index_watcher is not None and index_watcher.is_live(directory):
+                # 감시 중인 디렉토리는 탐색하지 않고 색인에 있는 후보 파일만 확인 (색인 조회도 작업 스레드에서 실행)
+                def indexed_batches():
+                    if index_candidates is not None:
+                        indexed_paths = list(index_candidates)
+                    else:
+                        indexed_paths = file_index.paths_under(directory)
+                    yield [Path(path_key) for path_key in indexed_paths
+                           if handler_registry.can_handle_file(Path(path_key), file_type)]
+                batches = indexed_batches()
+                next_batch = lambda: next(batches, [])
+            else:
+                # 느린 네트워크 드라이브가 이벤트 루프를 막지 않도록 작업 스레드에서 조금씩 탐색
+                walker = find_files(directory, file_type)
+                next_batch = lambda: list(itertools.islice(walker, WALK_BATCH_SIZE))
+            
+            while True:
+                batch = await loop.run_in_executor(extraction_executor, next_batch)
+                if not batch:
+                    break
+                total_files += len(batch)
+                progress.add_files(len(batch))
+                for file_path in batch:
+                    await path_queue.put(file_path)
+        finally:
+            walk_done = True
+            progress.finish_walk()
+        # 취소되었을 때는 다른 단계도 함께 취소되므로 종료 표시를 보내지 않음
+        for _ in range(extract_workers):
+            await path_queue.put(None)
+    
+    def read_index(file_path: Path, handler_version: int) -> Tuple[bool, Optional[List[Dict[str, Any]]]]:
+        """색인이 최신이면 (True, 후보 섹션)을, 아니면 (False, None)을 반환합니다. (stat과 색인 잠금 때문에 작업 스레드에서 실행)"""
+        if not file_index.is_current(file_path, handler_version=handler_version):
+            return False, None
+        if index_candidates is None:
+            return True, file_index.get_sections(file_path)
+        return True, index_candidates.get(str(file_path), [])
+    
+    async def extract_stage():
+        """파일의 섹션을 색인에서 읽거나 추출하여 매칭 단계로 보냅니다."""
+        nonlocal indexed_files
+        while True:
+            file_path = await path_queue.get()
+            if file_path is None:
+                break
+            
+            file_type_desc = "Unknown"
+            content_sections = None
             try:
-                # 진행 상황 로깅
-                content_sections = extract_text_from_file(file_path)
                 handler = handler_registry.get_handler_for_file(file_path)
                 file_type_desc = handler.get_type_description() if handler else "Unknown"
                 
-                content_matches = []
-                for section in content_sections:
-                    # 키워드 매칭을 위한 섹션 텍스트 준비
-                    section_text = section.get("text", "")
-                    if not section_text:
-                        continue
-                        
-                    matches = re.findall(keyword_pattern, section_text)
-                    if matches:
-                        preview = section_text[:200] + "..." if len(section_text) > 200 else section_text
-                        content_matches.append({
-                            "section_number": section.get("section_number", 0),
-                            "match_count": len(matches),
-                            "preview": preview
-                        })
-                
-                if content_matches:
-                    match_count = sum(match["match_count"] for match in content_matches)
-                    result = SearchResult(
-                        filename=file_path.name,
-                        file_type=file_type_desc,
-                        path=str(file_path),
-                        content_matches=content_matches,
-                        match_count=match_count
+                handler_version = handler.get_version() if handler else 1
+                is_indexed = False
+                if file_index is not None:
+                    is_indexed, content_sections = await loop.run_in_executor(
+                        extraction_executor, read_index, file_path, handler_version
                     )
-                    results.append(result)
-                    
-                    # 로그 및 사용자에게 진행 상황 알림
-                    if ctx:
-                        ctx.info(f"매칭된 파일 발견: {file_path.name} (매칭 수: {match_count})")
-                
-                # 진행 상황 업데이트
-                processed_files += 1
-                progress_pct = round((processed_files / total_files) * 100)
-                
-                if ctx:
-                    await ctx.report_progress(processed_files, total_files)
-                    if processed_files % 5 == 0 or processed_files == total_files:
-                        ctx.info(f"진행 중: {processed_files}/{total_files} 파일 처리 ({progress_pct}%)")
-                
-                # 검색 결과가 일정 수 이상 발견되면 중간 결과 보고
-                if len(results) % 10 == 0 and len(results) > 0 and ctx:
-                    # 임시 결과를 매칭 수로 정렬
-                    sorted_results = sorted(results, key=lambda x: x.match_count, reverse=True)
-                    top_results = sorted_results[:3]  # 상위 3개 결과만
-                    
-                    if top_results:
-                        result_summary = "\n".join([
-                            f"- {r.filename} ({r.match_count}개 매칭)" for r in top_results
-                        ])
-                        ctx.info(f"현재까지 발견된 상위 결과:\n{result_summary}")
-            
+                if is_indexed:
+                    # 색인이 최신이면 파일을 다시 읽지 않고 후보 섹션만 확인
+                    indexed_files += 1
+                else:
+                    # 색인되지 않은 파일은 이벤트 루프를 막지 않도록 추출 실행기에서 추출하고 색인에 추가
+                    # (디렉토리별 적응형 한도 안에서 모든 디렉토리가 함께 쓰는 한도를 나누어 사용)
+                    # 한도는 파일을 실제로 읽은 시간으로만 조절하며, 캐시나 실패 기록을 사용한 파일은 표본에서 제외
+                    await limiter.acquire()
+                    latency = None
+                    try:
+                        async with semaphore:
+                            content_sections, latency = await loop.run_in_executor(
+                                extraction_executor, extract_and_index, file_path, file_type_desc, handler_version, cancel_token
+                            )
+                    finally:
+                        limiter.release(latency)
+            except ExtractionCancelledError:
+                break
             except Exception as e:
                 logger.error(f"Error processing {file_path}: {e}")
                 logger.error(traceback.format_exc())
                 if ctx:
                     ctx.warning(f"파일 처리 중 오류 발생: {file_path} - {str(e)}")
+            
+            await section_queue.put((file_path, file_type_desc, content_sections))
+        await section_queue.put(None)
+    
+    async def match_stage():
+        """섹션에서 키워드를 찾아 결과를 모읍니다."""
+        nonlocal processed_files
+        finished_workers = 0
+        while finished_workers < extract_workers:
+            item = await section_queue.get()
+            if item is None:
+                finished_workers += 1
+                continue
+            
+            file_path, file_type_desc, content_sections = item
+            content_matches = []
+            skipped_section = next((section for section in content_sections or [] if section.get("skipped")), None)
+            if skipped_section is not None:
+                # 건너뛴 파일의 오류 메시지는 매칭하지 않고 응답에 따로 표시
+                content_sections = []
+                if skipped_files is not None:
+                    skipped_files.append({"path": str(file_path), "reason": skipped_section.get("text", "")})
+                if ctx:
+                    ctx.warning(f"파일을 건너뛰었습니다: {file_path} - {skipped_section.get('text', '')}")
+            for section in content_sections or []:
+                # 키워드 매칭을 위한 섹션 텍스트 준비
+                section_text = section.get("text", "")
+                if not section_text:
+                    continue
+                    
+                matches = re.findall(keyword_pattern, section_text)
+                if matches:
+                    preview = section_text[:200] + "..." if len(section_text) > 200 else section_text
+                    match_info = {
+                        "section_number": section.get("section_number", 0),
+                        "match_count": len(matches),
+                        "preview": preview
+                    }
+                    # 색인 저장소가 매칭 위치 주변 발췌문을 제공하면 함께 반환
+                    if section.get("snippet"):
+                        match_info["snippet"] = section["snippet"]
+                    content_matches.append(match_info)
+            
+            if content_matches:
+                match_count = sum(match["match_count"] for match in content_matches)
+                result = SearchResult(
+                    filename=file_path.name,
+                    file_type=file_type_desc,
+                    path=str(file_path),
+                    content_matches=content_matches,
+                    match_count=match_count
+                )
+                results.append(result)
                 
-                # 진행 상황 업데이트
-                processed_files += 1
+                # 로그 및 사용자에게 진행 상황 알림
+                if ctx:
+                    ctx.info(f"매칭된 파일 발견: {file_path.name} (매칭 수: {match_count})")
+            
+            # 진행 상황 업데이트
+            processed_files += 1
+            await progress.advance(ctx)
+            if ctx and (processed_files % 5 == 0 or (walk_done and processed_files == total_files)):
+                if walk_done:
+                    progress_pct = round((processed_files / total_files) * 100)
+                    ctx.info(f"진행 중: {processed_files}/{total_files} 파일 처리 ({progress_pct}%)")
+                else:
+                    ctx.info(f"진행 중: {processed_files}개 파일 처리 (탐색 중, 지금까지 {total_files}개 파일 발견)")
+            
+            # 검색 결과가 일정 수 이상 발견되면 중간 결과 보고
+            if content_matches and len(results) % 10 == 0 and ctx:
+                # 임시 결과를 매칭 수로 정렬
+                sorted_results = sorted(results, key=lambda x: x.match_count, reverse=True)
+                top_results = sorted_results[:3]  # 상위 3개 결과만
+                
+                if top_results:
+                    result_summary = "\n".join([
+                        f"- {r.filename} ({r.match_count}개 매칭)" for r in top_results
+                    ])
+                    ctx.info(f"현재까지 발견된 상위 결과:\n{result_summary}")
     
-    # 병렬 처리를 위한 태스크 생성 및 실행
-    tasks = []
-    for file_path in files:
-        tasks.append(asyncio.create_task(process_file(file_path)))
+    # 탐색, 추출, 매칭 단계를 동시에 실행
+    stages = [asyncio.create_task(stage) for stage in [walk_stage(), match_stage(), *[extract_stage() for _ in range(extract_workers)]]]
+    try:
+        await asyncio.gather(*stages)
+    except BaseException as e:
+        # 클라이언트가 검색을 취소했거나 한 단계가 실패하면 남은 단계와 실행 중인 추출을 중단하여
+        # 추출 실행기와 동시 처리 한도를 다음 검색에 바로 돌려줌
+        cancel_token.cancel()
+        for stage in stages:
+            stage.cancel()
+        if isinstance(e, asyncio.CancelledError):
+            logger.info(f"Search for '{keywords}' in {directory} was cancelled after {processed_files} files")
+        raise
+    
+    if total_files == 0:
+        if ctx:
+            ctx.info(f"디렉토리에서 검색할 파일을 찾을 수 없습니다: {directory}")
+        return []
     
-    # 모든 태스크 완료 대기
-    await asyncio.gather(*tasks)
+    # 검색 중 새로 추출한 파일을 색인에 저장 (세그먼트 쓰기와 fsync가 이벤트 루프를 막지 않도록 작업 스레드에서 실행)
+    if file_index is not None:
+        try:
+            await loop.run_in_executor(extraction_executor, file_index.save)
+        except Exception as e:
+            logger.error(f"Error saving index: {e}")
     
     # 매칭 수를 기준으로 결과 정렬
     results.sort(key=lambda x: x.match_count, reverse=True)
     
-    logger.info(f"Found {len(results)} matching files out of {total_files} total files")
+    logger.info(f"Found {len(results)} matching files out of {total_files} total files ({indexed_files} answered from index)")
+    logger.debug(f"Extraction concurrency for {directory}: {limiter.stats()}")
     if ctx:
         ctx.info(f"검색 완료: 총 {total_files}개 파일 중 {len(results)}개 파일에서 매칭됨")
     
     return results
 
+class SearchBroadcast:
+    """진행 중인 검색 하나의 진행 상황과 메시지를 그 검색을 기다리는 모든 MCP 클라이언트에 전달하는 객체"""
+    
+    def __init__(self):
+        self.subscribers: List[Context] = []
+        self.last_progress: Optional[Tuple[int, Optional[int]]] = None
+    
+    def subscribe(self, ctx: Context) -> None:
+        """클라이언트를 추가합니다."""
+        self.subscribers.append(ctx)
+    
+    def unsubscribe(self, ctx: Context) -> None:
+        """클라이언트를 제거합니다. (요청이 취소되었을 때)"""
+        if ctx in self.subscribers:
+            self.subscribers.remove(ctx)
+    
+    def _send(self, method: str, message: str) -> None:
+        for ctx in list(self.subscribers):
+            try:
+                getattr(ctx, method)(message)
+            except Exception as e:
+                # 연결이 끊긴 클라이언트 때문에 다른 클라이언트의 검색이 실패하지 않도록 함
+                logger.debug(f"Failed to send search message to a client: {e}")
+    
+    def info(self, message: str) -> None:
+        self._send("info", message)
+    
+    def warning(self, message: str) -> None:
+        self._send("warning", message)
+    
+    def error(self, message: str) -> None:
+        self._send("error", message)
+    
+    async def report_progress(self, progress: int, total: Optional[int] = None) -> None:
+        self.last_progress = (progress, total)
+        for ctx in list(self.subscribers):
+            try:
+                await ctx.report_progress(progress, total)
+            except Exception as e:
+                logger.debug(f"Failed to report search progress to a client: {e}")
+
+class SearchFlight:
+    """
+    실행 중인 검색 하나와 그 결과를 기다리는 요청들. 여러 대화에서 같은 검색을 거의 동시에 요청하면
+    나중 요청은 새로 검색하지 않고 실행 중인 검색에 합류하여 같은 결과와 진행 상황을 받습니다.
+    """
+    
+    def __init__(self, key: Tuple[str, ...]):
+        self.key = key
+        self.broadcast = SearchBroadcast()
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+        self.cancelled = False
+    
+    async def join(self, ctx: Context) -> Dict[str, Any]:
+        """
+        검색 결과를 기다립니다. 기다리던 요청이 모두 취소되었을 때만 검색을 취소합니다.
+        
+        Args:
+            ctx: 요청한 클라이언트의 MCP 컨텍스트
+            
+        Returns:
+            run_search()의 결과
+        """
+        self.waiters += 1
+        self.broadcast.subscribe(ctx)
+        if self.broadcast.last_progress is not None:
+            # 늦게 합류한 클라이언트에 지금까지의 진행 상황을 알림
+            try:
+                await ctx.report_progress(*self.broadcast.last_progress)
+            except Exception as e:
+                logger.debug(f"Failed to report search progress to a client: {e}")
+        try:
+            return await asyncio.shield(self.task)
+        except asyncio.CancelledError:
+            self.broadcast.unsubscribe(ctx)
+            if self.waiters == 1 and not self.task.done():
+                logger.info(f"All requests for search {self.key} were cancelled")
+                self.cancelled = True
+                self.task.cancel()
+            raise
+        finally:
+            self.waiters -= 1
+
+# 실행 중인 검색 (검색 키 → SearchFlight)
+search_flights: Dict[Tuple[str, ...], SearchFlight] = {}
+
+def search_key(query: SearchQuery) -> Tuple[str, ...]:
+    """
+    같은 결과를 내는 검색 요청을 구분하는 키를 만듭니다.
+    
+    Args:
+        query: 검색 쿼리
+        
+    Returns:
+        (키워드, 디렉토리, 파일 형식, 매칭 방식) 튜플, 디렉토리를 지정하지 않으면 모든 검색 디렉토리
+    """
+    directory = str(Path(query.directory)) if query.directory else "\n".join(str(dir_path) for dir_path in SEARCH_DIRS)
+    return (query.keywords, directory, query.file_type or "", query.match_mode)
+
+async def run_search(query: SearchQuery, ctx: SearchBroadcast) -> Dict[str, Any]:
+    """
+    검색 디렉토리를 모두 검색합니다. search_files_tool()이 같은 검색을 기다리는 요청들과 함께 한 번만 실행합니다.
+    
+    Args:
+        query: 검색 쿼리
+        ctx: 검색을 기다리는 모든 클라이언트에 메시지를 전달할 객체
+        
+    Returns:
+        응답에 담을 검색 결과 (유효한 디렉토리가 없으면 "error" 키만 포함)
+    """
+    start_time = time.time()
+    
+    # 디렉토리 경로 검증
+    if query.directory:
+        search_dirs = [Path(query.directory)]
+    else:
+        search_dirs = SEARCH_DIRS
+        
+    # 존재하는 디렉토리만 필터링
+    valid_dirs = []
+    for dir_path in search_dirs:
+        if not dir_path.exists() or not dir_path.is_dir():
+            ctx.warning(f"검색 디렉토리가 존재하지 않습니다: {dir_path}")
+            logger.warning(f"Directory not found: {dir_path}")
+        else:
+            valid_dirs.append(dir_path)
+            
+    if not valid_dirs:
+        error_msg = "유효한 검색 디렉토리가 없습니다."
+        ctx.error(error_msg)
+        logger.error(error_msg)
+        return {"error": error_msg}
+    
+    # 검색하기 전에 검색 범위 정보 제공
+    ctx.info(f"총 {len(valid_dirs)}개 디렉토리에서 검색합니다.")
+    if len(valid_dirs) > 1:
+        dir_list = "\n".join([f"- {d}" for d in valid_dirs])
+        ctx.info(f"검색할 디렉토리:\n{dir_list}")
+    
+    # 모든 유효한 디렉토리를 동시에 검색 (동시 처리 한도와 진행 상황은 모든 디렉토리가 함께 사용)
+    semaphore = asyncio.Semaphore(extract_concurrency)
+    progress = SearchProgress()
+    skipped_files: List[Dict[str, str]] = []
+    
+    async def search_directory(dir_path: Path) -> Tuple[Path, List[SearchResult]]:
+        return dir_path, await search_files(dir_path, query.keywords, query.file_type, ctx, query.match_mode,
+                                            semaphore=semaphore, progress=progress, skipped_files=skipped_files)
+    
+    all_results = []
+    tasks = [asyncio.create_task(search_directory(dir_path)) for dir_path in valid_dirs]
+    try:
+        for completed, task in enumerate(asyncio.as_completed(tasks), start=1):
+            dir_path, dir_results = await task
+            all_results.extend(dir_results)
+            
+            # 디렉토리별 중간 결과 보고 (검색이 끝난 순서대로)
+            if dir_results:
+                ctx.info(f"[{completed}/{len(valid_dirs)}] '{dir_path}' 디렉토리에서 {len(dir_results)}개 파일 발견")
+            else:
+                ctx.info(f"[{completed}/{len(valid_dirs)}] '{dir_path}' 디렉토리에서 매칭 결과 없음")
+    except BaseException:
+        # 검색이 취소되면 아직 검색 중인 디렉토리도 모두 취소
+        for task in tasks:
+            task.cancel()
+        raise
+        
+    # 매칭 수를 기준으로 전체 결과 재정렬
+    all_results.sort(key=lambda x: x.match_count, reverse=True)
+    
+    # 사용자에게 검색 진행 상황 보고
+    elapsed_time = time.time() - start_time
+    
+    if all_results:
+        # 상위 10개 파일만 상세 결과로 표시
+        top_results = all_results[:10]
+        result_summary = "\n".join([
+            f"- {r.filename} (매칭 수: {r.match_count})" for r in top_results
+        ])
+        
+        ctx.info(f"검색 완료! 총 {len(all_results)}개 파일을 찾았습니다. 소요 시간: {elapsed_time:.2f}초")
+        if len(all_results) > 10:
+            ctx.info(f"상위 10개 검색 결과:\n{result_summary}\n... 그 외 {len(all_results) - 10}개 파일")
+        else:
+            ctx.info(f"검색 결과:\n{result_summary}")
+    else:
+        ctx.info(f"'{query.keywords}'에 대한 검색 결과가 없습니다. 소요 시간: {elapsed_time:.2f}초")
+    
+    logger.info(f"Search completed in {elapsed_time:.2f} seconds")
+    
+    return {
+        "directories": [str(dir_path) for dir_path in valid_dirs],
+        "results": [result.model_dump() for result in all_results],
+        "skipped_files": skipped_files
+    }
+
 @mcp.tool()
 async def search_files_tool(query: SearchQuery, ctx: Context) -> str:
     """
     다양한 파일 형식에서 키워드를 검색합니다.
+    같은 검색(키워드, 디렉토리, 파일 형식, 매칭 방식)이 이미 실행 중이면 새로 검색하지 않고 그 결과를 함께 받습니다.
     
     Args:
         query: 검색 쿼리 (키워드와 선택적 디렉토리, 파일 형식)
@@ -320,84 +1028,182 @@ async def search_files_tool(query: SearchQuery, ctx: Context) -> str:
     """
     start_time = time.time()
     ctx.info(f"검색 시작: '{query.keywords}'")
-    logger.info(f"Search request: keywords='{query.keywords}', directory={query.directory}, file_type={query.file_type}")
+    logger.info(f"Search request: keywords='{query.keywords}', directory={query.directory}, file_type={query.file_type}, match_mode={query.match_mode}")
     
     try:
-        # 디렉토리 경로 검증
-        if query.directory:
-            search_dirs = [Path(query.directory)]
+        key = search_key(query)
+        flight = search_flights.get(key) if SEARCH_COALESCE else None
+        # 모든 요청이 취소되어 중단 중인 검색에는 합류하지 않음
+        coalesced = flight is not None and not flight.cancelled
+        if coalesced:
+            ctx.info("같은 검색이 이미 진행 중이어서 그 결과를 함께 받습니다.")
+            logger.info(f"Joining in-flight search for '{query.keywords}' ({flight.waiters} waiting)")
         else:
-            search_dirs = SEARCH_DIRS
-            
-        # 존재하는 디렉토리만 필터링
-        valid_dirs = []
-        for dir_path in search_dirs:
-            if not dir_path.exists() or not dir_path.is_dir():
-                ctx.warning(f"검색 디렉토리가 존재하지 않습니다: {dir_path}")
-                logger.warning(f"Directory not found: {dir_path}")
-            else:
-                valid_dirs.append(dir_path)
-                
-        if not valid_dirs:
-            error_msg = "유효한 검색 디렉토리가 없습니다."
+            flight = SearchFlight(key)
+            flight.task = asyncio.create_task(run_search(query, flight.broadcast))
+            if SEARCH_COALESCE:
+                search_flights[key] = flight
+                # 검색이 끝나면 다음 요청은 새로 검색 (결과는 색인과 캐시가 재사용)
+                flight.task.add_done_callback(lambda _: search_flights.pop(key, None) if search_flights.get(key) is flight else None)
+        
+        # 검색이 끝날 때까지 백그라운드 추출(예열, 색인 갱신, 재색인)을 멈춤
+        with extraction_scheduler.interactive():
+            response = await flight.join(ctx)
+        if "error" in response:
+            return json.dumps(response, ensure_ascii=False)
+        
+        elapsed_time = time.time() - start_time
+        return json.dumps({
+            "query": query.keywords,
+            "directories": response["directories"],
+            "file_type": query.file_type,
+            "match_mode": query.match_mode,
+            "result_count": len(response["results"]),
+            "elapsed_time_seconds": round(elapsed_time, 2),
+            "results": response["results"],
+            "skipped_count": len(response["skipped_files"]),
+            "skipped_files": response["skipped_files"],
+            "coalesced": coalesced
+        }, ensure_ascii=False, indent=2)
+    except Exception as e:
+        error_msg = f"검색 중 오류 발생: {str(e)}"
+        logger.exception(error_msg)
+        ctx.error(error_msg)
+        return json.dumps({
+            "error": error_msg,
+            "traceback": traceback.format_exc()
+        }, ensure_ascii=False)
+
+@mcp.tool()
+async def refresh_index(query: IndexRefreshQuery, ctx: Context = None) -> str:
+    """
+    검색 색인을 증분 갱신합니다. 추가되거나 변경된 파일만 다시 추출하고 삭제된 파일은 색인에서 제외합니다.
+    
+    Args:
+        query: 색인 갱신 쿼리 (선택적 디렉토리)
+        ctx: MCP 컨텍스트
+        
+    Returns:
+        디렉토리별 갱신 통계를 JSON 형식으로 반환
+    """
+    start_time = time.time()
+    logger.info(f"Index refresh request: directory={query.directory}")
+    
+    if file_index is None:
+        error_msg = "검색 색인이 비활성화되어 있습니다. (FILE_INDEX_ENABLED)"
+        if ctx:
             ctx.error(error_msg)
-            logger.error(error_msg)
-            return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return json.dumps({"error": error_msg}, ensure_ascii=False)
+    
+    try:
+        directories = [Path(query.directory)] if query.directory else SEARCH_DIRS
+        # 색인 갱신은 백그라운드 작업이므로 검색 중에는 추출을 멈추고 이벤트 루프를 막지 않도록 백그라운드 실행기에서 실행
+        indexer = IncrementalIndexer(file_index, handler_registry, extract_in_background,
+                                     dedup_max_bytes=int(DEDUP_MAX_MB * 1024 * 1024))
+        loop = asyncio.get_running_loop()
         
-        # 검색하기 전에 검색 범위 정보 제공
-        ctx.info(f"총 {len(valid_dirs)}개 디렉토리에서 검색합니다.")
-        if len(valid_dirs) > 1:
-            dir_list = "\n".join([f"- {d}" for d in valid_dirs])
-            ctx.info(f"검색할 디렉토리:\n{dir_list}")
-        
-        # 모든 유효한 디렉토리에서 검색
-        all_results = []
-        for i, dir_path in enumerate(valid_dirs):
-            ctx.info(f"[{i+1}/{len(valid_dirs)}] 디렉토리 검색 중: {dir_path}")
-            dir_results = await search_files(dir_path, query.keywords, query.file_type, ctx)
-            all_results.extend(dir_results)
+        refresh_stats = {}
+        for dir_path in directories:
+            if not dir_path.exists() or not dir_path.is_dir():
+                if ctx:
+                    ctx.warning(f"디렉토리가 존재하지 않습니다: {dir_path}")
+                logger.warning(f"Directory not found: {dir_path}")
+                continue
             
-            # 디렉토리별 중간 결과 보고
-            if dir_results:
-                ctx.info(f"'{dir_path}' 디렉토리에서 {len(dir_results)}개 파일 발견")
-            else:
-                ctx.info(f"'{dir_path}' 디렉토리에서 매칭 결과 없음")
+            if query.rebuild and file_index.rebuild_shard(dir_path):
+                if ctx:
+                    ctx.info(f"색인 샤드를 다시 만듭니다: {dir_path}")
             
-        # 매칭 수를 기준으로 전체 결과 재정렬
-        all_results.sort(key=lambda x: x.match_count, reverse=True)
+            if ctx:
+                ctx.info(f"색인 갱신 중: {dir_path}")
+            try:
+                refresh_stats[str(dir_path)] = await loop.run_in_executor(
+                    background_executor, lambda: indexer.refresh(dir_path, find_files(dir_path, strict=True))
+                )
+            except OSError as e:
+                # 파일 목록을 끝까지 읽지 못한 디렉토리는 찾은 파일만 갱신하고 사라진 파일은 색인에 남겨 둠
+                if ctx:
+                    ctx.warning(f"디렉토리를 끝까지 읽지 못해 삭제된 파일을 정리하지 않았습니다: {dir_path} - {str(e)}")
+                refresh_stats[str(dir_path)] = {"error": f"디렉토리를 끝까지 읽지 못했습니다: {str(e)}"}
         
-        # 사용자에게 검색 진행 상황 보고
         elapsed_time = time.time() - start_time
+        if ctx:
+            ctx.info(f"색인 갱신 완료: {len(refresh_stats)}개 디렉토리, 소요 시간: {elapsed_time:.2f}초")
         
-        if all_results:
-            # 상위 10개 파일만 상세 결과로 표시
-            top_results = all_results[:10]
-            result_summary = "\n".join([
-                f"- {r.filename} (매칭 수: {r.match_count})" for r in top_results
-            ])
-            
-            ctx.info(f"검색 완료! 총 {len(all_results)}개 파일을 찾았습니다. 소요 시간: {elapsed_time:.2f}초")
-            if len(all_results) > 10:
-                ctx.info(f"상위 10개 검색 결과:\n{result_summary}\n... 그 외 {len(all_results) - 10}개 파일")
-            else:
-                ctx.info(f"검색 결과:\n{result_summary}")
-        else:
-            ctx.info(f"'{query.keywords}'에 대한 검색 결과가 없습니다. 소요 시간: {elapsed_time:.2f}초")
+        return json.dumps({
+            "directories": refresh_stats,
+            "indexed_files": len(file_index),
+            "shards": file_index.shard_info(),
+            "elapsed_time_seconds": round(elapsed_time, 2)
+        }, ensure_ascii=False, indent=2)
+    except Exception as e:
+        error_msg = f"색인 갱신 중 오류 발생: {str(e)}"
+        logger.exception(error_msg)
+        if ctx:
+            ctx.error(error_msg)
+        return json.dumps({
+            "error": error_msg,
+            "traceback": traceback.format_exc()
+        }, ensure_ascii=False)
+
+@mcp.tool()
+async def warm_cache(query: CacheWarmupQuery, ctx: Context = None) -> str:
+    """
+    검색 디렉토리의 파일을 미리 추출하여 추출 결과 캐시를 채웁니다.
+    최근에 수정된 파일을 먼저, 나머지는 설정된 디렉토리 순서대로 처리하며 검색 요청을 방해하지 않도록 쉬면서 진행합니다.
+    
+    Args:
+        query: 캐시 예열 쿼리 (선택적 디렉토리, 최대 파일 수)
+        ctx: MCP 컨텍스트
+        
+    Returns:
+        예열 통계를 JSON 형식으로 반환
+    """
+    logger.info(f"Cache warm-up request: directory={query.directory}, limit={query.limit}")
+    
+    if extraction_cache is None and section_cache is None:
+        error_msg = "추출 결과 캐시가 비활성화되어 있습니다. (FILE_EXTRACT_CACHE_ENABLED, FILE_SECTION_CACHE_MB)"
+        if ctx:
+            ctx.error(error_msg)
+        return json.dumps({"error": error_msg}, ensure_ascii=False)
+    
+    if cache_warmer.is_running():
+        error_msg = "캐시 예열이 이미 실행 중입니다."
+        if ctx:
+            ctx.warning(error_msg)
+        return json.dumps({"error": error_msg}, ensure_ascii=False)
+    
+    try:
+        directories = [Path(query.directory)] if query.directory else SEARCH_DIRS
+        # 예열할 파일을 찾는 탐색과 stat은 큰 공유 폴더에서 오래 걸리므로 이벤트 루프를 막지 않도록 백그라운드 실행기에서 실행
+        files = await asyncio.get_running_loop().run_in_executor(
+            background_executor,
+            lambda: cache_warmer.plan([dir_path for dir_path in directories if dir_path.is_dir()], find_files)
+        )
+        if query.limit:
+            files = files[:query.limit]
         
-        logger.info(f"Search completed in {elapsed_time:.2f} seconds")
+        if ctx:
+            ctx.info(f"캐시 예열 시작: {len(files)}개 파일")
+        
+        async def report_progress(done: int, total: int) -> None:
+            if ctx:
+                await ctx.report_progress(done, total)
+        
+        stats = await cache_warmer.run_async(files, report_progress, executor=background_executor)
+        
+        if ctx:
+            ctx.info(f"캐시 예열 완료: {stats['warmed']}개 파일, 소요 시간: {stats['elapsed_seconds']:.2f}초")
         
         return json.dumps({
-            "query": query.keywords,
-            "directories": [str(dir_path) for dir_path in valid_dirs],
-            "file_type": query.file_type,
-            "result_count": len(all_results),
-            "elapsed_time_seconds": round(elapsed_time, 2),
-            "results": [result.model_dump() for result in all_results]
+            "warmup": stats,
+            "extraction_cache": extraction_cache.stats() if extraction_cache is not None else None
         }, ensure_ascii=False, indent=2)
     except Exception as e:
-        error_msg = f"검색 중 오류 발생: {str(e)}"
+        error_msg = f"캐시 예열 중 오류 발생: {str(e)}"
         logger.exception(error_msg)
-        ctx.error(error_msg)
+        if ctx:
+            ctx.error(error_msg)
         return json.dumps({
             "error": error_msg,
             "traceback": traceback.format_exc()
@@ -449,50 +1255,52 @@ async def get_directory_listing(query: DirectoryListingQuery, ctx: Context = Non
         if len(valid_dirs) > 1 and ctx:
             ctx.info(f"총 {len(valid_dirs)}개의 디렉토리 중 첫 번째 디렉토리({directory})의 목록만 표시합니다.")
         
-        # 모든 파일을 한 번에 로드하지 않고 생성자를 사용하여 리스트 변환
-        files = list(find_files(directory, query.file_type, recursive=False))
-        total_files = len(files)
+        # 목록을 만드는 동안 백그라운드 추출이 디스크를 차지하지 않도록 멈춤
+        with extraction_scheduler.interactive():
+            # 모든 파일을 한 번에 로드하지 않고 생성자를 사용하여 리스트 변환
+            files = list(find_files(directory, query.file_type, recursive=False))
+            total_files = len(files)
         
-        # 페이징 처리
-        start_idx = (query.page - 1) * query.limit
-        end_idx = min(start_idx + query.limit, total_files)
+            # 페이징 처리
+            start_idx = (query.page - 1) * query.limit
+            end_idx = min(start_idx + query.limit, total_files)
         
-        # 인덱스 범위 검증
-        if start_idx >= total_files and total_files > 0:
-            page = math.ceil(total_files / query.limit)
-            start_idx = (page - 1) * query.limit
-            end_idx = total_files
+            # 인덱스 범위 검증
+            if start_idx >= total_files and total_files > 0:
+                page = math.ceil(total_files / query.limit)
+                start_idx = (page - 1) * query.limit
+                end_idx = total_files
             
-        # 페이지에 해당하는 파일만 처리
-        current_page_files = files[start_idx:end_idx]
+            # 페이지에 해당하는 파일만 처리
+            current_page_files = files[start_idx:end_idx]
         
-        # 각 파일에 대한 메타데이터 수집
-        files_metadata = []
-        for idx, f in enumerate(current_page_files):
-            try:
-                handler = handler_registry.get_handler_for_file(f)
-                file_type = handler.get_type_description() if handler else "Unknown"
+            # 각 파일에 대한 메타데이터 수집
+            files_metadata = []
+            for idx, f in enumerate(current_page_files):
+                try:
+                    handler = handler_registry.get_handler_for_file(f)
+                    file_type = handler.get_type_description() if handler else "Unknown"
                 
-                stat = f.stat()
-                files_metadata.append({
-                    "name": f.name,
-                    "path": str(f),
-                    "type": file_type,
-                    "size_kb": round(stat.st_size / 1024, 2),
-                    "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
-                })
+                    stat = f.stat()
+                    files_metadata.append({
+                        "name": f.name,
+                        "path": str(f),
+                        "type": file_type,
+                        "size_kb": round(stat.st_size / 1024, 2),
+                        "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
+                    })
                 
-                # 비동기 처리를 위해 이벤트 루프에 여유 제공
-                if idx % 10 == 0:
-                    await asyncio.sleep(0.01)
+                    # 비동기 처리를 위해 이벤트 루프에 여유 제공
+                    if idx % 10 == 0:
+                        await asyncio.sleep(0.01)
                     
-            except Exception as e:
-                logger.error(f"Error getting metadata for {f}: {e}")
-                files_metadata.append({
-                    "name": f.name,
-                    "path": str(f),
-                    "error": str(e)
-                })
+                except Exception as e:
+                    logger.error(f"Error getting metadata for {f}: {e}")
+                    files_metadata.append({
+                        "name": f.name,
+                        "path": str(f),
+                        "error": str(e)
+                    })
         
         elapsed_time = time.time() - start_time
         result = {
@@ -561,6 +1369,81 @@ async def get_supported_file_types(ctx: Context = None) -> str:
             "traceback": traceback.format_exc()
         }, ensure_ascii=False)
 
+@mcp.tool()
+async def get_cache_stats(ctx: Context = None) -> str:
+    """
+    메모리 섹션 캐시와 디스크 추출 결과 캐시의 크기 및 적중/실패 통계를 반환합니다.
+    
+    Args:
+        ctx: MCP 컨텍스트
+        
+    Returns:
+        캐시별 통계를 JSON 형식으로 반환 (비활성화된 캐시는 null)
+    """
+    try:
+        result = {
+            "section_cache": section_cache.stats() if section_cache is not None else None,
+            "extraction_cache": extraction_cache.stats() if extraction_cache is not None else None
+        }
+        
+        if ctx:
+            ctx.info("캐시 통계 반환")
+            
+        return json.dumps(result, ensure_ascii=False, indent=2)
+    except Exception as e:
+        error_msg = f"캐시 통계 조회 중 오류 발생: {str(e)}"
+        logger.exception(error_msg)
+        if ctx:
+            ctx.error(error_msg)
+        return json.dumps({
+            "error": error_msg,
+            "traceback": traceback.format_exc()
+        }, ensure_ascii=False)
+
+@mcp.tool()
+async def list_failed_files(query: FailedFilesQuery, ctx: Context = None) -> str:
+    """
+    추출에 실패하여 변경될 때까지 검색에서 건너뛰는 파일(손상, 암호화 등) 목록을 반환합니다.
+    
+    Args:
+        query: 추출 실패 파일 목록 쿼리 (선택적 디렉토리, 기록 삭제 여부)
+        ctx: MCP 컨텍스트
+        
+    Returns:
+        실패 파일 목록을 JSON 형식으로 반환
+    """
+    if failure_cache is None:
+        error_msg = "추출 실패 기록이 비활성화되어 있습니다. (FILE_FAILURE_CACHE_ENABLED)"
+        if ctx:
+            ctx.error(error_msg)
+        return json.dumps({"error": error_msg}, ensure_ascii=False)
+    
+    try:
+        directory = Path(query.directory) if query.directory else None
+        failures = failure_cache.list_failures(directory)
+        
+        result = {
+            "failed_files": failures,
+            "total_count": len(failures),
+            "skipped_extractions": failure_cache.skipped
+        }
+        if query.clear:
+            result["cleared"] = failure_cache.clear(directory)
+        
+        if ctx:
+            ctx.info(f"추출 실패 파일 목록 반환: {len(failures)}개 파일")
+            
+        return json.dumps(result, ensure_ascii=False, indent=2)
+    except Exception as e:
+        error_msg = f"추출 실패 파일 목록 조회 중 오류 발생: {str(e)}"
+        logger.exception(error_msg)
+        if ctx:
+            ctx.error(error_msg)
+        return json.dumps({
+            "error": error_msg,
+            "traceback": traceback.format_exc()
+        }, ensure_ascii=False)
+
 @mcp.resource("search-help://guide")
 def get_search_guide() -> str:
     """검색 가이드를 제공하는 리소스"""
@@ -579,6 +1462,7 @@ def get_search_guide() -> str:
 - 특정 디렉토리를 지정하려면 "마케팅 폴더에서 예산 관련 문서 찾아줘"와 같이 요청하세요.
 - 특정 파일 형식을 검색하려면 "PDF에서 계약 관련 내용 찾아줘"와 같이 요청하세요.
 - 큰 디렉토리 탐색 시 시간이 오래 걸릴 수 있으니 가능한 구체적인 경로를 지정하세요.
+- "키오스크는", "비용을"처럼 조사가 붙은 단어나 복합어 안의 일부까지 찾으려면 match_mode를 "substring"으로 지정하세요.
 
 ## 지원되는 파일 형식
 - PowerPoint (.pptx)
@@ -592,6 +1476,34 @@ def get_search_guide() -> str:
 - 최대 결과 수: 50
 """
 
+def start_index_watcher() -> Optional[IndexWatcher]:
+    """
+    검색 디렉토리 감시를 시작하여 변경된 파일이 몇 초 안에 색인에 반영되도록 합니다.
+    
+    Returns:
+        시작된 색인 감시기 (색인 또는 감시가 비활성화된 경우 None)
+    """
+    if file_index is None or not INDEX_WATCH:
+        return None
+    
+    indexer = IncrementalIndexer(file_index, handler_registry, extract_in_background,
+                                 dedup_max_bytes=int(DEDUP_MAX_MB * 1024 * 1024))
+    # 읽지 못한 디렉토리의 파일이 삭제된 것으로 처리되지 않도록 목록을 끝까지 읽지 못하면 오류를 발생시킴
+    watcher = IndexWatcher(indexer, handler_registry, lambda directory: find_files(directory, strict=True),
+                           debounce_seconds=INDEX_WATCH_DEBOUNCE,
+                           poll_interval_seconds=INDEX_POLL_INTERVAL)
+    # 사용하지 않도록 설정된 샤드의 디렉토리는 감시하지 않고 검색할 때 직접 추출
+    watcher.start([root for root in SEARCH_DIRS if file_index.is_shard_enabled(root)])
+    return watcher
+
+# 색인 감시 시작 (fastmcp run으로 실행될 때도 동작하도록 모듈 로드 시 시작)
+index_watcher = start_index_watcher()
+
+# 캐시 예열기 (warm_cache 도구와 서버 시작 시 예열에서 함께 사용)
+cache_warmer = CacheWarmer(extract_in_background, recent_files=WARMUP_RECENT_FILES, duty_cycle=WARMUP_DUTY_CYCLE)
+if WARMUP_ON_START and (extraction_cache is not None or section_cache is not None):
+    cache_warmer.start_background([dir_path for dir_path in SEARCH_DIRS if dir_path.is_dir()], find_files)
+
 def log_system_info():
     """시스템 정보를 로그에 기록"""
     logger.info("=== 시스템 정보 ===")
@@ -600,6 +1512,18 @@ def log_system_info():
     logger.info(f"파일 검색 디렉토리: {SEARCH_DIRS}")
     logger.info(f"로그 디렉토리: {LOG_DIR}")
     logger.info(f"로그 레벨: {LOG_LEVEL}")
+    logger.info(f"검색 색인: {INDEX_BACKEND if INDEX_ENABLED else '비활성화'} ({INDEX_DIR})")
+    logger.info(f"추출 작업자 수: {extract_concurrency}" +
+                (f" (파서 프로세스 {EXTRACT_PROCESSES}개, 묶음 크기 {EXTRACT_BATCH_SIZE}"
+                 f", 메모리 제한 {EXTRACT_MEMORY_LIMIT_MB:g}MB, CPU 시간 제한 {EXTRACT_CPU_LIMIT_SECONDS:g}초)"
+                 if extraction_process_pool is not None
+                 else f" (파서 스레드 {parser_threads.limit}개)"))
+    logger.info(f"디렉토리별 동시 처리 한도: {f'적응형 ({CONCURRENCY_MIN}~{extract_concurrency}, 처음 {CONCURRENCY_INITIAL})' if ADAPTIVE_CONCURRENCY else f'고정 ({extract_concurrency})'}")
+    logger.info(f"추출 결과 캐시: {f'{EXTRACT_CACHE_MAX_MB:g}MB ({EXTRACT_CACHE_DIR})' if EXTRACT_CACHE_ENABLED else '비활성화'}")
+    logger.info(f"추출 실패 기록: {f'재시도 {FAILURE_RETRY_HOURS:g}시간' if failure_cache is not None else '비활성화'}")
+    logger.info(f"메모리 섹션 캐시: {f'{SECTION_CACHE_MB:g}MB' if section_cache is not None else '비활성화'}")
+    logger.info(f"시작 시 캐시 예열: {'사용' if WARMUP_ON_START else '사용 안 함'}")
+    logger.info(f"백그라운드 추출 한도: CPU 비율 {BACKGROUND_CPU_SHARE:g}, 읽기 속도 {f'{BACKGROUND_IO_MBPS:g}MB/s' if BACKGROUND_IO_MBPS > 0 else '제한 없음'}")
     logger.info(f"지원되는 파일 타입: {[h.get_type_description() for h in handler_registry.handlers]}")
     logger.info(f"지원되는 파일 확장자: {[ext for h in handler_registry.handlers for ext in h.get_supported_extensions()]}")
     logger.info("==================")
@@ -0,0 +1,30 @@
+"""
+검색 색인 패키지
+
+이 패키지는 추출된 파일 내용을 디스크에 색인하여 매 검색마다 파일을 다시 읽지 않고도
+키워드를 찾을 수 있도록 하는 기능을 제공합니다.
+"""
+
+from search_index.base import IndexBackend
+from search_index.inverted_index import InvertedIndex
+from search_index.fts5_index import FTS5Index
+from search_index.shards import ShardedIndex
+from search_index.backends import INDEX_BACKENDS, create_index
+from search_index.watcher import IndexWatcher
+from search_index.indexer import IncrementalIndexer
+from search_index.tokenizer import tokenize, term_frequencies, term_positions, trigrams
+
+__all__ = [
+    'IndexBackend',
+    'InvertedIndex',
+    'FTS5Index',
+    'ShardedIndex',
+    'INDEX_BACKENDS',
+    'create_index',
+    'IncrementalIndexer',
+    'IndexWatcher',
+    'tokenize',
+    'term_frequencies',
+    'term_positions',
+    'trigrams'
+]
@@ -0,0 +1,10 @@
+"""
+일괄 색인기 실행 진입점 (python -m search_index build ...)
+"""
+
+import sys
+
+from search_index.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
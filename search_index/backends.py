@@ -0,0 +1,48 @@
+"""
+색인 저장소 선택
+
+이 모듈은 설정된 이름에 맞는 색인 저장소를 생성하는 기능을 제공합니다.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+from search_index.base import IndexBackend
+from search_index.inverted_index import InvertedIndex
+from search_index.fts5_index import FTS5Index
+from search_index.merger import DEFAULT_MERGE_FACTOR
+from search_index.shards import ShardedIndex
+
+INDEX_BACKENDS = {
+    "native": InvertedIndex,
+    "fts5": FTS5Index
+}
+
+def create_index(backend: str, index_dir: Path, merge_factor: int = DEFAULT_MERGE_FACTOR,
+                 roots: Optional[List[Path]] = None) -> IndexBackend:
+    """
+    지정된 이름의 색인 저장소를 생성하고 디스크에서 엽니다.
+    검색 디렉토리 목록을 지정하면 디렉토리마다 같은 종류의 색인 샤드를 하나씩 사용합니다.
+
+    Args:
+        backend: 색인 저장소 이름 ("native" 또는 "fts5")
+        index_dir: 색인을 저장할 디렉토리
+        merge_factor: 한 번에 병합할 비슷한 크기의 세그먼트 수
+        roots: 검색 디렉토리 목록 (지정하면 디렉토리별 샤드로 나누어 저장)
+
+    Returns:
+        열린 색인 저장소
+
+    Raises:
+        ValueError: 지원되지 않는 색인 저장소 이름인 경우
+    """
+    backend_class = INDEX_BACKENDS.get(backend.lower())
+    if backend_class is None:
+        raise ValueError(f"지원되지 않는 색인 저장소입니다: {backend} (지원: {', '.join(INDEX_BACKENDS)})")
+
+    if roots is not None:
+        index = ShardedIndex(Path(index_dir), roots, lambda shard_dir: backend_class(shard_dir, merge_factor=merge_factor))
+    else:
+        index = backend_class(Path(index_dir), merge_factor=merge_factor)
+    index.load()
+    return index
@@ -0,0 +1,144 @@
+"""
+검색 색인 저장소 추상 클래스 정의
+
+이 모듈은 색인 저장 방식(자체 역색인, SQLite FTS5 등)에 관계없이 검색 서버와 증분 색인기가
+같은 방식으로 사용할 수 있도록 색인 저장소의 공통 인터페이스를 정의합니다.
+"""
+
+import os
+import abc
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+class IndexBackend(abc.ABC):
+    """검색 색인 저장소 추상 클래스"""
+
+    @abc.abstractmethod
+    def load(self) -> None:
+        """디스크에서 색인을 엽니다."""
+        pass
+
+    @abc.abstractmethod
+    def save(self) -> None:
+        """변경된 내용을 디스크에 반영합니다."""
+        pass
+
+    @abc.abstractmethod
+    def is_current(self, file_path: Path, stat: Optional[os.stat_result] = None, handler_version: int = 1) -> bool:
+        """
+        파일이 색인되어 있고 색인 이후 변경되지 않았는지 확인합니다.
+
+        Args:
+            file_path: 확인할 파일 경로
+            stat: 파일의 stat 결과 (지정하지 않으면 직접 조회)
+            handler_version: 현재 파일 핸들러의 버전
+
+        Returns:
+            색인이 최신인지 여부
+        """
+        pass
+
+    @abc.abstractmethod
+    def add_document(self, file_path: Path, file_type: str, sections: List[Dict[str, Any]],
+                     stat: Optional[os.stat_result] = None, handler_version: int = 1) -> None:
+        """
+        파일의 섹션을 색인에 추가합니다. 이미 색인된 파일이면 기존 내용을 교체합니다.
+
+        Args:
+            file_path: 파일 경로
+            file_type: 파일 형식 설명
+            sections: extract_text 결과 섹션 목록
+            stat: 파일의 stat 결과 (지정하지 않으면 직접 조회)
+            handler_version: 내용을 추출한 파일 핸들러의 버전
+        """
+        pass
+
+    @abc.abstractmethod
+    def remove_document(self, file_path: Path) -> None:
+        """
+        파일을 툼스톤으로 표시하여 검색 결과에서 제외합니다.
+
+        Args:
+            file_path: 제거할 파일 경로
+        """
+        pass
+
+    @abc.abstractmethod
+    def compact(self) -> int:
+        """
+        툼스톤으로 표시된 파일을 색인에서 완전히 정리합니다.
+
+        Returns:
+            정리된 파일 수
+        """
+        pass
+
+    @abc.abstractmethod
+    def tombstone_count(self) -> int:
+        """툼스톤으로 표시된 파일 수를 반환합니다."""
+        pass
+
+    @abc.abstractmethod
+    def get_state(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        색인된 파일의 매니페스트 정보(크기, 수정 시각, inode, 핸들러 버전)를 반환합니다.
+
+        Args:
+            file_path: 파일 경로
+
+        Returns:
+            매니페스트 정보 (색인되지 않았거나 삭제된 파일이면 None)
+        """
+        pass
+
+    @abc.abstractmethod
+    def paths_under(self, root: Path) -> List[str]:
+        """
+        지정된 디렉토리 아래에 색인된 (삭제되지 않은) 파일 경로 목록을 반환합니다.
+
+        Args:
+            root: 기준 디렉토리
+
+        Returns:
+            파일 경로 목록
+        """
+        pass
+
+    @abc.abstractmethod
+    def get_sections(self, file_path: Path) -> List[Dict[str, Any]]:
+        """
+        색인에 저장된 파일의 전체 섹션을 반환합니다.
+
+        Args:
+            file_path: 파일 경로
+
+        Returns:
+            섹션 목록 (색인되지 않은 파일이면 빈 목록)
+        """
+        pass
+
+    @abc.abstractmethod
+    def search(self, keywords: str, match_mode: str = "word",
+               directory: Optional[Path] = None) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        키워드와 매칭될 수 있는 후보 섹션을 찾습니다.
+        후보는 실제 매칭 결과의 상위 집합이어야 하며, 최종 매칭 여부는 검색 서버가 확인합니다.
+
+        Args:
+            keywords: 검색 키워드
+            match_mode: "word"이면 단어 단위 매칭, "substring"이면 부분 문자열 매칭
+            directory: 지정하면 이 디렉토리 아래의 파일만 찾음
+
+        Returns:
+            경로별 후보 섹션 목록. 색인으로 답할 수 없는 키워드이면 None
+        """
+        pass
+
+    def close(self) -> None:
+        """변경된 내용을 반영하고 색인을 닫습니다."""
+        self.save()
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """색인된 (삭제되지 않은) 파일 수를 반환합니다."""
+        pass
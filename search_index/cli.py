@@ -0,0 +1,219 @@
+"""
+일괄 색인기 명령줄 도구
+
+이 모듈은 검색 서버 밖에서 검색 디렉토리 전체를 여러 프로세스로 추출하여 색인을 만드는
+명령줄 도구를 제공합니다. 검색 서버와 같은 파일 핸들러 구성(create_default_registry)과
+같은 샤드 구조를 사용하므로, 만들어진 색인 디렉토리를 그대로 FILE_INDEX_DIR로 사용할 수 있습니다.
+
+사용 예:
+    python -m search_index build --roots /data/share /data/archive --workers 8 --index-dir /srv/index
+
+검색 서버가 사용 중인 색인 디렉토리에 동시에 기록하지 않도록, 별도의 디렉토리에 만든 뒤 복사하여 배포합니다.
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator
+
+from file_handlers import FileHandlerRegistry, create_default_registry
+from search_index.backends import INDEX_BACKENDS, create_index
+from search_index.indexer import IncrementalIndexer, SUBMIT_WINDOW_PER_WORKER
+from search_index.merger import DEFAULT_MERGE_FACTOR
+from extraction.process_pool import ProcessExtractionPool, DEFAULT_BATCH_SIZE
+from extraction.dedup import DEFAULT_DEDUP_MAX_BYTES
+
+logger = logging.getLogger("file_search.cli")
+
+# 검색 서버의 MAX_CONTENT_PER_FILE과 같아야 서버가 같은 섹션을 얻음
+DEFAULT_MAX_SECTIONS = 10
+
+# 검색 서버의 FILE_EXTRACT_TIMEOUT 기본값과 같은 파일 하나의 추출 시간 제한(초)
+DEFAULT_EXTRACT_TIMEOUT = 60.0
+
+# 작업자 프로세스마다 한 번만 만드는 핸들러 레지스트리
+_worker_registry: Optional[FileHandlerRegistry] = None
+_worker_max_sections = DEFAULT_MAX_SECTIONS
+
+def _init_worker(max_sections: int) -> None:
+    global _worker_registry, _worker_max_sections
+    _worker_registry = create_default_registry()
+    _worker_max_sections = max_sections
+
+def extract_file(file_path: Path) -> List[Dict[str, Any]]:
+    """
+    작업자 프로세스에서 파일 하나의 섹션을 추출합니다. 검색 서버의 extract_text_from_file과 같이
+    추출 중 발생한 오류는 error 섹션으로 반환합니다.
+
+    Args:
+        file_path: 파일 경로
+
+    Returns:
+        섹션별 텍스트 정보 리스트
+    """
+    if _worker_registry is None:
+        _init_worker(_worker_max_sections)
+
+    handler = _worker_registry.get_handler_for_file(file_path)
+    if handler is None:
+        return [{"section_number": 0, "text": "지원되지 않는 파일 형식입니다."}]
+    try:
+        return handler.extract_text(file_path, _worker_max_sections)
+    except Exception as e:
+        return [{"section_number": 0, "section_type": "error", "text": f"파일 처리 중 오류 발생: {str(e)}"}]
+
+def walk_files(registry: FileHandlerRegistry, root: Path) -> Iterator[Path]:
+    """
+    디렉토리 아래에서 지원되는 파일을 찾습니다.
+
+    Args:
+        registry: 파일 핸들러 레지스트리
+        root: 탐색할 디렉토리
+
+    Yields:
+        찾은 파일 경로
+
+    Raises:
+        OSError: 읽을 수 없는 디렉토리가 있는 경우 (목록이 불완전하면 사라진 파일을 삭제하지 않도록)
+    """
+    def on_walk_error(error: OSError) -> None:
+        raise error
+
+    for directory, _, files in os.walk(root, onerror=on_walk_error):
+        directory_path = Path(directory)
+        for name in files:
+            file_path = directory_path / name
+            if registry.can_handle_file(file_path):
+                yield file_path
+
+def build(roots: List[Path], index_dir: Path, backend: str, workers: int,
+          max_sections: int = DEFAULT_MAX_SECTIONS, merge_factor: int = DEFAULT_MERGE_FACTOR,
+          batch_size: int = DEFAULT_BATCH_SIZE,
+          dedup_max_bytes: int = DEFAULT_DEDUP_MAX_BYTES,
+          timeout: Optional[float] = DEFAULT_EXTRACT_TIMEOUT) -> Dict[str, Dict[str, Any]]:
+    """
+    검색 디렉토리의 색인을 증분 방식으로 만들거나 갱신합니다.
+
+    Args:
+        roots: 검색 디렉토리 목록
+        index_dir: 색인 디렉토리
+        backend: 색인 저장소 이름 ("native" 또는 "fts5")
+        workers: 추출 작업자 프로세스 수 (1이고 시간 제한이 없으면 현재 프로세스에서 추출)
+        max_sections: 파일당 추출할 최대 섹션 수
+        merge_factor: 한 번에 병합할 비슷한 크기의 세그먼트 수
+        batch_size: 작업자 프로세스에 한 번에 전달할 파일 수
+        dedup_max_bytes: 내용 해시로 같은 파일을 찾을 최대 파일 크기, 0이면 찾지 않음
+        timeout: 파일 하나의 추출 시간 제한(초), None이면 제한 없음 (넘은 파일은 작업자를 종료하고 실패로 집계)
+
+    Returns:
+        디렉토리별 갱신 통계와 처리량
+    """
+    _init_worker(max_sections)
+    registry = _worker_registry
+    index = create_index(backend, index_dir, merge_factor=merge_factor, roots=roots)
+    indexer = IncrementalIndexer(index, registry, extract_file, dedup_max_bytes=dedup_max_bytes,
+                                 extract_timeout=timeout)
+
+    executor = None
+    # 현재 프로세스에서 실행한 추출은 중단할 수 없으므로 시간 제한이 있으면 작업자가 하나여도 작업자 프로세스를 사용
+    if workers > 1 or timeout is not None:
+        # 작업자는 핸들러 라이브러리를 미리 임포트한 채로 시작하고 파일을 묶음으로 받음
+        executor = ProcessExtractionPool(workers, initializer=_init_worker, initargs=(max_sections,),
+                                         batch_size=batch_size)
+        executor.start()
+
+    report = {}
+    try:
+        for root in roots:
+            if not root.is_dir():
+                logger.warning(f"Skipping missing directory: {root}")
+                continue
+
+            start_time = time.time()
+            try:
+                stats = indexer.refresh(root, walk_files(registry, root), executor=executor,
+                                        max_pending=workers * max(SUBMIT_WINDOW_PER_WORKER, 2 * batch_size))
+            except OSError as e:
+                logger.error(f"Listing {root} was incomplete: {e}")
+                print(f"{root}: listing incomplete ({e}), found files were indexed but no files were deleted")
+                continue
+            elapsed = max(time.time() - start_time, 1e-9)
+            # 내용이 같아 대표 파일의 추출 결과를 재사용한 파일은 추출 수에서 제외
+            extracted = stats["added"] + stats["updated"] - stats["deduplicated"]
+            indexed = stats["added"] + stats["updated"]
+            scanned = indexed + stats["unchanged"] + stats["failed"]
+            stats.update({
+                "scanned": scanned,
+                "elapsed_seconds": round(elapsed, 2),
+                "files_per_second": round(scanned / elapsed, 1),
+                "extracted_per_second": round(extracted / elapsed, 1),
+                "megabytes_per_second": round(stats["extracted_bytes"] / elapsed / (1024 * 1024), 2)
+            })
+            report[str(root)] = stats
+            print(f"{root}: {scanned} files ({extracted} extracted, {stats['deduplicated']} deduplicated, {stats['unchanged']} unchanged, "
+                  f"{stats['deleted']} deleted, {stats['failed']} failed) in {elapsed:.1f}s - "
+                  f"{stats['files_per_second']} files/s, {stats['extracted_per_second']} extracted/s, "
+                  f"{stats['megabytes_per_second']} MB/s")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        index.compact()
+        index.close()
+    return report
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """명령줄 인자를 해석하여 일괄 색인기를 실행합니다."""
+    parser = argparse.ArgumentParser(prog="python -m search_index", description="파일 검색 색인 일괄 생성 도구")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="검색 디렉토리의 색인을 만들거나 증분 갱신합니다.")
+    default_roots = os.environ.get("FILE_SEARCH_DIRS", os.environ.get("FILE_SEARCH_DIR", ""))
+    build_parser.add_argument("--roots", nargs="+", type=Path,
+                              default=[Path(d.strip()) for d in default_roots.split(";") if d.strip()],
+                              help="색인할 검색 디렉토리 (기본값: FILE_SEARCH_DIRS)")
+    build_parser.add_argument("--index-dir", type=Path,
+                              default=Path(os.environ.get("FILE_INDEX_DIR", str(Path.home() / ".file_search" / "index"))),
+                              help="색인 디렉토리 (기본값: FILE_INDEX_DIR)")
+    build_parser.add_argument("--backend", choices=sorted(INDEX_BACKENDS),
+                              default=os.environ.get("FILE_INDEX_BACKEND", "native"),
+                              help="색인 저장소 (기본값: FILE_INDEX_BACKEND 또는 native)")
+    build_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                              help="추출 작업자 프로세스 수 (기본값: CPU 수)")
+    build_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                              help="작업자 프로세스에 한 번에 전달할 파일 수")
+    build_parser.add_argument("--max-sections", type=int, default=DEFAULT_MAX_SECTIONS,
+                              help="파일당 추출할 최대 섹션 수 (검색 서버 설정과 같아야 함)")
+    build_parser.add_argument("--merge-factor", type=int,
+                              default=int(os.environ.get("FILE_INDEX_MERGE_FACTOR", str(DEFAULT_MERGE_FACTOR))),
+                              help="한 번에 병합할 비슷한 크기의 세그먼트 수")
+    build_parser.add_argument("--dedup-max-mb", type=float,
+                              default=float(os.environ.get("FILE_DEDUP_MAX_MB", str(DEFAULT_DEDUP_MAX_BYTES // (1024 * 1024)))),
+                              help="내용 해시로 같은 파일을 찾을 최대 파일 크기(MB), 0이면 찾지 않음 (기본값: FILE_DEDUP_MAX_MB 또는 64)")
+    build_parser.add_argument("--timeout", type=float,
+                              default=float(os.environ.get("FILE_EXTRACT_TIMEOUT", str(DEFAULT_EXTRACT_TIMEOUT))),
+                              help="파일 하나의 추출 시간 제한(초), 0이면 제한 없음 (기본값: FILE_EXTRACT_TIMEOUT 또는 60)")
+    build_parser.add_argument("--log-level", default="WARNING", help="로그 레벨 (기본값: WARNING)")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=getattr(logging, args.log_level.upper()),
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if not args.roots:
+        parser.error("색인할 디렉토리를 --roots 또는 FILE_SEARCH_DIRS로 지정하세요.")
+
+    start_time = time.time()
+    report = build(args.roots, args.index_dir, args.backend, max(args.workers, 1),
+                   max_sections=args.max_sections, merge_factor=args.merge_factor,
+                   batch_size=max(args.batch_size, 1),
+                   dedup_max_bytes=int(args.dedup_max_mb * 1024 * 1024),
+                   timeout=args.timeout if args.timeout > 0 else None)
+    elapsed = max(time.time() - start_time, 1e-9)
+    scanned = sum(stats["scanned"] for stats in report.values())
+    extracted = sum(stats["added"] + stats["updated"] - stats["deduplicated"] for stats in report.values())
+    megabytes = sum(stats["extracted_bytes"] for stats in report.values()) / (1024 * 1024)
+    print(f"Total: {scanned} files, {extracted} extracted, {megabytes:.1f} MB in {elapsed:.1f}s - "
+          f"{scanned / elapsed:.1f} files/s, {megabytes / elapsed:.2f} MB/s -> {args.index_dir}")
+    return 0
@@ -0,0 +1,278 @@
+"""
+SQLite FTS5 색인 저장소
+
+이 모듈은 파일 핸들러가 추출한 섹션을 SQLite FTS5 테이블
+(path, file_type, section_number, section_type, text)에 저장하는 색인 저장소를 제공합니다.
+표준 라이브러리만 사용하며, WAL 모드로 열기 때문에 여러 서버 프로세스가 같은 색인을
+동시에 읽을 수 있고 저장 중 중단되어도 마지막으로 커밋된 상태가 유지됩니다.
+부분 문자열 검색을 위해 같은 섹션을 trigram 토크나이저를 사용하는 FTS5 테이블에도 색인합니다.
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from search_index.base import IndexBackend
+from search_index.merger import DEFAULT_MERGE_FACTOR
+from search_index.tokenizer import TRIGRAM_SIZE, tokenize
+
+logger = logging.getLogger("file_search.fts5_index")
+
+SCHEMA_VERSION = 2
+
+# FTS5 automerge 설정이 허용하는 범위
+MIN_AUTOMERGE = 2
+MAX_AUTOMERGE = 16
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    file_type TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    handler_version INTEGER NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS section_store (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    file_type TEXT NOT NULL,
+    section_number INTEGER NOT NULL,
+    section_type TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS section_store_path ON section_store(path);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS sections USING fts5(
+    path UNINDEXED,
+    file_type UNINDEXED,
+    section_number UNINDEXED,
+    section_type UNINDEXED,
+    text,
+    content='section_store',
+    content_rowid='id'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS section_trigrams USING fts5(
+    text,
+    content='section_store',
+    content_rowid='id',
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS section_store_ai AFTER INSERT ON section_store BEGIN
+    INSERT INTO sections(rowid, path, file_type, section_number, section_type, text)
+    VALUES (new.id, new.path, new.file_type, new.section_number, new.section_type, new.text);
+    INSERT INTO section_trigrams(rowid, text) VALUES (new.id, new.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS section_store_ad AFTER DELETE ON section_store BEGIN
+    INSERT INTO sections(sections, rowid, path, file_type, section_number, section_type, text)
+    VALUES ('delete', old.id, old.path, old.file_type, old.section_number, old.section_type, old.text);
+    INSERT INTO section_trigrams(section_trigrams, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+class FTS5Index(IndexBackend):
+    """SQLite FTS5 테이블에 저장되는 색인"""
+
+    def __init__(self, index_dir: Path, merge_factor: int = DEFAULT_MERGE_FACTOR):
+        """
+        Args:
+            index_dir: 색인 데이터베이스를 저장할 디렉토리
+            merge_factor: FTS5가 내부 b-tree 세그먼트를 병합하는 기준 (automerge, 2~16)
+        """
+        self.index_dir = Path(index_dir)
+        self.merge_factor = min(max(merge_factor, MIN_AUTOMERGE), MAX_AUTOMERGE)
+        self.db_file = self.index_dir / "index.sqlite3"
+        self.conn: Optional[sqlite3.Connection] = None
+        self.lock = threading.RLock()
+
+    def load(self) -> None:
+        """색인 데이터베이스를 열고 필요한 테이블을 만듭니다."""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_file), check_same_thread=False, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+        user_version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if user_version not in (0, SCHEMA_VERSION):
+            logger.warning(f"Index schema version mismatch in {self.db_file}, rebuilding the index")
+            self.conn.executescript("""
+                DROP TRIGGER IF EXISTS section_store_ai;
+                DROP TRIGGER IF EXISTS section_store_ad;
+                DROP TABLE IF EXISTS section_trigrams;
+                DROP TABLE IF EXISTS sections;
+                DROP TABLE IF EXISTS section_store;
+                DROP TABLE IF EXISTS documents;
+            """)
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        # FTS5도 작은 b-tree 세그먼트를 점진적으로 병합하므로 같은 병합 기준을 적용
+        for fts_table in ("sections", "section_trigrams"):
+            self.conn.execute(f"INSERT INTO {fts_table}({fts_table}, rank) VALUES ('automerge', ?)", (self.merge_factor,))
+        self.conn.commit()
+        logger.info(f"Opened FTS5 index with {len(self)} documents from {self.db_file}")
+
+    def save(self) -> None:
+        """진행 중인 트랜잭션을 커밋합니다."""
+        with self.lock:
+            if self.conn is not None and self.conn.in_transaction:
+                self.conn.commit()
+
+    def close(self) -> None:
+        """색인 데이터베이스를 닫습니다."""
+        with self.lock:
+            if self.conn is not None:
+                self.conn.commit()
+                self.conn.close()
+                self.conn = None
+
+    def is_current(self, file_path: Path, stat: Optional[os.stat_result] = None, handler_version: int = 1) -> bool:
+        state = self.get_state(file_path)
+        if state is None:
+            return False
+
+        try:
+            if stat is None:
+                stat = file_path.stat()
+        except OSError:
+            return False
+
+        return (state["size"] == stat.st_size
+                and state["mtime_ns"] == stat.st_mtime_ns
+                and state["inode"] == stat.st_ino
+                and state["handler_version"] == handler_version)
+
+    def add_document(self, file_path: Path, file_type: str, sections: List[Dict[str, Any]],
+                     stat: Optional[os.stat_result] = None, handler_version: int = 1) -> None:
+        path_key = str(file_path)
+        if stat is None:
+            stat = file_path.stat()
+
+        with self.lock:
+            self.conn.execute("DELETE FROM section_store WHERE path = ?", (path_key,))
+            self.conn.executemany(
+                "INSERT INTO section_store(path, file_type, section_number, section_type, text) VALUES (?, ?, ?, ?, ?)",
+                [(path_key, file_type, section.get("section_number", 0), section.get("section_type", ""), section.get("text", ""))
+                 for section in sections]
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents(path, file_type, size, mtime_ns, inode, handler_version, deleted) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (path_key, file_type, stat.st_size, stat.st_mtime_ns, stat.st_ino, handler_version)
+            )
+
+    def remove_document(self, file_path: Path) -> None:
+        with self.lock:
+            self.conn.execute("UPDATE documents SET deleted = 1 WHERE path = ?", (str(file_path),))
+
+    def compact(self) -> int:
+        with self.lock:
+            deleted = [row["path"] for row in self.conn.execute("SELECT path FROM documents WHERE deleted = 1")]
+            for path_key in deleted:
+                self.conn.execute("DELETE FROM section_store WHERE path = ?", (path_key,))
+            self.conn.execute("DELETE FROM documents WHERE deleted = 1")
+            # FTS5 내부 b-tree 세그먼트도 함께 병합
+            self.conn.execute("INSERT INTO sections(sections) VALUES ('optimize')")
+            self.conn.execute("INSERT INTO section_trigrams(section_trigrams) VALUES ('optimize')")
+            return len(deleted)
+
+    def tombstone_count(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM documents WHERE deleted = 1").fetchone()[0]
+
+    def get_state(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT size, mtime_ns, inode, handler_version FROM documents WHERE path = ? AND deleted = 0",
+                (str(file_path),)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def paths_under(self, root: Path) -> List[str]:
+        prefix = os.path.join(str(root), "")
+        with self.lock:
+            # 기본 키 인덱스를 사용하도록 LIKE 대신 범위 조건으로 접두사 검색
+            rows = self.conn.execute(
+                "SELECT path FROM documents WHERE path >= ? AND path < ? AND deleted = 0",
+                (prefix, prefix + "\U0010ffff")
+            ).fetchall()
+        return [row["path"] for row in rows]
+
+    def get_sections(self, file_path: Path) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT s.section_number, s.section_type, s.text FROM section_store s "
+                "JOIN documents d ON d.path = s.path WHERE s.path = ? AND d.deleted = 0 ORDER BY s.id",
+                (str(file_path),)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def search(self, keywords: str, match_mode: str = "word",
+               directory: Optional[Path] = None) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        키워드를 FTS5 구문(phrase) 쿼리로 검색하여 순위(bm25) 순으로 후보 섹션을 반환합니다.
+        각 섹션에는 매칭 위치 주변을 보여주는 snippet이 포함됩니다.
+        부분 문자열 매칭은 trigram 토크나이저 테이블에서 찾습니다.
+
+        Args:
+            keywords: 검색 키워드
+            match_mode: "word"이면 단어 단위 매칭, "substring"이면 부분 문자열 매칭
+            directory: 지정하면 이 디렉토리 아래의 파일만 찾음
+
+        Returns:
+            경로별 후보 섹션 목록. 색인으로 답할 수 없는 키워드이면 None
+        """
+        if match_mode == "substring":
+            # trigram 토크나이저는 3글자보다 짧은 키워드를 찾을 수 없음
+            if len(keywords) < TRIGRAM_SIZE:
+                return None
+            fts_table, snippet_column = "section_trigrams", 0
+        else:
+            if not tokenize(keywords):
+                return None
+            fts_table, snippet_column = "sections", 4
+
+        # 키워드 전체를 하나의 구문으로 전달하여 FTS5 토크나이저가 본문과 같은 방식으로 분리하도록 함
+        match_query = '"' + keywords.replace('"', '""') + '"'
+        params = [match_query]
+        directory_condition = ""
+        if directory is not None:
+            prefix = os.path.join(str(directory), "")
+            directory_condition = "AND st.path >= ? AND st.path < ? "
+            params.extend([prefix, prefix + "\U0010ffff"])
+
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT st.path, st.section_number, st.section_type, st.text, "
+                f"snippet({fts_table}, {snippet_column}, '[', ']', '...', 16) AS snippet "
+                f"FROM {fts_table} f "
+                "JOIN section_store st ON st.id = f.rowid "
+                "JOIN documents d ON d.path = st.path "
+                f"WHERE {fts_table} MATCH ? AND d.deleted = 0 "
+                + directory_condition +
+                "ORDER BY f.rank",
+                params
+            ).fetchall()
+
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            results.setdefault(row["path"], []).append({
+                "section_number": row["section_number"],
+                "section_type": row["section_type"],
+                "text": row["text"],
+                "snippet": row["snippet"]
+            })
+        return results
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM documents WHERE deleted = 0").fetchone()[0]
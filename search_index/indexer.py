@@ -0,0 +1,235 @@
+"""
+증분 색인기
+
+이 모듈은 find_files 결과를 색인에 저장된 매니페스트(크기, st_mtime_ns, inode, 핸들러 버전)와
+비교하여 추가되거나 변경된 파일만 다시 추출하고, 사라진 파일은 툼스톤으로 표시합니다.
+따라서 색인 갱신 비용은 전체 파일 수가 아니라 변경된 파일 수에 비례합니다.
+여러 경로에 복사된 같은 내용의 파일은 한 번만 추출하고, 그 결과를 모든 경로에 반영합니다.
+"""
+
+import os
+import time
+import logging
+from pathlib import Path
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Iterable, Iterator, Callable, Optional, Tuple
+
+from file_handlers.base import FileHandlerRegistry
+from extraction.dedup import group_duplicates, DEFAULT_DEDUP_MAX_BYTES
+from extraction.timeouts import ExtractionTimeoutError
+from search_index.base import IndexBackend
+
+logger = logging.getLogger("file_search.indexer")
+
+# 툼스톤이 이 비율 이상 쌓이면 갱신 후 포스팅을 정리
+COMPACT_TOMBSTONE_RATIO = 0.2
+
+# 병렬 추출 시 작업자당 미리 제출해 둘 파일 수
+SUBMIT_WINDOW_PER_WORKER = 4
+
+class IncrementalIndexer:
+    """변경된 파일만 다시 색인하는 증분 색인기"""
+
+    def __init__(self, index: IndexBackend, handler_registry: FileHandlerRegistry,
+                 extract_fn: Callable[[Path], List[Dict[str, Any]]],
+                 dedup_max_bytes: int = DEFAULT_DEDUP_MAX_BYTES, extract_timeout: Optional[float] = None):
+        """
+        Args:
+            index: 갱신할 색인
+            handler_registry: 파일 핸들러 레지스트리
+            extract_fn: 파일에서 섹션 목록을 추출하는 함수
+            dedup_max_bytes: 내용 해시로 같은 파일을 찾을 최대 파일 크기, 0이면 찾지 않음
+            extract_timeout: 실행기에서 추출할 때 파일 하나의 시간 제한(초), None이면 제한 없음
+                (실행기가 submit_with_timeout을 지원할 때만 적용하며, 시간 제한을 넘은 파일은 실패로 집계)
+        """
+        self.index = index
+        self.handler_registry = handler_registry
+        self.extract_fn = extract_fn
+        self.dedup_max_bytes = dedup_max_bytes
+        self.extract_timeout = extract_timeout
+
+    def is_unchanged(self, file_path: Path, stat: os.stat_result) -> bool:
+        """
+        파일이 매니페스트에 기록된 상태와 같은지 확인합니다.
+
+        Args:
+            file_path: 파일 경로
+            stat: 파일의 stat 결과
+
+        Returns:
+            변경되지 않았으면 True
+        """
+        handler = self.handler_registry.get_handler_for_file(file_path)
+        if handler is None:
+            return False
+        return self.index.is_current(file_path, stat, handler.get_version())
+
+    def index_file(self, file_path: Path, stat: Optional[os.stat_result] = None) -> bool:
+        """
+        파일 하나를 추출하여 색인에 반영합니다.
+
+        Args:
+            file_path: 파일 경로
+            stat: 파일의 stat 결과 (지정하지 않으면 직접 조회)
+
+        Returns:
+            색인에 반영되었으면 True, 추출에 실패했으면 False
+        """
+        handler = self.handler_registry.get_handler_for_file(file_path)
+        if handler is None:
+            return False
+
+        if stat is None:
+            stat = file_path.stat()
+
+        return self.apply_extraction(file_path, stat, self.extract_fn(file_path))
+
+    def apply_extraction(self, file_path: Path, stat: os.stat_result, sections: List[Dict[str, Any]]) -> bool:
+        """
+        추출 결과를 색인에 반영합니다.
+
+        Args:
+            file_path: 파일 경로
+            stat: 추출 전에 조회한 파일의 stat 결과
+            sections: extract_fn 결과 섹션 목록
+
+        Returns:
+            색인에 반영되었으면 True, 추출에 실패했으면 False
+        """
+        handler = self.handler_registry.get_handler_for_file(file_path)
+        if handler is None:
+            return False
+
+        if any(section.get("section_type") == "error" for section in sections):
+            # 추출 실패한 파일은 색인하지 않고 다음 갱신 때 다시 시도
+            self.index.remove_document(file_path)
+            return False
+
+        self.index.add_document(file_path, handler.get_type_description(), sections, stat, handler.get_version())
+        return True
+
+    def refresh(self, root: Path, files: Iterable[Path],
+                progress_callback: Optional[Callable[[int], None]] = None,
+                executor: Optional[Executor] = None, max_pending: Optional[int] = None) -> Dict[str, int]:
+        """
+        디렉토리의 파일 목록을 매니페스트와 비교하여 색인을 증분 갱신합니다.
+
+        Args:
+            root: 갱신할 디렉토리 (이 디렉토리 아래에서 사라진 파일은 툼스톤으로 표시)
+            files: 디렉토리에서 찾은 파일 목록 (find_files 결과)
+            progress_callback: 파일을 하나 확인할 때마다 확인한 파일 수로 호출되는 함수
+            executor: 지정하면 변경된 파일의 추출을 이 실행기에서 병렬로 실행 (extract_fn은 pickle 가능해야 함)
+            max_pending: 실행기에 미리 제출해 둘 최대 파일 수 (기본값: CPU 수 x SUBMIT_WINDOW_PER_WORKER)
+
+        Returns:
+            갱신 통계 (added, updated, unchanged, deleted, failed, deduplicated, extracted_bytes)
+
+        Raises:
+            OSError: files가 목록을 끝까지 주지 못한 경우 (찾은 파일은 갱신하지만 사라진 파일은 삭제하지 않음)
+        """
+        start_time = time.time()
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "deleted": 0, "failed": 0, "deduplicated": 0, "extracted_bytes": 0}
+        seen = set()
+        changed: List[Tuple[Path, os.stat_result, bool]] = []
+        walk_error: Optional[OSError] = None
+
+        try:
+            for checked, file_path in enumerate(files, start=1):
+                seen.add(str(file_path))
+                try:
+                    stat = file_path.stat()
+                    if self.is_unchanged(file_path, stat):
+                        stats["unchanged"] += 1
+                    else:
+                        changed.append((file_path, stat, self.index.get_state(file_path) is None))
+                except Exception as e:
+                    logger.error(f"Error indexing {file_path}: {e}")
+                    stats["failed"] += 1
+
+                if progress_callback:
+                    progress_callback(checked)
+        except OSError as e:
+            # 연결이 끊긴 공유 폴더나 권한 오류로 목록이 불완전하면 목록에 없는 파일을 삭제된 것으로 볼 수 없음
+            logger.error(f"Listing {root} failed, keeping files that were not seen: {e}")
+            walk_error = e
+
+        # 내용이 같은 파일은 대표 파일 하나만 추출
+        unique, duplicates = group_duplicates(changed, key=lambda item: (item[0], item[1]), max_bytes=self.dedup_max_bytes)
+        positions = {id(item): position for position, item in enumerate(unique)}
+
+        for item, sections in self._extract_all(unique, executor, max_pending):
+            if sections is not None:
+                stats["extracted_bytes"] += item[1].st_size
+            same_content = duplicates.get(positions[id(item)], [])
+            stats["deduplicated"] += len(same_content)
+            for file_path, stat, is_new in [item] + same_content:
+                try:
+                    if sections is not None and self.apply_extraction(file_path, stat, sections):
+                        stats["added" if is_new else "updated"] += 1
+                    else:
+                        stats["failed"] += 1
+                except Exception as e:
+                    logger.error(f"Error indexing {file_path}: {e}")
+                    stats["failed"] += 1
+
+        # 이번 목록에 없는 파일은 삭제된 것으로 보고 툼스톤 처리
+        if walk_error is None:
+            for path_key in self.index.paths_under(root):
+                if path_key not in seen:
+                    self.index.remove_document(Path(path_key))
+                    stats["deleted"] += 1
+
+        total = len(self.index) + self.index.tombstone_count()
+        if total and self.index.tombstone_count() / total >= COMPACT_TOMBSTONE_RATIO:
+            compacted = self.index.compact()
+            logger.info(f"Compacted {compacted} tombstoned documents")
+
+        self.index.save()
+
+        logger.info(f"Refreshed index for {root} in {time.time() - start_time:.2f} seconds: {stats}")
+        if walk_error is not None:
+            raise walk_error
+        return stats
+
+    def _extract_all(self, changed: List[Tuple[Path, os.stat_result, bool]],
+                     executor: Optional[Executor], max_pending: Optional[int]) -> Iterator[Tuple[Tuple[Path, os.stat_result, bool], Optional[List[Dict[str, Any]]]]]:
+        """
+        변경된 파일을 추출합니다. 실행기를 사용하면 max_pending개까지만 미리 제출하여
+        대기 중인 추출 결과가 메모리에 쌓이지 않도록 합니다. 추출 자체가 실패하거나 시간 제한을 넘은 파일의 결과는 None입니다.
+        """
+        if executor is None:
+            for item in changed:
+                try:
+                    yield item, self.extract_fn(item[0])
+                except Exception as e:
+                    logger.error(f"Error extracting {item[0]}: {e}")
+                    yield item, None
+            return
+
+        window = max_pending or (os.cpu_count() or 1) * SUBMIT_WINDOW_PER_WORKER
+        pending = {}
+        items = iter(changed)
+        # 작업자 프로세스 풀은 시간 제한을 넘은 작업자를 종료하므로 파일 하나가 갱신 전체를 멈추지 않음
+        with_timeout = self.extract_timeout is not None and hasattr(executor, "submit_with_timeout")
+        while True:
+            for item in items:
+                if with_timeout:
+                    future = executor.submit_with_timeout(self.extract_timeout, self.extract_fn, item[0])
+                else:
+                    future = executor.submit(self.extract_fn, item[0])
+                pending[future] = item
+                if len(pending) >= window:
+                    break
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                try:
+                    yield item, future.result()
+                except ExtractionTimeoutError:
+                    logger.warning(f"Extraction of {item[0]} timed out after {self.extract_timeout:g} seconds")
+                    yield item, None
+                except Exception as e:
+                    logger.error(f"Error extracting {item[0]}: {e}")
+                    yield item, None
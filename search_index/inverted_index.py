@@ -0,0 +1,441 @@
+"""
+디스크 기반 역색인
+
+이 모듈은 FileHandler.extract_text 결과를 색인어 → (파일, 섹션, 등장 위치 목록) 형태의
+역색인으로 저장하고 조회하는 기능을 제공합니다. 검색 시에는 모든 키워드 색인어를 포함하는
+후보 섹션만 반환합니다. 여러 단어로 된 키워드는 위치 목록을 비교하여 키워드 순서대로
+연속해서 등장하는 섹션만 후보로 남깁니다. 부분 문자열 검색을 위해 섹션별 문자 트라이그램 색인도 함께 유지합니다.
+
+색인은 압축된 포스팅과 정렬된 사전으로 이루어진 변경 불가능한 세그먼트들로 저장되며 mmap으로 열기 때문에
+시작할 때 전체 색인을 메모리로 읽어들이지 않습니다. 새로 색인되거나 변경된 파일은 메모리 세그먼트에 모아 두었다가
+save()에서 작은 새 세그먼트로 기록하고, 세그먼트 목록을 담은 CURRENT 파일을 원자적으로 교체하여 반영합니다.
+검색은 모든 세그먼트를 확인하며, 세그먼트가 많아지면 병합 정책에 따라 백그라운드에서 병합합니다.
+
+각 파일의 (크기, st_mtime_ns, inode, 핸들러 버전)을 함께 저장하여 변경 여부를 판단합니다.
+삭제되거나 더 새로운 세그먼트로 교체된 파일은 세그먼트별 툼스톤으로 표시하고, 병합 또는 compact()에서 정리합니다.
+"""
+
+import os
+import json
+import shutil
+import logging
+import tempfile
+import functools
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from search_index.base import IndexBackend
+from search_index.merger import DEFAULT_MERGE_FACTOR, TieredMergePolicy, SegmentMerger
+from search_index.segment import INODE_MASK, MemorySegment, SegmentReader, write_segment, find_candidates
+
+logger = logging.getLogger("file_search.index")
+
+INDEX_FORMAT_VERSION = 6
+
+SEGMENT_PREFIX = "seg_"
+
+# 메모리 세그먼트의 텍스트가 이 크기를 넘으면 save()를 기다리지 않고 세그먼트로 기록
+MAX_BUFFER_BYTES = 16 * 1024 * 1024
+
+def synchronized(method):
+    """색인 잠금을 잡은 상태에서 메서드를 실행하는 데코레이터"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+class InvertedIndex(IndexBackend):
+    """mmap 세그먼트로 저장되는 자체 역색인"""
+
+    def __init__(self, index_dir: Path, merge_factor: int = DEFAULT_MERGE_FACTOR):
+        """
+        Args:
+            index_dir: 색인 세그먼트를 저장할 디렉토리
+            merge_factor: 한 번에 병합할 비슷한 크기의 세그먼트 수
+        """
+        self.index_dir = Path(index_dir)
+        self.current_file = self.index_dir / "CURRENT"
+        # 세그먼트 이름 -> 디스크 세그먼트 (오래된 것부터)
+        self.segments: Dict[str, SegmentReader] = {}
+        # 세그먼트 이름 -> 해당 세그먼트에서 더 이상 유효하지 않은 경로 (툼스톤 또는 새 버전으로 교체된 파일)
+        self.segment_deleted: Dict[str, Set[str]] = {}
+        # 아직 기록되지 않은 문서
+        self.buffer = MemorySegment()
+        self.next_segment_number = 1
+        self.dirty = False
+        # 검색 서버와 파일 감시 스레드, 병합 스레드가 동시에 접근하므로 잠금으로 보호
+        self.lock = threading.RLock()
+        # 한 번에 하나의 병합만 실행
+        self.merge_lock = threading.Lock()
+        self.merger = SegmentMerger(self, TieredMergePolicy(merge_factor))
+
+    @synchronized
+    def load(self) -> None:
+        """디스크에서 색인 세그먼트를 엽니다. 세그먼트가 없거나 형식이 다르면 빈 색인으로 시작합니다."""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        legacy_file = self.index_dir / "index.json"
+        if legacy_file.exists():
+            logger.warning(f"Removing legacy index file {legacy_file}, files will be reindexed")
+            legacy_file.unlink()
+
+        if self.current_file.exists():
+            try:
+                with open(self.current_file, 'r', encoding='utf-8') as f:
+                    current = json.load(f)
+
+                if current.get("version") != INDEX_FORMAT_VERSION:
+                    logger.warning(f"Index format version mismatch in {self.current_file}, starting with an empty index")
+                else:
+                    for name, deleted in current["segments"].items():
+                        self.segments[name] = SegmentReader(self.index_dir / name)
+                        self.segment_deleted[name] = set(deleted)
+                    logger.info(f"Loaded index with {len(self)} documents in {len(self.segments)} segments from {self.index_dir}")
+            except Exception as e:
+                logger.error(f"Error loading index from {self.index_dir}: {e}")
+                self._close_segments()
+
+        numbers = [int(entry.name[len(SEGMENT_PREFIX):]) for entry in self.index_dir.iterdir()
+                   if entry.name.startswith(SEGMENT_PREFIX) and entry.name[len(SEGMENT_PREFIX):].isdigit()]
+        self.next_segment_number = max(numbers, default=0) + 1
+        self._remove_unused_segments()
+        self.merger.request()
+
+    def close(self) -> None:
+        """병합 스레드를 멈추고 기록되지 않은 문서를 저장한 뒤 세그먼트를 닫습니다."""
+        self.merger.stop()
+        with self.lock:
+            self.save()
+            self._close_segments()
+
+    def _close_segments(self) -> None:
+        for segment in self.segments.values():
+            segment.close()
+        self.segments = {}
+        self.segment_deleted = {}
+
+    def save(self) -> None:
+        """메모리 세그먼트를 새 세그먼트로 기록하고 세그먼트 목록을 원자적으로 교체합니다."""
+        with self.lock:
+            if not self.dirty:
+                return
+
+            if len(self.buffer):
+                name = self._allocate_segment_name()
+                segment_dir = self.index_dir / name
+                try:
+                    write_segment(segment_dir, [(self.buffer, lambda path_key: True)])
+                    self.segments[name] = SegmentReader(segment_dir)
+                    self.segment_deleted[name] = set()
+                except Exception:
+                    shutil.rmtree(segment_dir, ignore_errors=True)
+                    raise
+                logger.info(f"Flushed {len(self.buffer)} documents to {segment_dir}")
+                self.buffer = MemorySegment()
+
+            self._write_current()
+            self.dirty = False
+        self.merger.request()
+
+    def _write_current(self) -> None:
+        """CURRENT 파일을 원자적으로 교체하여 세그먼트 목록과 툼스톤을 반영합니다."""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        current = {
+            "version": INDEX_FORMAT_VERSION,
+            "segments": {name: sorted(self.segment_deleted[name]) for name in self.segments}
+        }
+
+        # 임시 파일에 먼저 기록한 뒤 교체하여 저장 중 중단되어도 기존 색인이 유지되도록 함
+        fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, prefix="CURRENT.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(current, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.current_file)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @synchronized
+    def _allocate_segment_name(self) -> str:
+        name = f"{SEGMENT_PREFIX}{self.next_segment_number:06d}"
+        self.next_segment_number += 1
+        return name
+
+    def _remove_unused_segments(self) -> None:
+        """세그먼트 목록에 없는 세그먼트 디렉토리를 삭제합니다. (다른 프로세스가 사용 중이면 다음 기회에 삭제)"""
+        for entry in self.index_dir.iterdir():
+            if entry.name.startswith(SEGMENT_PREFIX) and entry.name not in self.segments and entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+
+    @synchronized
+    def segment_stats(self) -> List[Tuple[str, int, int]]:
+        """
+        병합 정책에 전달할 세그먼트 정보를 반환합니다.
+
+        Returns:
+            (세그먼트 이름, 문서 수, 삭제된 문서 수) 목록
+        """
+        return [(name, len(segment), len(self.segment_deleted[name])) for name, segment in self.segments.items()]
+
+    def merge_segments(self, names: List[str]) -> int:
+        """
+        세그먼트들의 유효한 문서를 하나의 새 세그먼트로 병합합니다.
+        새 세그먼트를 기록하는 동안에는 색인 잠금을 잡지 않으므로 검색과 색인 갱신이 멈추지 않습니다.
+
+        Args:
+            names: 병합할 세그먼트 이름 목록
+
+        Returns:
+            정리된 (삭제되었거나 교체된) 문서 수
+        """
+        with self.merge_lock:
+            with self.lock:
+                names = [name for name in names if name in self.segments]
+                if not names:
+                    return 0
+                readers = {name: self.segments[name] for name in names}
+                snapshot = {name: set(self.segment_deleted[name]) for name in names}
+                live_count = sum(len(readers[name]) - len(snapshot[name]) for name in names)
+                new_name = self._allocate_segment_name() if live_count else None
+
+            new_segment = None
+            if new_name is not None:
+                segment_dir = self.index_dir / new_name
+                sources = [
+                    (reader, lambda doc_id, reader=reader, deleted=snapshot[name]: reader.get_path(doc_id) not in deleted)
+                    for name, reader in readers.items()
+                ]
+                try:
+                    write_segment(segment_dir, sources)
+                    new_segment = SegmentReader(segment_dir)
+                except Exception:
+                    shutil.rmtree(segment_dir, ignore_errors=True)
+                    raise
+
+            with self.lock:
+                # 병합하는 동안 삭제되거나 교체된 문서는 새 세그먼트의 툼스톤으로 옮김
+                new_deleted = set()
+                for name in names:
+                    new_deleted |= self.segment_deleted.pop(name) - snapshot[name]
+                    self.segments.pop(name).close()
+                if new_segment is not None:
+                    self.segments[new_name] = new_segment
+                    self.segment_deleted[new_name] = new_deleted
+                self._write_current()
+                self._remove_unused_segments()
+
+        purged = sum(len(deleted) for deleted in snapshot.values())
+        logger.info(f"Merged {len(names)} segments into {new_name} ({live_count} documents, {purged} purged)")
+        return purged
+
+    def _find_live(self, path_key: str) -> Optional[Tuple[str, int]]:
+        """경로의 유효한 문서가 있는 디스크 세그먼트와 문서 번호를 찾습니다."""
+        for name in reversed(list(self.segments)):
+            if path_key in self.segment_deleted[name]:
+                continue
+            doc_id = self.segments[name].find_doc(path_key)
+            if doc_id is not None:
+                return name, doc_id
+        return None
+
+    @synchronized
+    def is_current(self, file_path: Path, stat: Optional[os.stat_result] = None, handler_version: int = 1) -> bool:
+        """
+        파일이 색인되어 있고 색인 이후 변경되지 않았는지 확인합니다.
+
+        Args:
+            file_path: 확인할 파일 경로
+            stat: 파일의 stat 결과 (지정하지 않으면 직접 조회)
+            handler_version: 현재 파일 핸들러의 버전
+
+        Returns:
+            색인이 최신인지 여부
+        """
+        state = self.get_state(file_path)
+        if state is None:
+            return False
+
+        try:
+            if stat is None:
+                stat = file_path.stat()
+        except OSError:
+            return False
+
+        return (state["size"] == stat.st_size
+                and state["mtime_ns"] == stat.st_mtime_ns
+                and state["inode"] == stat.st_ino & INODE_MASK
+                and state["handler_version"] == handler_version)
+
+    @synchronized
+    def add_document(self, file_path: Path, file_type: str, sections: List[Dict[str, Any]],
+                     stat: Optional[os.stat_result] = None, handler_version: int = 1) -> None:
+        """
+        파일의 섹션을 색인에 추가합니다. 이미 색인된 파일이면 기존 내용을 교체합니다.
+
+        Args:
+            file_path: 파일 경로
+            file_type: 파일 형식 설명
+            sections: extract_text 결과 섹션 목록
+            stat: 파일의 stat 결과 (지정하지 않으면 직접 조회)
+            handler_version: 내용을 추출한 파일 핸들러의 버전
+        """
+        path_key = str(file_path)
+        if stat is None:
+            stat = file_path.stat()
+
+        location = self._find_live(path_key)
+        if location is not None:
+            self.segment_deleted[location[0]].add(path_key)
+
+        self.buffer.add_document(path_key, file_type, sections, {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "inode": stat.st_ino & INODE_MASK,
+            "handler_version": handler_version
+        })
+        self.dirty = True
+
+        # 한꺼번에 많은 파일이 바뀌어도 메모리 세그먼트가 계속 커지지 않도록 작은 세그먼트로 기록
+        if self.buffer.text_bytes >= MAX_BUFFER_BYTES:
+            self.save()
+
+    @synchronized
+    def remove_document(self, file_path: Path) -> None:
+        """
+        파일을 툼스톤으로 표시하여 검색 결과에서 제외합니다.
+        디스크 세그먼트의 포스팅은 세그먼트를 병합하거나 compact()를 호출할 때 정리됩니다.
+
+        Args:
+            file_path: 제거할 파일 경로
+        """
+        path_key = str(file_path)
+        if self.buffer.remove_document(path_key):
+            self.dirty = True
+        location = self._find_live(path_key)
+        if location is not None:
+            self.segment_deleted[location[0]].add(path_key)
+            self.dirty = True
+
+    def compact(self) -> int:
+        """
+        기록되지 않은 문서를 저장하고, 툼스톤이 있는 세그먼트를 하나로 병합하여 정리합니다.
+
+        Returns:
+            정리된 파일 수
+        """
+        self.save()
+        with self.lock:
+            names = [name for name, deleted in self.segment_deleted.items() if deleted]
+        if not names:
+            return 0
+        return self.merge_segments(names)
+
+    @synchronized
+    def tombstone_count(self) -> int:
+        """툼스톤으로 표시된 (삭제되었거나 새 버전으로 교체된) 문서 수를 반환합니다."""
+        return sum(len(deleted) for deleted in self.segment_deleted.values())
+
+    @synchronized
+    def get_state(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        색인된 파일의 매니페스트 정보(크기, 수정 시각, inode, 핸들러 버전)를 반환합니다.
+
+        Args:
+            file_path: 파일 경로
+
+        Returns:
+            매니페스트 정보 (색인되지 않았거나 삭제된 파일이면 None)
+        """
+        path_key = str(file_path)
+        if path_key in self.buffer:
+            return self.buffer.get_state(path_key)
+        location = self._find_live(path_key)
+        if location is None:
+            return None
+        return self.segments[location[0]].get_state(location[1])
+
+    @synchronized
+    def paths_under(self, root: Path) -> List[str]:
+        """
+        지정된 디렉토리 아래에 색인된 (삭제되지 않은) 파일 경로 목록을 반환합니다.
+
+        Args:
+            root: 기준 디렉토리
+
+        Returns:
+            파일 경로 목록
+        """
+        prefix = os.path.join(str(root), "")
+        paths = self.buffer.paths_with_prefix(prefix)
+        for name, segment in self.segments.items():
+            deleted = self.segment_deleted[name]
+            # 세그먼트의 문서는 경로 순으로 정렬되어 있으므로 접두사 범위만 읽음
+            for doc_id in segment.doc_ids_with_prefix(prefix):
+                path_key = segment.get_path(doc_id)
+                if path_key not in deleted:
+                    paths.append(path_key)
+        return paths
+
+    @synchronized
+    def get_sections(self, file_path: Path) -> List[Dict[str, Any]]:
+        """
+        색인에 저장된 파일의 전체 섹션을 반환합니다.
+
+        Args:
+            file_path: 파일 경로
+
+        Returns:
+            섹션 목록 (색인되지 않은 파일이면 빈 목록)
+        """
+        path_key = str(file_path)
+        if path_key in self.buffer:
+            return self.buffer.get_sections(path_key)
+        location = self._find_live(path_key)
+        if location is None:
+            return []
+        return self.segments[location[0]].get_sections(location[1])
+
+    @synchronized
+    def search(self, keywords: str, match_mode: str = "word",
+               directory: Optional[Path] = None) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        키워드와 매칭될 수 있는 후보 섹션을 모든 세그먼트에서 찾습니다.
+        단어 매칭은 키워드의 모든 색인어를, 부분 문자열 매칭은 키워드의 모든 트라이그램을 포함하는 섹션을 찾습니다.
+        후보 섹션의 텍스트만 세그먼트에서 읽습니다.
+
+        Args:
+            keywords: 검색 키워드
+            match_mode: "word"이면 단어 단위 매칭, "substring"이면 부분 문자열 매칭
+            directory: 지정하면 이 디렉토리 아래의 파일만 찾음
+
+        Returns:
+            경로별 후보 섹션 목록. 색인으로 답할 수 없는 키워드이면 None
+        """
+        buffer_candidates = find_candidates(self.buffer, keywords, match_mode)
+        if buffer_candidates is None:
+            return None
+
+        prefix = os.path.join(str(directory), "") if directory is not None else ""
+        results = {}
+        for path_key, section_indices in buffer_candidates.items():
+            if path_key.startswith(prefix):
+                results[path_key] = self.buffer.get_sections(path_key, section_indices)
+
+        # 경로마다 유효한 문서는 하나뿐이므로 세그먼트별 결과를 그대로 합침
+        for name, segment in self.segments.items():
+            deleted = self.segment_deleted[name]
+            for doc_id, section_indices in find_candidates(segment, keywords, match_mode).items():
+                path_key = segment.get_path(doc_id)
+                if path_key not in deleted and path_key.startswith(prefix):
+                    results[path_key] = segment.get_sections(doc_id, section_indices)
+        return results
+
+    @synchronized
+    def __len__(self) -> int:
+        segment_count = sum(len(segment) - len(self.segment_deleted[name]) for name, segment in self.segments.items())
+        return segment_count + len(self.buffer)
@@ -0,0 +1,121 @@
+"""
+세그먼트 병합
+
+이 모듈은 자체 역색인의 작은 세그먼트들을 백그라운드에서 병합하는 기능을 제공합니다.
+새로 색인된 파일은 작은 세그먼트로 기록되므로 색인 갱신은 빠르지만, 세그먼트가 많아지면
+검색할 때 확인할 세그먼트도 늘어납니다. 병합 정책이 비슷한 크기의 세그먼트가 충분히 모였을 때
+이들을 하나로 합치고, 삭제된 문서가 많은 세그먼트는 다시 기록하여 공간을 회수합니다.
+"""
+
+import logging
+import threading
+from typing import List, Tuple, Optional
+
+logger = logging.getLogger("file_search.merger")
+
+DEFAULT_MERGE_FACTOR = 10
+DEFAULT_DELETED_RATIO = 0.5
+
+class TieredMergePolicy:
+    """비슷한 크기(단계)의 세그먼트가 merge_factor개 모이면 병합하는 정책"""
+
+    def __init__(self, merge_factor: int = DEFAULT_MERGE_FACTOR, deleted_ratio: float = DEFAULT_DELETED_RATIO):
+        """
+        Args:
+            merge_factor: 한 번에 병합할 세그먼트 수이자 단계 사이의 크기 배율
+            deleted_ratio: 이 비율 이상의 문서가 삭제된 세그먼트는 단독으로 다시 기록
+        """
+        if merge_factor < 2:
+            raise ValueError(f"merge_factor는 2 이상이어야 합니다: {merge_factor}")
+        self.merge_factor = merge_factor
+        self.deleted_ratio = deleted_ratio
+
+    def tier(self, live_count: int) -> int:
+        """세그먼트 크기 단계를 계산합니다. (문서 수의 merge_factor 로그)"""
+        tier = 0
+        size = max(live_count, 1)
+        while size >= self.merge_factor:
+            size //= self.merge_factor
+            tier += 1
+        return tier
+
+    def select(self, segments: List[Tuple[str, int, int]]) -> Optional[List[str]]:
+        """
+        병합할 세그먼트를 선택합니다.
+
+        Args:
+            segments: (세그먼트 이름, 문서 수, 삭제된 문서 수) 목록
+
+        Returns:
+            병합할 세그먼트 이름 목록 (병합할 필요가 없으면 None)
+        """
+        tiers = {}
+        for name, doc_count, deleted_count in segments:
+            if doc_count and deleted_count / doc_count >= self.deleted_ratio:
+                return [name]
+            live_count = doc_count - deleted_count
+            tiers.setdefault(self.tier(live_count), []).append((live_count, name))
+
+        # 작은 단계부터 병합하여 병합 비용을 작게 유지
+        for tier in sorted(tiers):
+            if len(tiers[tier]) >= self.merge_factor:
+                return [name for _, name in sorted(tiers[tier])[:self.merge_factor]]
+        return None
+
+class SegmentMerger:
+    """병합 요청을 받아 백그라운드 스레드에서 세그먼트를 병합하는 클래스"""
+
+    def __init__(self, index, policy: TieredMergePolicy):
+        """
+        Args:
+            index: segment_stats()와 merge_segments()를 제공하는 색인
+            policy: 병합 정책
+        """
+        self.index = index
+        self.policy = policy
+        self.condition = threading.Condition()
+        self.pending = False
+        self.stopped = False
+        self.thread: Optional[threading.Thread] = None
+
+    def request(self) -> None:
+        """병합이 필요한지 확인하도록 요청합니다. 처음 요청할 때 병합 스레드를 시작합니다."""
+        with self.condition:
+            if self.stopped:
+                return
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="index-merger", daemon=True)
+                self.thread.start()
+            self.pending = True
+            self.condition.notify()
+
+    def stop(self) -> None:
+        """진행 중인 병합이 끝나면 병합 스레드를 종료합니다."""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+            thread = self.thread
+        if thread is not None:
+            thread.join()
+
+    def merge_pending(self) -> None:
+        """병합 정책이 더 이상 선택하는 세그먼트가 없을 때까지 병합합니다."""
+        while not self.stopped:
+            names = self.policy.select(self.index.segment_stats())
+            if not names:
+                return
+            self.index.merge_segments(names)
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                self.pending = False
+
+            try:
+                self.merge_pending()
+            except Exception as e:
+                logger.error(f"Error merging index segments: {e}")
@@ -0,0 +1,165 @@
+"""
+포스팅 목록 압축 형식
+
+이 모듈은 색인어와 트라이그램의 포스팅 목록을 가변 길이 정수(varint)와 차분(delta) 부호화로
+압축하고 복원하는 기능을 제공합니다. 문서 번호, 섹션 순번, 등장 위치는 모두 오름차순이므로
+이전 값과의 차이만 저장하면 대부분 1바이트로 표현됩니다.
+
+색인어 포스팅 형식:
+    문서 수, (문서 번호 차분, 섹션 수, (섹션 순번 차분, 위치 수, 위치 차분...)...)...
+트라이그램 포스팅 형식:
+    문서 수, (문서 번호 차분, 섹션 수, 섹션 순번 차분...)...
+"""
+
+from typing import List, Dict, Tuple, Iterable
+
+TermPostings = Dict[int, List[Tuple[int, List[int]]]]
+GramPostings = Dict[int, List[int]]
+
+def encode_varint(value: int, out: bytearray) -> None:
+    """
+    0 이상의 정수를 LEB128 가변 길이 정수로 부호화하여 추가합니다.
+
+    Args:
+        value: 부호화할 정수
+        out: 부호화 결과를 추가할 버퍼
+    """
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def decode_varint(data, offset: int) -> Tuple[int, int]:
+    """
+    버퍼에서 LEB128 가변 길이 정수를 하나 읽습니다.
+
+    Args:
+        data: 읽을 버퍼 (bytes, memoryview, mmap)
+        offset: 읽기 시작 위치
+
+    Returns:
+        (읽은 정수, 다음 읽기 위치)
+    """
+    result = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, offset
+        shift += 7
+
+def _encode_deltas(values: Iterable[int], out: bytearray) -> None:
+    previous = 0
+    for value in values:
+        encode_varint(value - previous, out)
+        previous = value
+
+def encode_term_postings(postings: TermPostings) -> bytes:
+    """
+    색인어 포스팅 목록을 압축합니다.
+
+    Args:
+        postings: 문서 번호 -> [(섹션 순번, [등장 위치, ...]), ...]
+
+    Returns:
+        압축된 포스팅 블록
+    """
+    out = bytearray()
+    encode_varint(len(postings), out)
+    previous_doc = 0
+    for doc_id in sorted(postings):
+        encode_varint(doc_id - previous_doc, out)
+        previous_doc = doc_id
+        sections = sorted(postings[doc_id])
+        encode_varint(len(sections), out)
+        previous_section = 0
+        for section_idx, positions in sections:
+            encode_varint(section_idx - previous_section, out)
+            previous_section = section_idx
+            encode_varint(len(positions), out)
+            _encode_deltas(positions, out)
+    return bytes(out)
+
+def decode_term_postings(data, offset: int = 0) -> TermPostings:
+    """
+    압축된 색인어 포스팅 블록을 복원합니다.
+
+    Args:
+        data: 포스팅 블록이 들어 있는 버퍼
+        offset: 블록 시작 위치
+
+    Returns:
+        문서 번호 -> [(섹션 순번, [등장 위치, ...]), ...]
+    """
+    postings: TermPostings = {}
+    doc_count, offset = decode_varint(data, offset)
+    doc_id = 0
+    for _ in range(doc_count):
+        delta, offset = decode_varint(data, offset)
+        doc_id += delta
+        section_count, offset = decode_varint(data, offset)
+        sections = []
+        section_idx = 0
+        for _ in range(section_count):
+            delta, offset = decode_varint(data, offset)
+            section_idx += delta
+            position_count, offset = decode_varint(data, offset)
+            positions = []
+            position = 0
+            for _ in range(position_count):
+                delta, offset = decode_varint(data, offset)
+                position += delta
+                positions.append(position)
+            sections.append((section_idx, positions))
+        postings[doc_id] = sections
+    return postings
+
+def encode_gram_postings(postings: GramPostings) -> bytes:
+    """
+    트라이그램 포스팅 목록을 압축합니다.
+
+    Args:
+        postings: 문서 번호 -> [섹션 순번, ...]
+
+    Returns:
+        압축된 포스팅 블록
+    """
+    out = bytearray()
+    encode_varint(len(postings), out)
+    previous_doc = 0
+    for doc_id in sorted(postings):
+        encode_varint(doc_id - previous_doc, out)
+        previous_doc = doc_id
+        sections = sorted(postings[doc_id])
+        encode_varint(len(sections), out)
+        _encode_deltas(sections, out)
+    return bytes(out)
+
+def decode_gram_postings(data, offset: int = 0) -> GramPostings:
+    """
+    압축된 트라이그램 포스팅 블록을 복원합니다.
+
+    Args:
+        data: 포스팅 블록이 들어 있는 버퍼
+        offset: 블록 시작 위치
+
+    Returns:
+        문서 번호 -> [섹션 순번, ...]
+    """
+    postings: GramPostings = {}
+    doc_count, offset = decode_varint(data, offset)
+    doc_id = 0
+    for _ in range(doc_count):
+        delta, offset = decode_varint(data, offset)
+        doc_id += delta
+        section_count, offset = decode_varint(data, offset)
+        sections = []
+        section_idx = 0
+        for _ in range(section_count):
+            delta, offset = decode_varint(data, offset)
+            section_idx += delta
+            sections.append(section_idx)
+        postings[doc_id] = sections
+    return postings
@@ -0,0 +1,602 @@
+"""
+색인 세그먼트
+
+이 모듈은 자체 역색인의 저장 단위인 세그먼트를 제공합니다.
+
+- MemorySegment: 아직 디스크에 기록되지 않은 문서를 담는 메모리 세그먼트
+- SegmentReader: 디스크에 기록된 변경 불가능한 세그먼트를 mmap으로 읽는 리더
+- write_segment: 여러 세그먼트의 살아 있는 문서를 하나의 새 세그먼트로 기록
+
+디스크 세그먼트는 경로 순으로 정렬된 문서 테이블, 섹션 테이블, 텍스트 블록과
+바이트 순으로 정렬된 색인어/트라이그램 사전 및 압축된 포스팅 블록으로 구성됩니다.
+모든 파일은 읽기 전용 mmap으로 열기 때문에 프로세스 메모리 사용량이 색인 크기와 관계없이 일정하고,
+같은 색인을 여는 여러 프로세스가 운영체제 페이지 캐시를 공유합니다.
+사전과 문서 테이블은 고정 길이 레코드이므로 이진 탐색으로 바로 찾을 수 있습니다.
+"""
+
+import os
+import mmap
+import json
+import heapq
+import struct
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator, Callable, Set
+
+from search_index.postings import (
+    encode_term_postings, decode_term_postings,
+    encode_gram_postings, decode_gram_postings
+)
+from search_index.tokenizer import TERM_PATTERN, TRIGRAM_SIZE, tokenize, term_positions, trigrams
+
+SEGMENT_FORMAT_VERSION = 1
+
+# 경로 오프셋, 경로 길이, 크기, 수정 시각(ns), inode, 핸들러 버전, 파일 형식 번호, 첫 섹션 번호, 섹션 수
+DOC_RECORD = struct.Struct("<QIqqQIIII")
+# 텍스트 오프셋, 텍스트 길이, 섹션 번호, 섹션 형식 번호
+SECTION_RECORD = struct.Struct("<QIiI")
+# 키 오프셋, 키 길이, 포스팅 오프셋, 포스팅 길이
+DICT_RECORD = struct.Struct("<QIQI")
+
+INODE_MASK = 0xFFFFFFFFFFFFFFFF
+
+SEGMENT_FILES = ["docs", "paths", "sections", "texts",
+                 "terms.dict", "terms.keys", "terms.post",
+                 "grams.dict", "grams.keys", "grams.post"]
+
+def encode_text(text: str) -> bytes:
+    """경로와 텍스트를 세그먼트에 저장할 바이트로 변환합니다. (디코딩할 수 없는 파일 이름도 보존)"""
+    return text.encode("utf-8", "surrogatepass")
+
+def decode_text(data) -> str:
+    """세그먼트에 저장된 바이트를 문자열로 복원합니다."""
+    return bytes(data).decode("utf-8", "surrogatepass")
+
+class MemorySegment:
+    """아직 디스크에 기록되지 않은 문서를 담는 메모리 세그먼트"""
+
+    def __init__(self):
+        # 경로 -> 파일 정보 및 섹션 목록
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        # 색인어 -> 경로 -> [(섹션 순번, [등장 위치, ...]), ...]
+        self.postings: Dict[str, Dict[str, List[Tuple[int, List[int]]]]] = {}
+        # 트라이그램 -> 경로 -> [섹션 순번, ...]
+        self.grams: Dict[str, Dict[str, List[int]]] = {}
+        # 섹션 텍스트 전체 바이트 수 (메모리 세그먼트를 디스크로 내보낼 시점 판단용)
+        self.text_bytes = 0
+
+    def add_document(self, path_key: str, file_type: str, sections: List[Dict[str, Any]], state: Dict[str, int]) -> None:
+        """
+        문서를 추가합니다. 이미 있는 경로이면 기존 내용을 교체합니다.
+
+        Args:
+            path_key: 파일 경로
+            file_type: 파일 형식 설명
+            sections: extract_text 결과 섹션 목록
+            state: 매니페스트 정보 (size, mtime_ns, inode, handler_version)
+        """
+        self.remove_document(path_key)
+
+        stored_sections = []
+        for section_idx, section in enumerate(sections):
+            text = section.get("text", "")
+            stored_sections.append({
+                "section_number": section.get("section_number", 0),
+                "section_type": section.get("section_type", ""),
+                "text": text
+            })
+            self.text_bytes += len(text)
+
+            for term, positions in term_positions(text).items():
+                self.postings.setdefault(term, {}).setdefault(path_key, []).append((section_idx, positions))
+            for trigram in trigrams(text):
+                self.grams.setdefault(trigram, {}).setdefault(path_key, []).append(section_idx)
+
+        self.documents[path_key] = dict(state, file_type=file_type, sections=stored_sections)
+
+    def remove_document(self, path_key: str) -> bool:
+        """
+        문서와 그 포스팅을 제거합니다.
+
+        Args:
+            path_key: 파일 경로
+
+        Returns:
+            문서가 있어서 제거했으면 True
+        """
+        document = self.documents.pop(path_key, None)
+        if document is None:
+            return False
+
+        for section in document["sections"]:
+            self.text_bytes -= len(section["text"])
+            for term in set(tokenize(section["text"])):
+                self._remove_posting(self.postings, term, path_key)
+            for trigram in trigrams(section["text"]):
+                self._remove_posting(self.grams, trigram, path_key)
+        return True
+
+    @staticmethod
+    def _remove_posting(postings: Dict[str, Dict[str, Any]], key: str, path_key: str) -> None:
+        key_postings = postings.get(key)
+        if key_postings is None:
+            return
+        key_postings.pop(path_key, None)
+        if not key_postings:
+            del postings[key]
+
+    def __contains__(self, path_key: str) -> bool:
+        return path_key in self.documents
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def get_state(self, path_key: str) -> Optional[Dict[str, Any]]:
+        document = self.documents.get(path_key)
+        if document is None:
+            return None
+        return {key: document[key] for key in ("size", "mtime_ns", "inode", "handler_version")}
+
+    def get_sections(self, path_key: str, section_indices: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        sections = self.documents[path_key]["sections"]
+        if section_indices is None:
+            return list(sections)
+        return [sections[i] for i in sorted(section_indices)]
+
+    def paths_with_prefix(self, prefix: str) -> List[str]:
+        return [path_key for path_key in self.documents if path_key.startswith(prefix)]
+
+    # 검색 인터페이스 (find_candidates에서 사용)
+
+    def term_postings(self, term: str) -> Dict[str, List[Tuple[int, List[int]]]]:
+        return self.postings.get(term, {})
+
+    def gram_postings(self, gram: str) -> Dict[str, List[int]]:
+        return self.grams.get(gram, {})
+
+    def iter_term_keys(self) -> Iterable[str]:
+        return self.postings.keys()
+
+    # 병합 인터페이스 (write_segment에서 사용)
+
+    def iter_documents(self) -> Iterator[Tuple[str, str]]:
+        for path_key in self.documents:
+            yield path_key, path_key
+
+    def get_document(self, path_key: str) -> Tuple[str, Dict[str, Any], List[Dict[str, Any]]]:
+        document = self.documents[path_key]
+        state = {key: document[key] for key in ("size", "mtime_ns", "inode", "handler_version", "file_type")}
+        return path_key, state, document["sections"]
+
+    def iter_term_postings(self) -> Iterator[Tuple[bytes, Dict[str, List[Tuple[int, List[int]]]]]]:
+        for key in sorted(self.postings, key=encode_text):
+            yield encode_text(key), self.postings[key]
+
+    def iter_gram_postings(self) -> Iterator[Tuple[bytes, Dict[str, List[int]]]]:
+        for key in sorted(self.grams, key=encode_text):
+            yield encode_text(key), self.grams[key]
+
+class SegmentReader:
+    """디스크에 기록된 세그먼트를 읽기 전용 mmap으로 읽는 리더"""
+
+    def __init__(self, segment_dir: Path):
+        """
+        Args:
+            segment_dir: 세그먼트 디렉토리
+        """
+        self.segment_dir = Path(segment_dir)
+        with open(self.segment_dir / "meta.json", 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != SEGMENT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported segment format version in {self.segment_dir}")
+
+        self.doc_count: int = self.meta["doc_count"]
+        self.file_types: List[str] = self.meta["file_types"]
+        self.section_types: List[str] = self.meta["section_types"]
+        self.files = []
+        self.maps: Dict[str, Any] = {}
+        for name in SEGMENT_FILES:
+            self.maps[name] = self._map(self.segment_dir / name)
+
+    def _map(self, file_path: Path):
+        if file_path.stat().st_size == 0:
+            return b""
+        f = open(file_path, 'rb')
+        self.files.append(f)
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        """mmap과 파일을 닫습니다."""
+        for data in self.maps.values():
+            if isinstance(data, mmap.mmap):
+                data.close()
+        for f in self.files:
+            f.close()
+        self.maps = {}
+        self.files = []
+
+    def __len__(self) -> int:
+        return self.doc_count
+
+    # 문서 테이블
+
+    def _doc_record(self, doc_id: int) -> tuple:
+        return DOC_RECORD.unpack_from(self.maps["docs"], doc_id * DOC_RECORD.size)
+
+    def _path_bytes(self, record: tuple) -> bytes:
+        return self.maps["paths"][record[0]:record[0] + record[1]]
+
+    def get_path(self, doc_id: int) -> str:
+        return decode_text(self._path_bytes(self._doc_record(doc_id)))
+
+    def _bisect_path(self, path_bytes: bytes) -> int:
+        """경로 바이트보다 작지 않은 첫 문서 번호를 이진 탐색으로 찾습니다."""
+        low, high = 0, self.doc_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._path_bytes(self._doc_record(middle)) < path_bytes:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find_doc(self, path_key: str) -> Optional[int]:
+        """
+        경로에 해당하는 문서 번호를 찾습니다.
+
+        Args:
+            path_key: 파일 경로
+
+        Returns:
+            문서 번호 (없으면 None)
+        """
+        path_bytes = encode_text(path_key)
+        doc_id = self._bisect_path(path_bytes)
+        if doc_id < self.doc_count and self._path_bytes(self._doc_record(doc_id)) == path_bytes:
+            return doc_id
+        return None
+
+    def doc_ids_with_prefix(self, prefix: str) -> range:
+        """
+        경로가 접두사로 시작하는 문서 번호 범위를 찾습니다.
+
+        Args:
+            prefix: 경로 접두사
+
+        Returns:
+            문서 번호 범위
+        """
+        prefix_bytes = encode_text(prefix)
+        start = self._bisect_path(prefix_bytes)
+        end = start
+        # 접두사로 시작하는 경로는 정렬 순서상 연속되어 있으므로 상한을 이진 탐색
+        low, high = start, self.doc_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._path_bytes(self._doc_record(middle)).startswith(prefix_bytes):
+                low = middle + 1
+            else:
+                high = middle
+        end = low
+        return range(start, end)
+
+    def get_state(self, doc_id: int) -> Dict[str, Any]:
+        record = self._doc_record(doc_id)
+        return {"size": record[2], "mtime_ns": record[3], "inode": record[4], "handler_version": record[5]}
+
+    def get_sections(self, doc_id: int, section_indices: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """
+        문서의 섹션을 읽습니다. 섹션 순번을 지정하면 해당 섹션의 텍스트만 읽습니다.
+
+        Args:
+            doc_id: 문서 번호
+            section_indices: 읽을 섹션 순번 (지정하지 않으면 전체)
+
+        Returns:
+            섹션 목록
+        """
+        record = self._doc_record(doc_id)
+        first_section, section_count = record[7], record[8]
+        if section_indices is None:
+            section_indices = range(section_count)
+
+        sections = []
+        for section_idx in sorted(section_indices):
+            text_offset, text_len, section_number, section_type_id = SECTION_RECORD.unpack_from(
+                self.maps["sections"], (first_section + section_idx) * SECTION_RECORD.size)
+            sections.append({
+                "section_number": section_number,
+                "section_type": self.section_types[section_type_id],
+                "text": decode_text(self.maps["texts"][text_offset:text_offset + text_len])
+            })
+        return sections
+
+    # 색인어 / 트라이그램 사전
+
+    def _dict_lookup(self, name: str, key_bytes: bytes) -> Optional[Tuple[int, int]]:
+        """정렬된 사전에서 키를 이진 탐색하여 (포스팅 오프셋, 길이)를 반환합니다."""
+        entries = self.maps[f"{name}.dict"]
+        keys = self.maps[f"{name}.keys"]
+        low, high = 0, len(entries) // DICT_RECORD.size
+        while low < high:
+            middle = (low + high) // 2
+            key_offset, key_len, postings_offset, postings_len = DICT_RECORD.unpack_from(entries, middle * DICT_RECORD.size)
+            candidate = keys[key_offset:key_offset + key_len]
+            if candidate < key_bytes:
+                low = middle + 1
+            elif candidate > key_bytes:
+                high = middle
+            else:
+                return postings_offset, postings_len
+        return None
+
+    def _iter_dict(self, name: str) -> Iterator[Tuple[bytes, int]]:
+        entries = self.maps[f"{name}.dict"]
+        keys = self.maps[f"{name}.keys"]
+        for i in range(len(entries) // DICT_RECORD.size):
+            key_offset, key_len, postings_offset, _ = DICT_RECORD.unpack_from(entries, i * DICT_RECORD.size)
+            yield keys[key_offset:key_offset + key_len], postings_offset
+
+    def term_postings(self, term: str) -> Dict[int, List[Tuple[int, List[int]]]]:
+        location = self._dict_lookup("terms", encode_text(term))
+        if location is None:
+            return {}
+        return decode_term_postings(self.maps["terms.post"], location[0])
+
+    def gram_postings(self, gram: str) -> Dict[int, List[int]]:
+        location = self._dict_lookup("grams", encode_text(gram))
+        if location is None:
+            return {}
+        return decode_gram_postings(self.maps["grams.post"], location[0])
+
+    def iter_term_keys(self) -> Iterator[str]:
+        for key_bytes, _ in self._iter_dict("terms"):
+            yield decode_text(key_bytes)
+
+    # 병합 인터페이스 (write_segment에서 사용)
+
+    def iter_documents(self) -> Iterator[Tuple[int, str]]:
+        for doc_id in range(self.doc_count):
+            yield doc_id, self.get_path(doc_id)
+
+    def get_document(self, doc_id: int) -> Tuple[str, Dict[str, Any], List[Dict[str, Any]]]:
+        record = self._doc_record(doc_id)
+        state = self.get_state(doc_id)
+        state["file_type"] = self.file_types[record[6]]
+        return decode_text(self._path_bytes(record)), state, self.get_sections(doc_id)
+
+    def iter_term_postings(self) -> Iterator[Tuple[bytes, Dict[int, List[Tuple[int, List[int]]]]]]:
+        data = self.maps["terms.post"]
+        for key_bytes, postings_offset in self._iter_dict("terms"):
+            yield key_bytes, decode_term_postings(data, postings_offset)
+
+    def iter_gram_postings(self) -> Iterator[Tuple[bytes, Dict[int, List[int]]]]:
+        data = self.maps["grams.post"]
+        for key_bytes, postings_offset in self._iter_dict("grams"):
+            yield key_bytes, decode_gram_postings(data, postings_offset)
+
+def _merge_postings(sources: List[Tuple[Iterator[Tuple[bytes, Dict[Any, Any]]], Dict[Any, int]]]) -> Iterator[Tuple[bytes, Dict[int, Any]]]:
+    """
+    키 순으로 정렬된 여러 포스팅 목록을 합치면서 문서 번호를 새 세그먼트의 번호로 바꿉니다.
+    새 번호가 없는 (삭제되었거나 대체된) 문서는 제외됩니다.
+    """
+    def tag(src_idx, iterator):
+        for key, postings in iterator:
+            yield key, src_idx, postings
+
+    tagged = [tag(src_idx, iterator) for src_idx, (iterator, _) in enumerate(sources)]
+
+    current_key = None
+    combined: Dict[int, Any] = {}
+    for key, src_idx, postings in heapq.merge(*tagged, key=lambda item: item[0]):
+        if key != current_key:
+            if combined:
+                yield current_key, combined
+            current_key = key
+            combined = {}
+        id_map = sources[src_idx][1]
+        for doc_key, value in postings.items():
+            new_id = id_map.get(doc_key)
+            if new_id is not None:
+                combined[new_id] = value
+    if combined:
+        yield current_key, combined
+
+def _write_dictionary(segment_dir: Path, name: str, entries: Iterator[Tuple[bytes, Any]],
+                      encode: Callable[[Any], bytes]) -> int:
+    count = 0
+    key_offset = 0
+    postings_offset = 0
+    with open(segment_dir / f"{name}.dict", 'wb') as dict_file, \
+         open(segment_dir / f"{name}.keys", 'wb') as keys_file, \
+         open(segment_dir / f"{name}.post", 'wb') as postings_file:
+        for key, postings in entries:
+            block = encode(postings)
+            dict_file.write(DICT_RECORD.pack(key_offset, len(key), postings_offset, len(block)))
+            keys_file.write(key)
+            postings_file.write(block)
+            key_offset += len(key)
+            postings_offset += len(block)
+            count += 1
+        for f in (dict_file, keys_file, postings_file):
+            f.flush()
+            os.fsync(f.fileno())
+    return count
+
+def write_segment(segment_dir: Path, sources: List[Tuple[Any, Callable[[Any], bool]]]) -> int:
+    """
+    여러 세그먼트의 살아 있는 문서를 합쳐 새 세그먼트를 기록합니다.
+    같은 경로의 문서는 호출자가 is_live 함수로 하나만 남겨야 합니다.
+
+    Args:
+        segment_dir: 기록할 새 세그먼트 디렉토리 (존재하지 않아야 함)
+        sources: (세그먼트, 문서 키가 살아 있는지 확인하는 함수) 목록
+
+    Returns:
+        기록된 문서 수
+    """
+    segment_dir = Path(segment_dir)
+    segment_dir.mkdir(parents=True)
+
+    # 새 세그먼트의 문서 번호는 경로 바이트 순서
+    entries = []
+    for src_idx, (source, is_live) in enumerate(sources):
+        for doc_key, path_key in source.iter_documents():
+            if is_live(doc_key):
+                entries.append((encode_text(path_key), src_idx, doc_key))
+    entries.sort(key=lambda entry: entry[0])
+
+    id_maps: List[Dict[Any, int]] = [{} for _ in sources]
+    for new_id, (_, src_idx, doc_key) in enumerate(entries):
+        id_maps[src_idx][doc_key] = new_id
+
+    file_types: Dict[str, int] = {}
+    section_types: Dict[str, int] = {}
+    path_offset = 0
+    text_offset = 0
+    section_total = 0
+    with open(segment_dir / "docs", 'wb') as docs_file, \
+         open(segment_dir / "paths", 'wb') as paths_file, \
+         open(segment_dir / "sections", 'wb') as sections_file, \
+         open(segment_dir / "texts", 'wb') as texts_file:
+        for path_bytes, src_idx, doc_key in entries:
+            _, state, sections = sources[src_idx][0].get_document(doc_key)
+            file_type_id = file_types.setdefault(state["file_type"], len(file_types))
+
+            docs_file.write(DOC_RECORD.pack(
+                path_offset, len(path_bytes), state["size"], state["mtime_ns"], state["inode"] & INODE_MASK,
+                state["handler_version"], file_type_id, section_total, len(sections)))
+            paths_file.write(path_bytes)
+            path_offset += len(path_bytes)
+
+            for section in sections:
+                text_bytes = encode_text(section["text"])
+                section_type_id = section_types.setdefault(section["section_type"], len(section_types))
+                sections_file.write(SECTION_RECORD.pack(text_offset, len(text_bytes), section["section_number"], section_type_id))
+                texts_file.write(text_bytes)
+                text_offset += len(text_bytes)
+            section_total += len(sections)
+        for f in (docs_file, paths_file, sections_file, texts_file):
+            f.flush()
+            os.fsync(f.fileno())
+
+    term_count = _write_dictionary(
+        segment_dir, "terms",
+        _merge_postings([(source.iter_term_postings(), id_maps[i]) for i, (source, _) in enumerate(sources)]),
+        encode_term_postings)
+    gram_count = _write_dictionary(
+        segment_dir, "grams",
+        _merge_postings([(source.iter_gram_postings(), id_maps[i]) for i, (source, _) in enumerate(sources)]),
+        encode_gram_postings)
+
+    # 메타 정보를 마지막에 기록하여 완성된 세그먼트만 열 수 있도록 함
+    meta = {
+        "version": SEGMENT_FORMAT_VERSION,
+        "doc_count": len(entries),
+        "section_count": section_total,
+        "term_count": term_count,
+        "gram_count": gram_count,
+        "text_bytes": text_offset,
+        "file_types": sorted(file_types, key=file_types.get),
+        "section_types": sorted(section_types, key=section_types.get)
+    }
+    with open(segment_dir / "meta.json", 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    return len(entries)
+
+def find_candidates(segment, keywords: str, match_mode: str = "word") -> Optional[Dict[Any, Set[int]]]:
+    """
+    세그먼트에서 키워드와 매칭될 수 있는 문서별 섹션 순번을 찾습니다.
+    단어 매칭은 키워드의 색인어가 키워드 순서대로 연속해서 등장하는 섹션을,
+    부분 문자열 매칭은 키워드의 모든 트라이그램을 포함하는 섹션을 찾습니다.
+
+    Args:
+        segment: MemorySegment 또는 SegmentReader
+        keywords: 검색 키워드
+        match_mode: "word"이면 단어 단위 매칭, "substring"이면 부분 문자열 매칭
+
+    Returns:
+        문서 키별 후보 섹션 순번. 색인으로 답할 수 없는 키워드이면 None
+    """
+    if match_mode == "substring":
+        return _substring_candidates(segment, keywords)
+    return _word_candidates(segment, keywords)
+
+def _word_candidates(segment, keywords: str) -> Optional[Dict[Any, Set[int]]]:
+    terms = tokenize(keywords)
+    if not terms:
+        return None
+
+    term_postings = {}
+    for term in set(terms):
+        postings = segment.term_postings(term)
+        if not postings:
+            return {}
+        term_postings[term] = postings
+
+    candidates = _intersect([
+        {doc_key: {section_idx for section_idx, _ in entries} for doc_key, entries in postings.items()}
+        for postings in term_postings.values()
+    ])
+    if len(terms) == 1:
+        return candidates
+
+    # 구문 검색: 후보 섹션에서만 위치 목록을 비교
+    for doc_key in list(candidates):
+        section_positions = {
+            term: dict((section_idx, positions) for section_idx, positions in term_postings[term][doc_key])
+            for term in term_postings
+        }
+        candidates[doc_key] = {
+            section_idx for section_idx in candidates[doc_key]
+            if _has_phrase([section_positions[term][section_idx] for term in terms])
+        }
+        if not candidates[doc_key]:
+            del candidates[doc_key]
+    return candidates
+
+def _substring_candidates(segment, keywords: str) -> Optional[Dict[Any, Set[int]]]:
+    query = keywords.lower()
+    if len(query) >= TRIGRAM_SIZE:
+        gram_postings = []
+        for trigram in trigrams(query):
+            postings = segment.gram_postings(trigram)
+            if not postings:
+                return {}
+            gram_postings.append({doc_key: set(section_indices) for doc_key, section_indices in postings.items()})
+        return _intersect(gram_postings)
+
+    # 트라이그램보다 짧은 키워드는 색인어 사전에서 키워드를 포함하는 색인어를 찾아 합집합을 구함
+    if not query or not TERM_PATTERN.fullmatch(query):
+        return None
+    candidates: Dict[Any, Set[int]] = {}
+    for term in segment.iter_term_keys():
+        if query in term:
+            for doc_key, entries in segment.term_postings(term).items():
+                candidates.setdefault(doc_key, set()).update(section_idx for section_idx, _ in entries)
+    return candidates
+
+def _has_phrase(position_lists: List[List[int]]) -> bool:
+    """위치 목록들이 순서대로 연속된 위치를 하나 이상 공유하는지 확인합니다."""
+    starts = set(position_lists[0])
+    for offset, positions in enumerate(position_lists[1:], start=1):
+        starts &= {position - offset for position in positions}
+        if not starts:
+            return False
+    return True
+
+def _intersect(postings_list: List[Dict[Any, Set[int]]]) -> Dict[Any, Set[int]]:
+    """문서별 섹션 순번 집합들의 교집합을 가장 작은 집합부터 계산합니다."""
+    postings_list.sort(key=len)
+    candidates = dict(postings_list[0])
+    for postings in postings_list[1:]:
+        for doc_key in list(candidates):
+            section_indices = postings.get(doc_key)
+            if section_indices is None:
+                del candidates[doc_key]
+                continue
+            candidates[doc_key] = candidates[doc_key] & section_indices
+            if not candidates[doc_key]:
+                del candidates[doc_key]
+    return candidates
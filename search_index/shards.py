@@ -0,0 +1,319 @@
+"""
+검색 디렉토리별 색인 샤드
+
+이 모듈은 SEARCH_DIRS의 각 디렉토리마다 독립된 색인 샤드를 두고, 파일 경로에 따라
+해당 디렉토리의 샤드로 요청을 보내는 색인 저장소를 제공합니다.
+
+- 각 샤드는 INDEX_DIR/shards 아래의 자체 디렉토리에 저장되며, shard.json에 담당 디렉토리와 사용 여부를 기록합니다.
+- 샤드 안의 경로는 담당 디렉토리 기준 상대 경로로 저장되므로, 디렉토리를 옮긴 경우 shard.json의
+  root만 바꾸거나 샤드 디렉토리를 다른 색인 디렉토리로 옮겨도 그대로 사용할 수 있습니다.
+- shard.json의 enabled를 false로 바꾸면 해당 디렉토리는 색인 없이 직접 추출하여 검색합니다.
+- 디렉토리를 지정한 검색은 그 디렉토리를 담당하는 샤드만 확인합니다.
+- 어떤 검색 디렉토리에도 속하지 않는 파일은 절대 경로를 사용하는 기타 샤드에 저장됩니다.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+from search_index.base import IndexBackend
+
+logger = logging.getLogger("file_search.shards")
+
+SHARD_FILE = "shard.json"
+OTHER_SHARD_NAME = "_other"
+
+class IndexShard:
+    """하나의 검색 디렉토리를 담당하는 색인 샤드"""
+
+    def __init__(self, shard_dir: Path, root: Optional[Path], enabled: bool = True):
+        """
+        Args:
+            shard_dir: 샤드 데이터를 저장하는 디렉토리
+            root: 담당 검색 디렉토리 (기타 샤드는 None)
+            enabled: 샤드 사용 여부
+        """
+        self.shard_dir = shard_dir
+        self.root = root
+        self.enabled = enabled
+        self.index: Optional[IndexBackend] = None
+
+    def to_key(self, file_path: Path) -> Path:
+        """
+        파일 경로를 샤드 안의 경로로 바꿉니다.
+        담당 디렉토리를 샤드의 최상위(os.sep)로 하는 경로이므로 디렉토리 접두사 검색이 그대로 동작합니다.
+        """
+        if self.root is None:
+            return file_path
+        relative = os.path.relpath(str(file_path), str(self.root))
+        return Path(os.sep) if relative == os.curdir else Path(os.sep, relative)
+
+    def to_path(self, path_key: str) -> str:
+        """샤드 안의 경로를 실제 파일 경로로 바꿉니다."""
+        if self.root is None:
+            return path_key
+        return os.path.join(str(self.root), path_key[len(os.sep):])
+
+    def write_info(self) -> None:
+        """shard.json에 담당 디렉토리와 사용 여부를 기록합니다."""
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.shard_dir / SHARD_FILE, 'w', encoding='utf-8') as f:
+            json.dump({"root": str(self.root) if self.root is not None else None, "enabled": self.enabled},
+                      f, ensure_ascii=False, indent=2)
+
+class ShardedIndex(IndexBackend):
+    """검색 디렉토리별 샤드로 나누어 저장되는 색인"""
+
+    def __init__(self, index_dir: Path, roots: List[Path], backend_factory: Callable[[Path], IndexBackend]):
+        """
+        Args:
+            index_dir: 색인 디렉토리 (샤드는 index_dir/shards 아래에 저장)
+            roots: 검색 디렉토리 목록 (디렉토리마다 샤드 하나)
+            backend_factory: 샤드 디렉토리를 받아 열리지 않은 색인 저장소를 만드는 함수
+        """
+        self.index_dir = Path(index_dir)
+        self.shards_dir = self.index_dir / "shards"
+        self.roots = list(roots)
+        self.backend_factory = backend_factory
+        self.shards: List[IndexShard] = []
+        self.other: Optional[IndexShard] = None
+        self.lock = threading.RLock()
+
+    def load(self) -> None:
+        """각 검색 디렉토리의 샤드를 찾거나 새로 만들고, 사용 중인 샤드를 엽니다."""
+        self.shards_dir.mkdir(parents=True, exist_ok=True)
+        self._remove_unsharded_index()
+
+        existing: Dict[Optional[str], Tuple[Path, bool]] = {}
+        for shard_dir in self.shards_dir.iterdir():
+            try:
+                with open(shard_dir / SHARD_FILE, 'r', encoding='utf-8') as f:
+                    info = json.load(f)
+                existing[info.get("root")] = (shard_dir, info.get("enabled", True))
+            except (OSError, ValueError):
+                continue
+
+        with self.lock:
+            for root in self.roots:
+                shard_dir, enabled = existing.get(str(root), (self.shards_dir / self._shard_name(root), True))
+                self.shards.append(self._open_shard(shard_dir, root, enabled))
+            shard_dir, enabled = existing.get(None, (self.shards_dir / OTHER_SHARD_NAME, True))
+            self.other = self._open_shard(shard_dir, None, enabled)
+
+        for shard in self.all_shards():
+            logger.info(f"Index shard {shard.shard_dir.name} for {shard.root or '(other files)'}: "
+                        + (f"{len(shard.index)} documents" if shard.enabled else "disabled"))
+
+    def _open_shard(self, shard_dir: Path, root: Optional[Path], enabled: bool) -> IndexShard:
+        shard = IndexShard(shard_dir, root, enabled)
+        shard.write_info()
+        if enabled:
+            shard.index = self.backend_factory(shard_dir)
+            shard.index.load()
+        return shard
+
+    @staticmethod
+    def _shard_name(root: Path) -> str:
+        """디렉토리 이름과 경로 해시로 사람이 알아볼 수 있는 샤드 이름을 만듭니다."""
+        slug = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in root.name) or "root"
+        return f"{slug}-{hashlib.sha1(str(root).encode('utf-8', 'surrogatepass')).hexdigest()[:8]}"
+
+    def _remove_unsharded_index(self) -> None:
+        """샤드를 사용하기 전의 단일 색인 파일을 삭제합니다."""
+        for entry in self.index_dir.iterdir():
+            if entry.name == "CURRENT" or entry.name.startswith(("seg_", "index.sqlite3", "index.json")):
+                logger.warning(f"Removing unsharded index data {entry}, files will be reindexed per shard")
+                if entry.is_dir():
+                    shutil.rmtree(entry, ignore_errors=True)
+                else:
+                    entry.unlink()
+
+    def all_shards(self) -> List[IndexShard]:
+        """기타 샤드를 포함한 모든 샤드를 반환합니다."""
+        return self.shards + ([self.other] if self.other is not None else [])
+
+    def shard_for(self, file_path: Path) -> IndexShard:
+        """
+        파일이 속한 샤드를 찾습니다. 검색 디렉토리가 중첩된 경우 가장 깊은 디렉토리의 샤드를 사용합니다.
+
+        Args:
+            file_path: 파일 또는 디렉토리 경로
+
+        Returns:
+            담당 샤드 (어떤 검색 디렉토리에도 속하지 않으면 기타 샤드)
+        """
+        path_str = str(file_path)
+        best = None
+        for shard in self.shards:
+            root_str = str(shard.root)
+            if path_str == root_str or path_str.startswith(os.path.join(root_str, "")):
+                if best is None or len(root_str) > len(str(best.root)):
+                    best = shard
+        return best if best is not None else self.other
+
+    def shards_for_directory(self, directory: Path) -> List[Tuple[IndexShard, Path]]:
+        """
+        디렉토리 아래의 파일을 담고 있을 수 있는 샤드와 각 샤드 안에서의 디렉토리 경로를 찾습니다.
+
+        Args:
+            directory: 검색할 디렉토리
+
+        Returns:
+            (샤드, 샤드 안의 디렉토리 경로) 목록
+        """
+        covering = self.shard_for(directory)
+        result = [(covering, covering.to_key(directory))]
+        # 디렉토리 안에 다른 검색 디렉토리가 있으면 그 샤드도 확인
+        prefix = os.path.join(str(directory), "")
+        for shard in self.shards:
+            if shard is not covering and str(shard.root).startswith(prefix):
+                result.append((shard, Path(os.sep)))
+        return result
+
+    def is_shard_enabled(self, directory: Path) -> bool:
+        """
+        디렉토리를 담당하는 샤드가 사용 중인지 확인합니다.
+
+        Args:
+            directory: 확인할 디렉토리
+
+        Returns:
+            사용 중이면 True
+        """
+        return self.shard_for(directory).enabled
+
+    def rebuild_shard(self, root: Path) -> bool:
+        """
+        검색 디렉토리 샤드의 모든 파일을 툼스톤으로 표시하고 정리합니다.
+        다음 증분 갱신에서 모든 파일이 다시 색인됩니다.
+
+        Args:
+            root: 검색 디렉토리
+
+        Returns:
+            샤드를 비웠으면 True (검색 디렉토리가 아니거나 사용하지 않는 샤드이면 False)
+        """
+        with self.lock:
+            shard = self.shard_for(root)
+            if shard.root is None or str(shard.root) != str(root) or not shard.enabled:
+                return False
+            for path_key in shard.index.paths_under(Path(os.sep)):
+                shard.index.remove_document(Path(path_key))
+            removed = shard.index.compact()
+            shard.index.save()
+        logger.info(f"Cleared {removed} documents from index shard {shard.shard_dir.name} for {root}")
+        return True
+
+    def shard_info(self) -> List[Dict[str, Any]]:
+        """
+        샤드 목록과 상태를 반환합니다.
+
+        Returns:
+            샤드별 정보 (root, shard, enabled, indexed_files)
+        """
+        return [{
+            "root": str(shard.root) if shard.root is not None else None,
+            "shard": shard.shard_dir.name,
+            "enabled": shard.enabled,
+            "indexed_files": len(shard.index) if shard.enabled else 0
+        } for shard in self.all_shards()]
+
+    def _route(self, file_path: Path) -> Tuple[Optional[IndexBackend], Path]:
+        shard = self.shard_for(file_path)
+        if not shard.enabled:
+            return None, file_path
+        return shard.index, shard.to_key(file_path)
+
+    def save(self) -> None:
+        for shard in self.all_shards():
+            if shard.enabled:
+                shard.index.save()
+
+    def close(self) -> None:
+        for shard in self.all_shards():
+            if shard.enabled:
+                shard.index.close()
+
+    def is_current(self, file_path: Path, stat: Optional[os.stat_result] = None, handler_version: int = 1) -> bool:
+        index, key = self._route(file_path)
+        if index is None:
+            return False
+        # 샤드 안의 경로로는 파일 상태를 조회할 수 없으므로 여기서 조회
+        try:
+            if stat is None:
+                stat = file_path.stat()
+        except OSError:
+            return False
+        return index.is_current(key, stat, handler_version)
+
+    def add_document(self, file_path: Path, file_type: str, sections: List[Dict[str, Any]],
+                     stat: Optional[os.stat_result] = None, handler_version: int = 1) -> None:
+        index, key = self._route(file_path)
+        if index is None:
+            return
+        if stat is None:
+            stat = file_path.stat()
+        index.add_document(key, file_type, sections, stat, handler_version)
+
+    def remove_document(self, file_path: Path) -> None:
+        index, key = self._route(file_path)
+        if index is not None:
+            index.remove_document(key)
+
+    def compact(self) -> int:
+        return sum(shard.index.compact() for shard in self.all_shards() if shard.enabled)
+
+    def tombstone_count(self) -> int:
+        return sum(shard.index.tombstone_count() for shard in self.all_shards() if shard.enabled)
+
+    def get_state(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        index, key = self._route(file_path)
+        return index.get_state(key) if index is not None else None
+
+    def paths_under(self, root: Path) -> List[str]:
+        paths = []
+        for shard, directory_key in self.shards_for_directory(root):
+            if shard.enabled:
+                paths.extend(shard.to_path(path_key) for path_key in shard.index.paths_under(directory_key))
+        return paths
+
+    def get_sections(self, file_path: Path) -> List[Dict[str, Any]]:
+        index, key = self._route(file_path)
+        return index.get_sections(key) if index is not None else []
+
+    def search(self, keywords: str, match_mode: str = "word",
+               directory: Optional[Path] = None) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        키워드와 매칭될 수 있는 후보 섹션을 찾습니다. 디렉토리를 지정하면 그 디렉토리를 담당하는 샤드만 확인합니다.
+
+        Args:
+            keywords: 검색 키워드
+            match_mode: "word"이면 단어 단위 매칭, "substring"이면 부분 문자열 매칭
+            directory: 검색할 디렉토리 (지정하지 않으면 모든 샤드)
+
+        Returns:
+            경로별 후보 섹션 목록. 사용하지 않는 샤드가 포함되었거나 색인으로 답할 수 없는 키워드이면 None
+        """
+        if directory is None:
+            targets = [(shard, None) for shard in self.all_shards()]
+        else:
+            targets = self.shards_for_directory(directory)
+
+        results = {}
+        for shard, directory_key in targets:
+            if not shard.enabled:
+                return None
+            shard_results = shard.index.search(keywords, match_mode, directory=directory_key)
+            if shard_results is None:
+                return None
+            for path_key, sections in shard_results.items():
+                results[shard.to_path(path_key)] = sections
+        return results
+
+    def __len__(self) -> int:
+        return sum(len(shard.index) for shard in self.all_shards() if shard.enabled)
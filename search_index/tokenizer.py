@@ -0,0 +1,74 @@
+"""
+색인용 토크나이저
+
+이 모듈은 추출된 섹션 텍스트와 검색 키워드를 색인어(term)로 분리하는 기능을 제공합니다.
+검색 서버의 정규식(\\b 키워드 \\b, 대소문자 무시)과 같은 단어 경계를 사용하므로,
+색인에서 찾은 후보는 항상 실제 매칭 결과의 상위 집합이 됩니다.
+
+부분 문자열 검색을 위해 소문자로 바꾼 텍스트의 문자 3-gram(트라이그램)도 제공합니다.
+"키오스크는", "비용을"처럼 조사가 붙은 한국어 단어나 복합어 안의 부분 문자열은 단어 경계로는
+찾을 수 없지만, 키워드의 모든 트라이그램을 포함하는 섹션만 확인하면 빠르게 찾을 수 있습니다.
+"""
+
+import re
+from collections import Counter
+from typing import List, Dict, Set
+
+TERM_PATTERN = re.compile(r'\w+')
+TRIGRAM_SIZE = 3
+
+def tokenize(text: str) -> List[str]:
+    """
+    텍스트를 소문자 색인어 목록으로 분리합니다.
+
+    Args:
+        text: 분리할 텍스트
+
+    Returns:
+        등장 순서대로 정렬된 색인어 목록
+    """
+    if not text:
+        return []
+    return [term.lower() for term in TERM_PATTERN.findall(text)]
+
+def term_frequencies(text: str) -> Dict[str, int]:
+    """
+    텍스트에 등장하는 색인어별 등장 횟수를 계산합니다.
+
+    Args:
+        text: 분석할 텍스트
+
+    Returns:
+        색인어별 등장 횟수
+    """
+    return dict(Counter(tokenize(text)))
+
+def term_positions(text: str) -> Dict[str, List[int]]:
+    """
+    텍스트에 등장하는 색인어별 등장 위치(색인어 순번) 목록을 구합니다.
+
+    Args:
+        text: 분석할 텍스트
+
+    Returns:
+        색인어별 오름차순 위치 목록
+    """
+    positions: Dict[str, List[int]] = {}
+    for position, term in enumerate(tokenize(text)):
+        positions.setdefault(term, []).append(position)
+    return positions
+
+def trigrams(text: str) -> Set[str]:
+    """
+    소문자로 바꾼 텍스트에 등장하는 모든 문자 3-gram을 구합니다.
+
+    Args:
+        text: 분석할 텍스트
+
+    Returns:
+        트라이그램 집합 (텍스트가 3글자보다 짧으면 빈 집합)
+    """
+    if not text:
+        return set()
+    lowered = text.lower()
+    return {lowered[i:i + TRIGRAM_SIZE] for i in range(len(lowered) - TRIGRAM_SIZE + 1)}
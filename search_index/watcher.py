@@ -0,0 +1,452 @@
+"""
+파일 시스템 감시를 통한 실시간 색인 갱신
+
+이 모듈은 검색 디렉토리의 파일 생성/수정/이동/삭제 이벤트를 감시하여 변경된 파일만
+디바운스된 재색인 큐로 보내는 기능을 제공합니다. Linux에서는 inotify를 사용하고,
+inotify를 사용할 수 없는 환경에서는 주기적으로 파일 상태를 비교하는 폴링 방식으로 동작합니다.
+
+감시가 시작된 디렉토리는 최초 증분 갱신이 끝나면 "실시간" 상태가 되며, 이후 검색은
+디렉토리를 다시 탐색하지 않고 색인만으로 답할 수 있습니다.
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Callable, Optional, List, Tuple
+
+from file_handlers.base import FileHandlerRegistry
+from search_index.indexer import IncrementalIndexer
+
+logger = logging.getLogger("file_search.watcher")
+
+# inotify 이벤트 마스크 (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct("iIII")
+
+# 디렉토리 갱신에 실패했을 때 다시 시도하기까지의 대기 시간(초), 실패할 때마다 두 배로 늘어남
+REFRESH_RETRY_SECONDS = 30.0
+REFRESH_RETRY_MAX_SECONDS = 600.0
+
+class ReindexQueue:
+    """변경된 경로를 모아 일정 시간 조용해진 뒤 한 번에 재색인하는 디바운스 큐"""
+
+    def __init__(self, indexer: IncrementalIndexer, handler_registry: FileHandlerRegistry, debounce_seconds: float = 2.0):
+        """
+        Args:
+            indexer: 재색인에 사용할 증분 색인기
+            handler_registry: 파일 핸들러 레지스트리 (지원되는 파일만 재색인)
+            debounce_seconds: 마지막 이벤트 이후 재색인까지 기다리는 시간
+        """
+        self.indexer = indexer
+        self.handler_registry = handler_registry
+        self.debounce_seconds = debounce_seconds
+        self.pending: Dict[str, float] = {}
+        self.condition = threading.Condition()
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """재색인 스레드를 시작합니다."""
+        self.thread = threading.Thread(target=self._run, name="reindex-queue", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """재색인 스레드를 중지합니다."""
+        self.stop_event.set()
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def put(self, path: Path) -> None:
+        """
+        변경된 파일 경로를 큐에 넣습니다. 같은 경로의 이벤트가 반복되면 대기 시간이 연장됩니다.
+
+        Args:
+            path: 변경된 파일 경로
+        """
+        with self.condition:
+            self.pending[str(path)] = time.monotonic()
+            self.condition.notify()
+
+    def pending_count(self) -> int:
+        """재색인을 기다리는 경로 수를 반환합니다."""
+        with self.condition:
+            return len(self.pending)
+
+    def _take_ready(self) -> List[str]:
+        """대기 시간이 지난 경로를 큐에서 꺼냅니다."""
+        with self.condition:
+            while not self.stop_event.is_set():
+                if not self.pending:
+                    self.condition.wait()
+                    continue
+
+                now = time.monotonic()
+                ready = [path for path, last_event in self.pending.items() if now - last_event >= self.debounce_seconds]
+                if ready:
+                    for path in ready:
+                        del self.pending[path]
+                    return ready
+
+                next_ready = min(self.pending.values()) + self.debounce_seconds
+                self.condition.wait(timeout=max(0.05, next_ready - now))
+            return []
+
+    def _run(self) -> None:
+        while not self.stop_event.is_set():
+            ready = self._take_ready()
+            if not ready:
+                continue
+
+            stats = {"indexed": 0, "removed": 0, "unchanged": 0, "failed": 0}
+            for path_key in ready:
+                file_path = Path(path_key)
+                try:
+                    if not file_path.is_file() or not self.handler_registry.can_handle_file(file_path):
+                        self.indexer.index.remove_document(file_path)
+                        stats["removed"] += 1
+                        continue
+
+                    stat = file_path.stat()
+                    if self.indexer.is_unchanged(file_path, stat):
+                        stats["unchanged"] += 1
+                    elif self.indexer.index_file(file_path, stat):
+                        stats["indexed"] += 1
+                    else:
+                        stats["failed"] += 1
+                except Exception as e:
+                    logger.error(f"Error reindexing {file_path}: {e}")
+                    stats["failed"] += 1
+
+            try:
+                self.indexer.index.save()
+            except Exception as e:
+                logger.error(f"Error saving index after reindex: {e}")
+            logger.info(f"Reindexed {len(ready)} changed paths: {stats}")
+
+class InotifyWatcher:
+    """inotify를 사용하는 디렉토리 트리 감시기 (Linux 전용)"""
+
+    def __init__(self, root: Path, on_file_changed: Callable[[Path], None],
+                 on_tree_changed: Callable[[Path, bool], None], on_overflow: Callable[[], None]):
+        """
+        Args:
+            root: 감시할 최상위 디렉토리
+            on_file_changed: 파일이 생성/수정/이동/삭제되었을 때 호출되는 함수
+            on_tree_changed: 하위 디렉토리가 추가(True)되거나 제거(False)되었을 때 호출되는 함수
+            on_overflow: 이벤트 큐가 넘쳐 일부 이벤트를 놓쳤을 때 호출되는 함수
+        """
+        self.root = root
+        self.on_file_changed = on_file_changed
+        self.on_tree_changed = on_tree_changed
+        self.on_overflow = on_overflow
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, Path] = {}
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def is_supported() -> bool:
+        """현재 플랫폼에서 inotify를 사용할 수 있는지 확인합니다."""
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+            return hasattr(libc, "inotify_init1")
+        except OSError:
+            return False
+
+    def add_tree(self, directory: Path) -> None:
+        """
+        디렉토리와 모든 하위 디렉토리에 감시를 등록합니다.
+
+        Raises:
+            OSError: 감시 개수 제한(fs.inotify.max_user_watches)을 넘은 경우
+        """
+        for dir_root, dirs, _ in os.walk(directory):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dir_root), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err == errno.ENOSPC:
+                    raise OSError(err, "inotify watch limit reached")
+                logger.warning(f"Cannot watch {dir_root}: {os.strerror(err)}")
+                continue
+            self.watches[wd] = Path(dir_root)
+
+    def start(self) -> None:
+        """감시를 등록하고 이벤트 읽기 스레드를 시작합니다."""
+        self.add_tree(self.root)
+        self.thread = threading.Thread(target=self._run, name=f"inotify-{self.root.name}", daemon=True)
+        self.thread.start()
+        logger.info(f"Watching {self.root} with inotify ({len(self.watches)} directories)")
+
+    def stop(self) -> None:
+        """이벤트 읽기 스레드를 중지하고 inotify를 닫습니다."""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+        os.close(self.fd)
+
+    def _read_events(self) -> List[Tuple[int, int, str]]:
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b"\0")
+            offset += name_len
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def _run(self) -> None:
+        while not self.stop_event.is_set():
+            readable, _, _ = select.select([self.fd], [], [], 1.0)
+            if not readable:
+                continue
+
+            for wd, mask, name in self._read_events():
+                if mask & IN_Q_OVERFLOW:
+                    logger.warning(f"inotify event queue overflowed for {self.root}")
+                    self.on_overflow()
+                    continue
+
+                directory = self.watches.get(wd)
+                if directory is None:
+                    continue
+
+                if mask & IN_IGNORED:
+                    del self.watches[wd]
+                    continue
+
+                path = directory / name if name else directory
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        try:
+                            self.add_tree(path)
+                        except OSError as e:
+                            logger.error(f"Cannot watch new directory {path}: {e}")
+                        self.on_tree_changed(path, True)
+                    elif mask & (IN_DELETE | IN_MOVED_FROM):
+                        self.on_tree_changed(path, False)
+                elif name:
+                    self.on_file_changed(path)
+
+class PollingWatcher:
+    """파일 상태를 주기적으로 비교하는 감시기 (inotify를 사용할 수 없을 때 사용)"""
+
+    def __init__(self, root: Path, files_fn: Callable[[Path], Iterable[Path]],
+                 on_file_changed: Callable[[Path], None], interval_seconds: float = 30.0):
+        """
+        Args:
+            root: 감시할 최상위 디렉토리
+            files_fn: 디렉토리에서 지원되는 파일 목록을 찾는 함수
+            on_file_changed: 파일이 생성/수정/삭제되었을 때 호출되는 함수
+            interval_seconds: 파일 상태를 비교하는 주기
+        """
+        self.root = root
+        self.files_fn = files_fn
+        self.on_file_changed = on_file_changed
+        self.interval_seconds = interval_seconds
+        self.snapshot: Dict[str, Tuple[int, int]] = {}
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for file_path in self.files_fn(self.root):
+            try:
+                stat = file_path.stat()
+                snapshot[str(file_path)] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                continue
+        return snapshot
+
+    def start(self) -> None:
+        """현재 파일 상태를 기록하고 폴링 스레드를 시작합니다."""
+        try:
+            self.snapshot = self._scan()
+        except OSError as e:
+            # 다음 폴링에서 읽은 파일은 모두 변경된 것으로 보고 재색인 큐에 넣음 (변경되지 않은 파일은 색인기가 건너뜀)
+            logger.error(f"Error polling {self.root}: {e}")
+        self.thread = threading.Thread(target=self._run, name=f"poll-{self.root.name}", daemon=True)
+        self.thread.start()
+        logger.info(f"Watching {self.root} by polling every {self.interval_seconds} seconds")
+
+    def stop(self) -> None:
+        """폴링 스레드를 중지합니다."""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self.stop_event.wait(self.interval_seconds):
+            try:
+                snapshot = self._scan()
+            except Exception as e:
+                logger.error(f"Error polling {self.root}: {e}")
+                continue
+
+            for path_key, state in snapshot.items():
+                if self.snapshot.get(path_key) != state:
+                    self.on_file_changed(Path(path_key))
+            for path_key in self.snapshot.keys() - snapshot.keys():
+                self.on_file_changed(Path(path_key))
+            self.snapshot = snapshot
+
+class IndexWatcher:
+    """검색 디렉토리별 감시기와 재색인 큐를 관리하여 색인을 실시간으로 유지"""
+
+    def __init__(self, indexer: IncrementalIndexer, handler_registry: FileHandlerRegistry,
+                 files_fn: Callable[[Path], Iterable[Path]], debounce_seconds: float = 2.0,
+                 poll_interval_seconds: float = 30.0):
+        """
+        Args:
+            indexer: 색인 갱신에 사용할 증분 색인기
+            handler_registry: 파일 핸들러 레지스트리
+            files_fn: 디렉토리에서 지원되는 파일 목록을 찾는 함수 (find_files)
+            debounce_seconds: 마지막 이벤트 이후 재색인까지 기다리는 시간
+            poll_interval_seconds: 폴링 감시기의 파일 상태 비교 주기
+        """
+        self.indexer = indexer
+        self.handler_registry = handler_registry
+        self.files_fn = files_fn
+        self.poll_interval_seconds = poll_interval_seconds
+        self.queue = ReindexQueue(indexer, handler_registry, debounce_seconds)
+        self.watchers: Dict[str, object] = {}
+        self.live_roots: List[Path] = []
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+
+    def start(self, roots: Iterable[Path]) -> None:
+        """
+        재색인 큐를 시작하고 각 디렉토리의 감시와 최초 증분 갱신을 백그라운드에서 시작합니다.
+
+        Args:
+            roots: 감시할 검색 디렉토리 목록
+        """
+        self.queue.start()
+        for root in roots:
+            if not root.exists() or not root.is_dir():
+                logger.warning(f"Not watching missing directory: {root}")
+                continue
+            threading.Thread(target=self._start_root, args=(root,), name=f"watch-start-{root.name}", daemon=True).start()
+
+    def stop(self) -> None:
+        """모든 감시기와 재색인 큐를 중지합니다."""
+        self.stop_event.set()
+        for watcher in self.watchers.values():
+            watcher.stop()
+        self.queue.stop()
+
+    def is_live(self, directory: Path) -> bool:
+        """
+        디렉토리가 감시 중이며 최초 색인이 끝나 색인만으로 검색할 수 있는지 확인합니다.
+
+        Args:
+            directory: 검색할 디렉토리
+
+        Returns:
+            색인만으로 검색할 수 있으면 True
+        """
+        with self.lock:
+            return any(directory == root or root in directory.parents for root in self.live_roots)
+
+    def _start_root(self, root: Path) -> None:
+        watcher = None
+        # 감시를 먼저 시작해야 최초 갱신 중에 생긴 변경도 놓치지 않음
+        if InotifyWatcher.is_supported():
+            try:
+                watcher = InotifyWatcher(
+                    root,
+                    on_file_changed=self.queue.put,
+                    on_tree_changed=lambda path, added: self._on_tree_changed(path, added),
+                    on_overflow=lambda: threading.Thread(target=self._refresh_until_live, args=(root,), daemon=True).start()
+                )
+                watcher.start()
+            except OSError as e:
+                logger.warning(f"inotify unavailable for {root} ({e}), falling back to polling")
+                if watcher is not None:
+                    os.close(watcher.fd)
+                watcher = None
+
+        if watcher is None:
+            watcher = PollingWatcher(root, self.files_fn, self.queue.put, self.poll_interval_seconds)
+            watcher.start()
+
+        self.watchers[str(root)] = watcher
+        self._refresh_until_live(root)
+
+    def _refresh_until_live(self, root: Path) -> None:
+        """
+        디렉토리의 증분 갱신이 성공할 때까지 다시 시도하고, 성공하면 디렉토리를 실시간 상태로 만듭니다.
+        갱신에 실패하는 동안에는 색인이 비었거나 오래되었을 수 있으므로 검색이 디렉토리를 직접 탐색합니다.
+        """
+        delay = REFRESH_RETRY_SECONDS
+        while not self._refresh_root(root):
+            with self.lock:
+                if root in self.live_roots:
+                    self.live_roots.remove(root)
+            logger.warning(f"Index for {root} is not live, retrying refresh in {delay:g} seconds")
+            if self.stop_event.wait(delay):
+                return
+            delay = min(delay * 2, REFRESH_RETRY_MAX_SECONDS)
+
+        with self.lock:
+            if root in self.live_roots:
+                return
+            self.live_roots.append(root)
+        logger.info(f"Index for {root} is live")
+
+    def _refresh_root(self, root: Path) -> bool:
+        """디렉토리를 증분 갱신합니다. 파일 목록을 끝까지 읽고 갱신을 마쳤으면 True를 반환합니다."""
+        # 공유 폴더 연결이 끊겨 디렉토리가 사라졌으면 색인의 파일을 모두 삭제하지 않도록 갱신하지 않음
+        if not root.is_dir():
+            logger.error(f"Cannot refresh index for {root}: directory is not available")
+            return False
+        try:
+            self.indexer.refresh(root, self.files_fn(root))
+            return True
+        except Exception as e:
+            logger.error(f"Error refreshing index for {root}: {e}")
+            return False
+
+    def _on_tree_changed(self, directory: Path, added: bool) -> None:
+        if added:
+            try:
+                for file_path in self.files_fn(directory):
+                    self.queue.put(file_path)
+            except OSError as e:
+                logger.error(f"Cannot list new directory {directory}: {e}")
+        else:
+            for path_key in self.indexer.index.paths_under(directory):
+                self.queue.put(Path(path_key))
@@ -0,0 +1,85 @@
+"""
+디렉토리별 추출 동시 처리 한도(AdaptiveLimiter) 테스트
+
+python -m unittest discover -s tests 로 실행합니다.
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from extraction.concurrency import AdaptiveLimiter, MIN_WINDOW_SAMPLES
+
+READ_LATENCY = 0.010  # 실제로 파일을 읽은 지연 시간 (초)
+
+async def run_window(limiter: AdaptiveLimiter, latencies):
+    """지연 시간 목록만큼 슬롯을 얻고 반환합니다."""
+    for latency in latencies:
+        await limiter.acquire()
+        limiter.release(latency)
+
+class AdaptiveLimiterTest(unittest.TestCase):
+    def test_cache_hits_do_not_shrink_limit(self):
+        limiter = AdaptiveLimiter(initial_limit=16, min_limit=1, max_limit=64)
+        # 실제 읽기 한 창으로 기준 지연 시간을 정함 (slow start로 한도가 두 배가 됨)
+        asyncio.run(run_window(limiter, [READ_LATENCY] * 16))
+        self.assertEqual(int(limiter.limit), 32)
+
+        # 캐시 적중은 파일을 읽지 않았으므로 지연 시간 없이 반환됨
+        asyncio.run(run_window(limiter, [None] * 64))
+        self.assertEqual(int(limiter.limit), 32)
+        self.assertEqual(limiter.decreases, 0)
+        self.assertEqual(limiter.baseline, READ_LATENCY)
+
+        # 다음 실제 읽기 창은 캐시 적중과 섞이지 않은 기준으로 판단되어 한도가 계속 늘어남
+        asyncio.run(run_window(limiter, [READ_LATENCY] * 32))
+        self.assertEqual(int(limiter.limit), 64)
+
+    def test_slow_reads_shrink_limit(self):
+        limiter = AdaptiveLimiter(initial_limit=8, min_limit=1, max_limit=64)
+        asyncio.run(run_window(limiter, [READ_LATENCY] * MIN_WINDOW_SAMPLES))
+        # 처리량이 늘지 않았다고 보도록 이전 창의 처리량을 크게 설정
+        limiter.throughput = float("inf")
+        asyncio.run(run_window(limiter, [READ_LATENCY * 10] * 16))
+        self.assertEqual(int(limiter.limit), 12)
+        self.assertEqual(limiter.decreases, 1)
+
+class ExtractReadLatencyTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.TemporaryDirectory()
+        root = Path(cls.tempdir.name)
+        os.environ.update({
+            "FILE_SEARCH_DIRS": str(root),
+            "FILE_LOG_DIR": str(root),
+            "FILE_INDEX_ENABLED": "false",
+            "FILE_EXTRACT_CACHE_DIR": str(root / "cache"),
+            "FILE_EXTRACT_MODE": "thread"
+        })
+        import file_search_server
+        cls.server = file_search_server
+        cls.file_path = root / "notes.txt"
+        cls.file_path.write_text("hello world", encoding="utf-8")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tempdir.cleanup()
+
+    def test_only_real_reads_report_latency(self):
+        sections, latency = self.server.extract_and_index(self.file_path, "Text", 1)
+        self.assertEqual(sections[0]["text"], "hello world")
+        self.assertIsNotNone(latency)
+
+        # 같은 파일을 다시 추출하면 캐시를 사용하므로 한도 조절에 쓸 지연 시간이 없음
+        for _ in range(MIN_WINDOW_SAMPLES):
+            sections, latency = self.server.extract_and_index(self.file_path, "Text", 1)
+            self.assertEqual(sections[0]["text"], "hello world")
+            self.assertIsNone(latency)
+
+if __name__ == "__main__":
+    unittest.main()